@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+Ekspor, impor, dan gabung file skor MathSprint dari banyak komputer.
+
+Setiap komputer lab menulis scores.json sendiri (lihat papan_skor.py).
+Semua perintah membaca file skor secara streaming. File .json dibaca per
+entri dari array, bukan dengan json.load, jadi file berisi jutaan entri
+tidak pernah dimuat utuh ke memori:
+
+    python main.py scores export lab*/scores.json -o semua.csv
+    python main.py scores import semua.csv --ke scores.json
+    python main.py scores merge lab*/scores.json -o global.jsonl --dari 2025-01-01
+
+Format dipilih dari ekstensi: .json (array, format scores.json), .jsonl
+(satu entri per baris), atau .csv (kolom nama,skor,tanggal).
+
+Gabungan (merge) adalah merge sort eksternal. Entri dibaca dalam potongan
+(UKURAN_RUN). Setiap potongan diurutkan, dan potongan yang tidak muat di
+memori disimpan ke file sementara. Semua potongan lalu digabung k-way
+dengan heap (heapq.merge), sehingga memori hanya sebesar satu potongan
+ditambah satu entri per potongan. Entri identik berdampingan dalam urutan
+gabungan, jadi duplikat dibuang saat mengalir keluar. Untuk --teratas N
+cukup disimpan N entri terbaik.
+"""
+
+import argparse
+import bisect
+import csv
+import datetime
+import heapq
+import itertools
+import json
+import os
+import pickle
+import re
+import sys
+import tempfile
+from json.encoder import encode_basestring
+
+from papan_skor import samakan_mode_file
+
+KOLOM = ('nama', 'skor', 'tanggal')
+
+UKURAN_RUN = 200000 # Entri per potongan yang diurutkan di memori
+UKURAN_BLOK_PICKLE = 4096 # Entri per blok di file potongan sementara
+UKURAN_BACA = 1 << 16 # Karakter per pembacaan file .json
+
+_PEMISAH_JSON = re.compile(r'[\s,]*')
+
+
+# --- Entri ---
+# Di dalam alat ini entri adalah tuple (-skor, tanggal, nama): urutan tuple
+# biasa = peringkat (skor tertinggi dulu, lalu tanggal lebih awal, lalu
+# nama), tanpa fungsi key saat mengurutkan dan menggabung.
+
+def ke_tuple(entri):
+    """Dict entri skor -> tuple urut. ValueError/KeyError/TypeError jika tidak valid."""
+    return (-int(entri['skor']), str(entri.get('tanggal') or ""), str(entri.get('nama') or "Player"))
+
+
+def ke_dict(t):
+    return {"nama": t[2], "skor": -t[0], "tanggal": t[1]}
+
+
+def ke_json(t):
+    """Tuple urut -> teks JSON, sama dengan json.dumps(ke_dict(t), ensure_ascii=False)."""
+    # Dirakit langsung: json.dumps dengan argumen membuat JSONEncoder baru setiap panggilan
+    return f'{{"nama": {encode_basestring(t[2])}, "skor": {-t[0]}, "tanggal": {encode_basestring(t[1])}}}'
+
+
+def format_file(path):
+    """'json', 'jsonl', atau 'csv' dari ekstensi path ('-' = stdout, JSONL)."""
+    if path == '-':
+        return 'jsonl'
+    ekstensi = os.path.splitext(path)[1].lower().lstrip('.')
+    if ekstensi not in ('json', 'jsonl', 'csv'):
+        raise ValueError(f"Format file tidak dikenal: {path} (pakai .json, .jsonl, atau .csv)")
+    return ekstensi
+
+
+# --- Membaca ---
+
+def _baca_array_json(f):
+    """Iterasi elemen array JSON satu per satu dari file yang dibaca per blok."""
+    dekoder = json.JSONDecoder()
+    buffer = f.read(UKURAN_BACA).lstrip()
+    if not buffer:
+        return
+    if buffer[0] != '[':
+        raise ValueError("bukan array JSON")
+    i = 1
+    while True:
+        i = _PEMISAH_JSON.match(buffer, i).end()
+        if i >= len(buffer):
+            tambahan = f.read(UKURAN_BACA)
+            if not tambahan:
+                return # Array terpotong: entri yang sudah lengkap tetap dipakai
+            buffer, i = buffer[i:] + tambahan, 0
+            continue
+        if buffer[i] == ']':
+            return
+        try:
+            nilai, i_akhir = dekoder.raw_decode(buffer, i)
+        except json.JSONDecodeError:
+            tambahan = f.read(UKURAN_BACA) # Elemen terpotong di akhir blok
+            if not tambahan:
+                return
+            buffer, i = buffer[i:] + tambahan, 0
+            continue
+        yield nilai
+        i = i_akhir
+        if i > UKURAN_BACA:
+            buffer, i = buffer[i:], 0
+
+
+def _baca_jsonl(f):
+    for baris in f:
+        try:
+            yield json.loads(baris)
+        except json.JSONDecodeError:
+            continue # Baris rusak/terpotong dilewati, seperti log telemetri
+
+
+def baca_entri(path, dari=None, sampai=None):
+    """
+    Iterasi entri (tuple urut) di satu file skor, dalam urutan file.
+
+    dari/sampai: string tanggal ISO (inklusif); entri di luar rentang, dan
+    entri tanpa skor yang valid, dilewati.
+    """
+    format_ = format_file(path)
+    with open(path, 'r', newline='' if format_ == 'csv' else None, encoding='utf-8') as f:
+        if format_ == 'json':
+            sumber = _baca_array_json(f)
+        elif format_ == 'jsonl':
+            sumber = _baca_jsonl(f)
+        else:
+            sumber = csv.DictReader(f)
+        for entri in sumber:
+            try:
+                t = ke_tuple(entri)
+            except (KeyError, ValueError, TypeError, AttributeError):
+                continue
+            tanggal = t[1][:10]
+            if (dari is not None and tanggal < dari) or (sampai is not None and tanggal > sampai):
+                continue
+            yield t
+
+
+def baca_semua(paths, dari=None, sampai=None):
+    for path in paths:
+        yield from baca_entri(path, dari, sampai)
+
+
+# --- Menulis ---
+
+def tulis_entri(aliran, f, format_):
+    """Tulis entri (tuple urut) ke file teks terbuka. Kembalikan jumlah entri."""
+    jumlah = 0
+    if format_ == 'csv':
+        penulis = csv.writer(f)
+        penulis.writerow(KOLOM)
+        for jumlah, t in enumerate(aliran, 1):
+            penulis.writerow((t[2], -t[0], t[1]))
+    elif format_ == 'jsonl':
+        for jumlah, t in enumerate(aliran, 1):
+            f.write(ke_json(t) + '\n')
+    else:
+        f.write('[')
+        pemisah = '\n'
+        for jumlah, t in enumerate(aliran, 1):
+            f.write(pemisah + ke_json(t))
+            pemisah = ',\n'
+        f.write('\n]\n')
+    return jumlah
+
+
+def tulis_file(aliran, path):
+    """
+    Tulis entri ke path (format dari ekstensi, '-' = stdout).
+
+    Seperti PapanSkor, file ditulis ke file sementara di folder yang sama,
+    di-fsync, lalu di-rename: game yang sedang membaca scores.json tidak
+    pernah melihat file setengah jadi. Mode file lama tetap dipertahankan.
+    """
+    format_ = format_file(path)
+    if path == '-':
+        return tulis_entri(aliran, sys.stdout, format_)
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, path_sementara = tempfile.mkstemp(dir=folder, prefix=".scores-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', newline='' if format_ == 'csv' else None, encoding='utf-8') as f:
+            jumlah = tulis_entri(aliran, f, format_)
+            f.flush()
+            os.fsync(f.fileno())
+            samakan_mode_file(f.fileno(), path)
+        os.replace(path_sementara, path)
+    except BaseException:
+        os.unlink(path_sementara)
+        raise
+    return jumlah
+
+
+# --- Urut & gabung ---
+
+def _tulis_run(run, folder):
+    """Simpan potongan terurut ke file sementara (blok pickle), kembalikan path-nya."""
+    fd, path = tempfile.mkstemp(dir=folder, suffix=".run")
+    with os.fdopen(fd, 'wb') as f:
+        for i in range(0, len(run), UKURAN_BLOK_PICKLE):
+            pickle.dump(run[i:i + UKURAN_BLOK_PICKLE], f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _baca_run(path):
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                blok = pickle.load(f)
+            except EOFError:
+                return
+            yield from blok
+
+
+def tanpa_duplikat(aliran_terurut):
+    """Buang entri identik (berdampingan karena aliran sudah terurut)."""
+    sebelumnya = None
+    for t in aliran_terurut:
+        if t != sebelumnya:
+            yield t
+            sebelumnya = t
+
+
+def gabung_terurut(aliran, folder_sementara, ukuran_run=UKURAN_RUN):
+    """
+    Urutkan aliran entri yang mungkin lebih besar dari memori.
+
+    Generator: potongan berukuran ukuran_run diurutkan (file skor per
+    komputer biasanya sudah terurut, dan sort Python hanya O(n) untuk itu),
+    potongan yang penuh disimpan ke folder_sementara, lalu semua potongan
+    digabung k-way dengan heapq.merge.
+    """
+    runs = []
+    run = []
+    for t in aliran:
+        run.append(t)
+        if len(run) >= ukuran_run:
+            run.sort()
+            runs.append(_baca_run(_tulis_run(run, folder_sementara)))
+            run = []
+    run.sort()
+    runs.append(iter(run)) # Potongan terakhir tetap di memori
+    return heapq.merge(*runs)
+
+
+def teratas(aliran, n):
+    """
+    N entri berbeda terbaik dari aliran, terurut. Memori O(n).
+
+    Kebanyakan entri lebih buruk dari entri ke-N saat ini dan langsung
+    dilewati dengan satu perbandingan.
+    """
+    terbaik = []
+    anggota = set()
+    if n <= 0:
+        return terbaik
+    for t in aliran:
+        if len(terbaik) >= n and t >= terbaik[-1]:
+            continue
+        if t in anggota:
+            continue
+        bisect.insort(terbaik, t)
+        anggota.add(t)
+        if len(terbaik) > n:
+            anggota.discard(terbaik.pop())
+    return terbaik
+
+
+def peringkat(aliran, n=None, folder_sementara=None):
+    """
+    Gabungkan aliran entri menjadi satu peringkat tanpa duplikat.
+
+    Generator entri (tuple urut). n: hanya N teratas (None = semua).
+    """
+    if n is not None:
+        yield from teratas(aliran, n)
+        return
+    with tempfile.TemporaryDirectory(dir=folder_sementara, prefix="mathsprint-") as folder:
+        yield from tanpa_duplikat(gabung_terurut(aliran, folder))
+
+
+# --- Baris perintah ---
+
+def _tanggal(teks):
+    try:
+        return datetime.date.fromisoformat(teks).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tanggal tidak valid: {teks} (format YYYY-MM-DD)")
+
+
+def _tambah_filter(parser):
+    parser.add_argument('--dari', type=_tanggal, metavar='YYYY-MM-DD', help="Hanya entri sejak tanggal ini")
+    parser.add_argument('--sampai', type=_tanggal, metavar='YYYY-MM-DD', help="Hanya entri sampai tanggal ini")
+
+
+def main_cli(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Ekspor, impor, dan gabung file skor MathSprint.")
+    perintah = parser.add_subparsers(dest='perintah', required=True)
+
+    p = perintah.add_parser('export', help="Salin entri file skor ke CSV/JSONL (urutan file dipertahankan)")
+    p.add_argument('file', nargs='+', help="File skor (.json/.jsonl/.csv)")
+    p.add_argument('-o', '--keluaran', default='-', help="File tujuan (default: JSONL ke stdout)")
+    _tambah_filter(p)
+
+    p = perintah.add_parser('import', help="Masukkan entri ke file skor game (Top N, tanpa duplikat)")
+    p.add_argument('file', nargs='+', help="File hasil ekspor (.csv/.jsonl/.json)")
+    p.add_argument('--ke', default="scores.json", help="File skor tujuan (default: %(default)s)")
+    p.add_argument('--batas', type=int, default=5,
+                   help="Jumlah entri yang disimpan, 0 = semua (default: %(default)s, seperti game)")
+    _tambah_filter(p)
+
+    p = perintah.add_parser('merge', help="Gabungkan file skor banyak komputer menjadi satu peringkat")
+    p.add_argument('file', nargs='+', help="File skor (.json/.jsonl/.csv)")
+    p.add_argument('-o', '--keluaran', default='-', help="File tujuan (default: JSONL ke stdout)")
+    p.add_argument('--teratas', type=int, metavar='N', help="Hanya N entri teratas")
+    p.add_argument('--tmp', help="Folder untuk potongan sementara (default: folder sementara sistem)")
+    _tambah_filter(p)
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.perintah == 'export':
+            jumlah = tulis_file(baca_semua(args.file, args.dari, args.sampai), args.keluaran)
+        elif args.perintah == 'import':
+            # Isi file tujuan ikut digabung (tanpa filter) agar skor yang sudah ada tidak hilang
+            aliran = baca_semua(args.file, args.dari, args.sampai)
+            if os.path.exists(args.ke):
+                aliran = itertools.chain(baca_entri(args.ke), aliran)
+            jumlah = tulis_file(peringkat(aliran, args.batas or None), args.ke)
+        else:
+            aliran = baca_semua(args.file, args.dari, args.sampai)
+            jumlah = tulis_file(peringkat(aliran, args.teratas, args.tmp), args.keluaran)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    tujuan = args.ke if args.perintah == 'import' else args.keluaran
+    if tujuan != '-':
+        print(f"{jumlah} entri ditulis ke {tujuan}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
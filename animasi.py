@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Animasi karakter MathSprint.
+
+Offset lompat (parabola) dan geleng (sinus) dihitung sekali per langkah
+logika menjadi tabel (lookup table), jadi setiap langkah hanya mengambil
+satu entri tanpa menghitung math.sin/parabola lagi. Posisi yang digambar
+diinterpolasi antara dua langkah logika terakhir, sehingga gerakan tetap
+halus walau FPS gambar berbeda dari laju logika.
+
+Karakter (lingkaran kuning bermata) di-render sekali ke sprite beralpha
+(RLE) lalu hanya di-blit pada posisi offset.
+"""
+
+import math
+
+import pygame
+
+from profiler import catat_alokasi
+
+DURASI_LOMPAT = 0.5 # Detik
+TINGGI_LOMPAT = 30 # Piksel
+DURASI_GELENG = 0.6 # Detik
+AMPLITUDO_GELENG = 15 # Piksel
+FREKUENSI_GELENG = 50 # Radian per detik
+
+RADIUS_KARAKTER = 25
+
+
+def kurva_lompat(langkah, durasi=DURASI_LOMPAT, tinggi=TINGGI_LOMPAT):
+    """Offset (dx, dy) per langkah logika untuk lompatan parabola."""
+    n = round(durasi / langkah)
+    kurva = []
+    for i in range(n):
+        progress = 1 - i / n # 1 (awal) -> 0 (akhir)
+        kurva.append((0.0, -(-4 * progress * progress + 4 * progress) * tinggi))
+    return tuple(kurva)
+
+
+def kurva_geleng(langkah, durasi=DURASI_GELENG, amplitudo=AMPLITUDO_GELENG, frekuensi=FREKUENSI_GELENG):
+    """Offset (dx, dy) per langkah logika untuk gelengan sinus."""
+    n = round(durasi / langkah)
+    return tuple((math.sin((durasi - i * langkah) * frekuensi) * amplitudo, 0.0) for i in range(n))
+
+
+def buat_sprite_karakter(warna, warna_mata, radius=RADIUS_KARAKTER):
+    """Render karakter sekali ke surface beralpha (pusat di tengah surface)."""
+    sprite = catat_alokasi(pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA))
+    pygame.draw.circle(sprite, warna, (radius, radius), radius)
+    pygame.draw.circle(sprite, warna_mata, (radius - 8, radius - 5), 4)
+    pygame.draw.circle(sprite, warna_mata, (radius + 8, radius - 5), 4)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    # Piksel hanya penuh atau transparan: RLE membuat blit ~5x lebih cepat dari 3x draw.circle
+    sprite.set_alpha(255, pygame.RLEACCEL)
+    return sprite
+
+
+class AnimasiKarakter:
+    """Status animasi karakter yang dimajukan per langkah logika tetap."""
+
+    DIAM = (0.0, 0.0)
+
+    def __init__(self, langkah):
+        self.kurva = {'jump': kurva_lompat(langkah), 'shake': kurva_geleng(langkah)}
+        self.reset()
+
+    def reset(self):
+        self.kurva_aktif = None
+        self.indeks = 0
+        self.offset_sebelumnya = self.offset = self.DIAM
+
+    def mulai(self, tipe):
+        """Mulai animasi 'jump' atau 'shake' dari awal kurvanya."""
+        self.kurva_aktif = self.kurva[tipe]
+        self.indeks = 0
+        self.offset = self.kurva_aktif[0]
+
+    def tik(self):
+        """Satu langkah logika."""
+        self.offset_sebelumnya = self.offset
+        if self.kurva_aktif is None:
+            return
+        self.indeks += 1
+        if self.indeks >= len(self.kurva_aktif):
+            self.kurva_aktif = None
+            self.offset = self.DIAM
+        else:
+            self.offset = self.kurva_aktif[self.indeks]
+
+    def offset_antara(self, alpha):
+        """Offset interpolasi antara langkah sebelumnya (alpha=0) dan sekarang (alpha=1)."""
+        (x0, y0), (x1, y1) = self.offset_sebelumnya, self.offset
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Manajer aset MathSprint.
+
+Memuat aset (font kustom, suara, musik) di thread latar belakang agar menu
+bisa langsung tampil. Hasil setiap pemuatan dikirim lewat antrian dan
+dipasang oleh loop game di thread utama (hot-swap), sehingga objek pygame
+tidak pernah diganti di tengah frame.
+"""
+
+import queue
+import threading
+
+
+class ManajerAset:
+    """Menjalankan daftar tugas pemuatan aset secara berurutan di latar belakang."""
+
+    def __init__(self):
+        self._tugas = [] # (jenis, nama, fungsi_muat)
+        self._hasil = queue.Queue()
+        self._thread = None
+        self.total = 0
+        self.selesai = 0
+
+    def tambah(self, jenis, nama, fungsi_muat):
+        """Daftarkan tugas; fungsi_muat() mengembalikan objek aset atau None jika gagal."""
+        self._tugas.append((jenis, nama, fungsi_muat))
+        self.total += 1
+
+    def mulai(self, latar=True):
+        """Mulai memuat. Dengan latar=False semua aset dimuat langsung (blocking)."""
+        tugas, self._tugas = self._tugas, []
+        if not latar:
+            self._jalankan(tugas)
+            return
+        self._thread = threading.Thread(target=self._jalankan, args=(tugas,),
+                                        name="PemuatAset", daemon=True)
+        self._thread.start()
+
+    def _jalankan(self, daftar_tugas):
+        for jenis, nama, fungsi_muat in daftar_tugas:
+            try:
+                hasil = fungsi_muat()
+            except Exception as e:
+                print(f"Error memuat aset {jenis} {nama}: {e}")
+                hasil = None
+            self._hasil.put((jenis, nama, hasil))
+            self.selesai += 1
+
+    @property
+    def sedang_memuat(self):
+        """True selama masih ada aset yang dimuat atau belum dipasang."""
+        return self.selesai < self.total or not self._hasil.empty()
+
+    def ambil_hasil(self):
+        """Ambil semua aset yang sudah siap tanpa menunggu: list (jenis, nama, hasil)."""
+        hasil = []
+        while True:
+            try:
+                hasil.append(self._hasil.get_nowait())
+            except queue.Empty:
+                return hasil
+
+    def tunggu(self, timeout=None):
+        """Tunggu thread pemuat selesai."""
+        if self._thread is not None:
+            self._thread.join(timeout)
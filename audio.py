@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Audio umpan balik MathSprint dengan latensi rendah.
+
+- pygame.mixer.pre_init dengan buffer kecil (default SDL 512 sampel ~ 11.6 ms
+  di 44.1 kHz; 256 sampel ~ 5.8 ms), dipanggil sebelum mixer.init.
+- Beberapa kanal dicadangkan (set_reserved) khusus untuk SFX umpan balik,
+  jadi Sound.play() lain dan musik tidak pernah merebut kanal itu, dan suara
+  benar/salah tidak perlu menunggu kanal kosong.
+- Setiap suara "dipanaskan" saat dimuat: diputar sekali tanpa volume di
+  kanalnya, sehingga jalur mixing pertama tidak terjadi saat pemain menjawab.
+- mainkan() mengembalikan latensi tombol -> play() (detik) untuk profiler;
+  latensi buffer output (ukuran_buffer / frekuensi) dilaporkan terpisah
+  karena tidak bisa diukur dari Python.
+"""
+
+import pygame
+
+FREKUENSI = 44100
+UKURAN_BUFFER = 256 # Sampel per callback audio (harus pangkat dua)
+JUMLAH_KANAL = 8
+KANAL_SFX = 2 # Kanal yang dicadangkan untuk suara umpan balik
+
+
+class AudioGame:
+    """Mixer dengan buffer kecil dan kanal cadangan untuk SFX umpan balik."""
+
+    def __init__(self, ukuran_buffer=UKURAN_BUFFER, frekuensi=FREKUENSI,
+                 kanal_sfx=KANAL_SFX, jumlah_kanal=JUMLAH_KANAL):
+        self.ukuran_buffer = ukuran_buffer
+        self.frekuensi = frekuensi
+        self.kanal_sfx = kanal_sfx
+        self.jumlah_kanal = max(jumlah_kanal, kanal_sfx + 1)
+        self.suara = {} # nama -> Sound yang sudah dipanaskan
+        self.kanal = [] # Channel cadangan, kosong jika mixer tidak aktif
+        self._mulai_kanal = [] # Urutan mulai terakhir per kanal (untuk memilih yang diganti)
+        self._urutan = 0
+
+    def mulai(self):
+        """Inisialisasi mixer. pygame.error diteruskan ke pemanggil (mode senyap)."""
+        pygame.mixer.pre_init(self.frekuensi, -16, 2, self.ukuran_buffer)
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(self.jumlah_kanal)
+        pygame.mixer.set_reserved(self.kanal_sfx)
+        self.kanal = [pygame.mixer.Channel(i) for i in range(self.kanal_sfx)]
+        self._mulai_kanal = [0] * self.kanal_sfx
+
+    @property
+    def aktif(self):
+        return bool(self.kanal)
+
+    @property
+    def latensi_buffer(self):
+        """Perkiraan latensi satu buffer output (detik)."""
+        frekuensi = pygame.mixer.get_init()[0] if self.aktif else self.frekuensi
+        return self.ukuran_buffer / frekuensi
+
+    def siapkan(self, nama, suara):
+        """Daftarkan suara dan panaskan di kanal cadangan (tanpa terdengar)."""
+        self.suara[nama] = suara
+        if not self.aktif:
+            return
+        kanal = self.kanal[(len(self.suara) - 1) % len(self.kanal)]
+        kanal.set_volume(0.0)
+        kanal.play(suara, maxtime=1) # Selesai sendiri setelah 1 ms; mainkan() memulihkan volume
+
+    def pilih_kanal(self):
+        """Kanal cadangan yang kosong, atau yang paling lama diputar jika semua sibuk."""
+        for i, kanal in enumerate(self.kanal):
+            if not kanal.get_busy():
+                return i
+        return min(range(len(self.kanal)), key=self._mulai_kanal.__getitem__)
+
+    def mainkan(self, nama, waktu_input=None, waktu_sekarang=None):
+        """
+        Putar suara umpan balik di kanal cadangan.
+
+        Jika waktu_input (cap waktu tombol) dan waktu_sekarang diberikan,
+        kembalikan latensi tombol -> play() dalam detik; selain itu None.
+        """
+        suara = self.suara.get(nama)
+        if suara is None or not self.aktif:
+            return None
+        i = self.pilih_kanal()
+        kanal = self.kanal[i]
+        kanal.set_volume(1.0)
+        kanal.play(suara)
+        self._urutan += 1
+        self._mulai_kanal[i] = self._urutan
+        if waktu_input is None or waktu_sekarang is None:
+            return None
+        return max(waktu_sekarang - waktu_input, 0.0)
@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""
+Mode balapan MathSprint: satu kelas berlomba dengan urutan soal yang sama.
+
+Server (asyncio) dijalankan di komputer guru:
+    python balapan.py --kesulitan SEDANG
+    python balapan.py --port 8765 --pemain 30   # mulai otomatis saat 30 siswa tergabung
+
+Siswa bergabung dari game:
+    python main.py --balapan 192.168.1.10:8765 --nama Budi
+
+Protokol: satu objek JSON per baris (NDJSON) lewat TCP.
+- klien -> server: gabung {nama}, jawab {nomor, input}
+- server -> klien: selamat_datang {jumlah}, mulai {kesulitan, durasi, sisa,
+  skor_per_soal, soal}, soal {nomor, a, op, b}, hasil {nomor, benar, skor},
+  ditolak {nomor, alasan}, papan / selesai {teratas, skor_semua, jumlah}
+
+Seed urutan soal tidak pernah dikirim. Server mengirim soal satu per satu,
+selalu satu soal di depan jawaban terakhir (dua soal pertama ikut di pesan
+mulai), agar soal berikutnya sudah ada di klien saat umpan balik selesai.
+Jawaban dinilai ulang di server dengan aturan yang sama seperti game
+(periksa_jawaban), dan ditolak jika tiba setelah batas waktu pemain atau
+lebih cepat dari durasi umpan balik jawaban sebelumnya (aturan inti_game),
+jadi skor tidak bisa melebihi yang mungkin dicapai di game. Papan peringkat
+tidak dikirim per jawaban: perubahan dikumpulkan dan disiarkan paling sering
+setiap interval_papan detik, diserialisasi sekali untuk semua klien. Klien
+yang lambat membaca dilewati dan menerima papan terbaru pada siaran
+berikutnya.
+"""
+
+import argparse
+import asyncio
+import collections
+import heapq
+import json
+import queue
+import random
+import sys
+import threading
+
+from bank_soal import OPERATOR, hitung_jawaban, periksa_jawaban
+from inti_game import UMPAN_BALIK_BENAR, UMPAN_BALIK_SALAH
+
+PORT_DEFAULT = 8765
+INTERVAL_PAPAN = 0.25 # Detik antar siaran papan peringkat (jika ada perubahan)
+UKURAN_PAPAN = 10 # Jumlah pemain teratas di setiap siaran
+TOLERANSI_WAKTU = 0.5 # Jawaban yang masih di jalan saat waktu habis tetap diterima
+TOLERANSI_JEDA = 0.2 # Jitter jaringan: jawaban boleh tiba sedikit lebih cepat dari umpan balik
+SOAL_DI_DEPAN = 1 # Jumlah soal yang dikirim sebelum jawabannya dibutuhkan
+BATAS_BUFFER_KLIEN = 64 * 1024 # Klien dengan buffer kirim sebesar ini dilewati saat siaran
+BATAS_PANJANG_BARIS = 4096
+BATAS_PANJANG_NAMA = 15
+BATAS_PANJANG_INPUT = 12
+
+
+def kodekan(pesan):
+    """Satu pesan sebagai baris NDJSON (bytes)."""
+    return (json.dumps(pesan, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class PemainBalapan:
+    """Satu klien yang terhubung ke server beserta skornya."""
+
+    def __init__(self, nama, writer):
+        self.nama = nama
+        self.writer = writer
+        self.reset(0.0, 0.0)
+
+    def reset(self, waktu_mulai, batas_waktu):
+        """Mulai balapan untuk pemain ini (waktu loop server)."""
+        self.skor = 0
+        self.benar = 0
+        self.salah = 0
+        self.nomor = 1 # Nomor soal yang jawabannya ditunggu
+        self.waktu_mulai = waktu_mulai
+        self.batas_waktu = batas_waktu # Akhir sesi pemain (= sisa waktu balapan saat ia mulai)
+        self.boleh_jawab = waktu_mulai # Jawaban berikutnya tidak boleh tiba sebelum ini
+
+
+class ServerBalapan:
+    """
+    Server balapan untuk banyak klien sekaligus.
+
+    Semua pemain mendapat urutan soal yang sama dari bank_soal; klien hanya
+    menerima soal yang sudah dikirim server.
+    """
+
+    def __init__(self, bank_soal, kesulitan, durasi, skor_per_soal,
+                 interval_papan=INTERVAL_PAPAN, ukuran_papan=UKURAN_PAPAN):
+        self.bank_soal = bank_soal
+        self.kesulitan = kesulitan
+        self.durasi = durasi
+        self.skor_per_soal = skor_per_soal
+        self.interval_papan = interval_papan
+        self.ukuran_papan = ukuran_papan
+
+        self.pemain = set()
+        self._tugas_klien = set()
+        self.berjalan = False
+        self.seed = None
+        self._waktu_mulai = 0.0
+        self._soal = [] # Urutan soal balapan, diperpanjang saat dibutuhkan
+        self._sampler = None
+        self._papan_berubah = False
+        self._timer_akhir = None
+        self._server = None
+        self._tugas_papan = None
+        self._selesai = None
+
+        # Statistik (untuk uji beban)
+        self.jumlah_jawaban = 0
+        self.jumlah_siaran = 0
+        self.siaran_dilewati = 0
+
+    # --- Siklus hidup ---
+
+    async def buka(self, host='127.0.0.1', port=PORT_DEFAULT):
+        """Mulai menerima koneksi. Kembalikan port yang dipakai (berguna untuk port=0)."""
+        self._selesai = asyncio.Event()
+        self._server = await asyncio.start_server(self._tangani_klien, host, port, limit=BATAS_PANJANG_BARIS)
+        self._tugas_papan = asyncio.create_task(self._loop_papan())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def tutup(self):
+        if self._tugas_papan is not None:
+            self._tugas_papan.cancel()
+        if self._timer_akhir is not None:
+            self._timer_akhir.cancel()
+        if self._server is not None:
+            self._server.close()
+        for pemain in list(self.pemain):
+            pemain.writer.close()
+        # Koneksi yang ditutup membuat handler klien selesai (EOF)
+        await asyncio.gather(*self._tugas_klien, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def tunggu_pemain(self, jumlah):
+        while len(self.pemain) < jumlah:
+            await asyncio.sleep(0.1)
+
+    async def tunggu_selesai(self):
+        await self._selesai.wait()
+
+    # --- Balapan ---
+
+    def mulai_balapan(self, seed=None):
+        """Mulai balapan baru untuk semua pemain yang terhubung."""
+        loop = asyncio.get_running_loop()
+        self.seed = random.randrange(2 ** 31) if seed is None else seed
+        self._sampler = self.bank_soal.sampler(self.kesulitan, self.seed)
+        self._soal = []
+        self.berjalan = True
+        self._waktu_mulai = loop.time()
+        self._selesai.clear()
+        if self._timer_akhir is not None:
+            self._timer_akhir.cancel()
+        self._timer_akhir = loop.call_later(self.durasi + TOLERANSI_WAKTU, self._akhiri_balapan)
+        for pemain in self.pemain:
+            pemain.reset(self._waktu_mulai, self._waktu_mulai + self.durasi)
+        self._siarkan(kodekan(self._pesan_mulai()), paksa=True)
+        self._papan_berubah = True
+
+    def _akhiri_balapan(self):
+        self.berjalan = False
+        self._timer_akhir = None
+        self._siarkan(kodekan(self._pesan_papan('selesai')), paksa=True)
+        self._selesai.set()
+
+    def soal_ke(self, nomor):
+        """Soal ke-nomor (mulai 1) dari urutan balapan: (a, op, b, jawaban)."""
+        while len(self._soal) < nomor:
+            self._soal.append(self._sampler.berikutnya())
+        return self._soal[nomor - 1]
+
+    def papan(self):
+        """Pemain teratas, urut skor lalu jumlah benar."""
+        return heapq.nlargest(self.ukuran_papan, self.pemain, key=lambda p: (p.skor, p.benar))
+
+    def _pesan_mulai(self):
+        # Soal awal sama untuk semua pemain, jadi pesan ini tetap bisa disiarkan sekali
+        sisa = max(self.durasi - (asyncio.get_running_loop().time() - self._waktu_mulai), 0.0)
+        soal = [list(self.soal_ke(nomor)[:3]) for nomor in range(1, SOAL_DI_DEPAN + 2)]
+        return {'tipe': 'mulai', 'kesulitan': self.kesulitan, 'durasi': self.durasi,
+                'sisa': round(sisa, 3), 'skor_per_soal': self.skor_per_soal, 'soal': soal}
+
+    def _pesan_soal(self, nomor):
+        a, op, b, _ = self.soal_ke(nomor)
+        return {'tipe': 'soal', 'nomor': nomor, 'a': a, 'op': op, 'b': b}
+
+    def _pesan_papan(self, tipe='papan'):
+        # skor_semua (urut menurun) cukup untuk setiap klien menghitung peringkatnya sendiri,
+        # sehingga satu pesan yang sama bisa dikirim ke semua klien
+        return {
+            'tipe': tipe,
+            'teratas': [[p.nama, p.skor, p.benar, p.salah] for p in self.papan()],
+            'skor_semua': sorted((p.skor for p in self.pemain), reverse=True),
+            'jumlah': len(self.pemain),
+        }
+
+    # --- Koneksi ---
+
+    async def _tangani_klien(self, reader, writer):
+        tugas = asyncio.current_task()
+        self._tugas_klien.add(tugas)
+        pemain = None
+        try:
+            async for baris in reader:
+                try:
+                    pesan = json.loads(baris)
+                except ValueError:
+                    continue
+                if not isinstance(pesan, dict):
+                    continue
+                tipe = pesan.get('tipe')
+                if pemain is None:
+                    if tipe == 'gabung':
+                        pemain = self._gabung(pesan, writer)
+                elif tipe == 'jawab':
+                    self._jawab(pemain, pesan)
+        except (ConnectionError, ValueError): # ValueError: baris melebihi BATAS_PANJANG_BARIS
+            pass
+        finally:
+            if pemain is not None:
+                self.pemain.discard(pemain)
+                self._papan_berubah = True
+            writer.close()
+            self._tugas_klien.discard(tugas)
+
+    def _gabung(self, pesan, writer):
+        nama = str(pesan.get('nama') or "Player")[:BATAS_PANJANG_NAMA]
+        pemain = PemainBalapan(nama, writer)
+        self.pemain.add(pemain)
+        self._papan_berubah = True
+        self._kirim(pemain, {'tipe': 'selamat_datang', 'jumlah': len(self.pemain)})
+        if self.berjalan: # Bergabung di tengah balapan: sesinya berakhir bersama balapan
+            waktu = asyncio.get_running_loop().time()
+            pemain.reset(waktu, self._waktu_mulai + self.durasi)
+            self._kirim(pemain, self._pesan_mulai())
+        return pemain
+
+    def _jawab(self, pemain, pesan):
+        """
+        Nilai ulang jawaban di server (klien tidak dipercaya), termasuk waktunya:
+        jawaban harus tiba sebelum batas waktu pemain dan tidak lebih cepat dari
+        umpan balik jawaban sebelumnya, seperti aturan Sesi di game.
+        """
+        nomor = pesan.get('nomor')
+        teks = pesan.get('input')
+        waktu = asyncio.get_running_loop().time()
+        if not self.berjalan:
+            alasan = "balapan tidak berjalan"
+        elif waktu > pemain.batas_waktu + TOLERANSI_WAKTU:
+            alasan = "waktu habis"
+        elif type(nomor) is not int or nomor != pemain.nomor:
+            alasan = f"nomor soal harus {pemain.nomor}"
+        elif waktu < pemain.boleh_jawab:
+            alasan = "terlalu cepat"
+        elif not isinstance(teks, str) or len(teks) > BATAS_PANJANG_INPUT:
+            alasan = "input tidak valid"
+        else:
+            jawaban = self.soal_ke(nomor)[3]
+            benar = periksa_jawaban(teks, jawaban)
+            if benar:
+                pemain.skor += self.skor_per_soal
+                pemain.benar += 1
+                umpan_balik = UMPAN_BALIK_BENAR
+            else:
+                pemain.salah += 1
+                umpan_balik = UMPAN_BALIK_SALAH
+            pemain.nomor += 1
+            pemain.boleh_jawab = waktu + umpan_balik.durasi - TOLERANSI_JEDA
+            self.jumlah_jawaban += 1
+            self._papan_berubah = True
+            self._kirim(pemain, {'tipe': 'hasil', 'nomor': nomor, 'benar': benar, 'skor': pemain.skor})
+            self._kirim(pemain, self._pesan_soal(pemain.nomor + SOAL_DI_DEPAN))
+            return
+        self._kirim(pemain, {'tipe': 'ditolak', 'nomor': nomor, 'alasan': alasan})
+
+    def _kirim(self, pemain, pesan):
+        if not pemain.writer.is_closing():
+            pemain.writer.write(kodekan(pesan))
+
+    def _siarkan(self, data, paksa=False):
+        """Kirim data yang sama ke semua pemain; tanpa paksa, klien yang tertinggal dilewati."""
+        for pemain in self.pemain:
+            transport = pemain.writer.transport
+            if transport.is_closing():
+                continue
+            if not paksa and transport.get_write_buffer_size() > BATAS_BUFFER_KLIEN:
+                self.siaran_dilewati += 1
+                continue
+            transport.write(data)
+
+    async def _loop_papan(self):
+        """Siarkan papan peringkat paling sering sekali per interval, hanya jika berubah."""
+        while True:
+            await asyncio.sleep(self.interval_papan)
+            if self._papan_berubah:
+                self._papan_berubah = False
+                self._siarkan(kodekan(self._pesan_papan()))
+                self.jumlah_siaran += 1
+
+
+class AntrianSoal:
+    """
+    Sumber soal sesi balapan di klien, pengganti SamplerSoal untuk Sesi.
+
+    Diisi dari pesan mulai/soal server; jawaban dihitung di klien (hanya
+    untuk umpan balik, server tetap menilai ulang).
+    """
+
+    def __init__(self):
+        self._soal = collections.deque()
+        self.nomor_berikutnya = 1 # Nomor soal yang diharapkan di tambah() berikutnya
+
+    def tambah(self, nomor, a, op, b):
+        """Simpan soal dari server; pesan yang tidak valid atau tidak berurutan diabaikan."""
+        if (nomor != self.nomor_berikutnya or op not in OPERATOR
+                or type(a) is not int or type(b) is not int or (op == '/' and b == 0)):
+            return False
+        self._soal.append((a, op, b, hitung_jawaban(a, op, b)))
+        self.nomor_berikutnya += 1
+        return True
+
+    def ada_soal(self):
+        return bool(self._soal)
+
+    def berikutnya(self):
+        """Soal berikutnya (a, op, b, jawaban); pemanggil memeriksa ada_soal() lebih dulu."""
+        return self._soal.popleft()
+
+
+class KlienBalapan:
+    """
+    Lapisan jaringan klien yang tidak pernah menahan loop frame pygame.
+
+    Koneksi berjalan di loop asyncio pada thread latar belakang. Game
+    mengirim dengan kirim() (hanya menjadwalkan penulisan) dan mengambil
+    pesan masuk dengan ambil_pesan() (tanpa menunggu). saat_pesan
+    (opsional) dipanggil dari thread jaringan saat ada pesan baru yang belum
+    diambil, misal untuk membangunkan loop game yang sedang idle.
+    """
+
+    def __init__(self, host, port, nama, saat_pesan=None):
+        self.host = host
+        self.port = port
+        self.nama = nama
+        self.saat_pesan = saat_pesan
+        self._masuk = queue.Queue()
+        self._diberitahu = False
+        self._writer = None
+        self._tertunda = [] # Pesan yang dikirim sebelum koneksi terbuka
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._jalankan, name="KlienBalapan", daemon=True)
+
+    def mulai(self):
+        self._thread.start()
+
+    def _jalankan(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._sesi())
+        finally:
+            self._loop.close()
+
+    async def _sesi(self):
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as e:
+            self._terima({'tipe': 'putus', 'alasan': str(e)})
+            return
+        self._writer = writer
+        writer.write(kodekan({'tipe': 'gabung', 'nama': self.nama}))
+        for data in self._tertunda:
+            writer.write(data)
+        self._tertunda = []
+
+        alasan = "server menutup koneksi"
+        try:
+            async for baris in reader:
+                try:
+                    self._terima(json.loads(baris))
+                except ValueError:
+                    continue
+        except (OSError, ValueError) as e:
+            alasan = str(e)
+        finally:
+            writer.close()
+        self._terima({'tipe': 'putus', 'alasan': alasan})
+
+    def _terima(self, pesan):
+        self._masuk.put(pesan)
+        if self.saat_pesan is not None and not self._diberitahu:
+            self._diberitahu = True
+            self.saat_pesan()
+
+    def ada_pesan(self):
+        return not self._masuk.empty()
+
+    def ambil_pesan(self):
+        """Semua pesan yang sudah tiba (list dict), tanpa menunggu."""
+        self._diberitahu = False
+        pesan = []
+        while True:
+            try:
+                pesan.append(self._masuk.get_nowait())
+            except queue.Empty:
+                return pesan
+
+    def kirim(self, pesan):
+        """Jadwalkan pengiriman pesan dari thread game (tidak menunggu jaringan)."""
+        try:
+            self._loop.call_soon_threadsafe(self._tulis, kodekan(pesan))
+        except RuntimeError:
+            pass # Loop sudah berhenti (koneksi putus)
+
+    def _tulis(self, data):
+        if self._writer is None:
+            self._tertunda.append(data)
+        elif not self._writer.is_closing():
+            self._writer.write(data)
+
+    def tutup(self, timeout=1.0):
+        """Tutup koneksi dan tunggu thread jaringan berhenti."""
+        try:
+            self._loop.call_soon_threadsafe(self._tutup_koneksi)
+        except RuntimeError:
+            pass
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _tutup_koneksi(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+# --- Server dari baris perintah ---
+
+def cetak_papan(server):
+    print(f"\nHasil balapan (seed {server.seed}, {len(server.pemain)} pemain)")
+    for i, pemain in enumerate(server.papan()):
+        print(f"{i + 1:>3}. {pemain.nama:<15} {pemain.skor:>5}  (benar {pemain.benar}, salah {pemain.salah})")
+
+
+def _baca_enter(loop, event):
+    """Thread pembaca stdin: set event setiap kali Enter ditekan."""
+    for _ in sys.stdin:
+        loop.call_soon_threadsafe(event.set)
+
+
+async def jalankan_server(args):
+    # Aturan soal & skor diambil dari game (diimpor di sini karena main.py mengimpor modul ini)
+    from bank_soal import BankSoal
+    from main import RUANG_SOAL, PENGATURAN_KESULITAN
+
+    durasi, skor_per_soal = PENGATURAN_KESULITAN[args.kesulitan]
+    if args.durasi:
+        durasi = args.durasi
+    server = ServerBalapan(BankSoal({args.kesulitan: RUANG_SOAL[args.kesulitan]}),
+                           args.kesulitan, durasi, skor_per_soal)
+    port = await server.buka(args.host, args.port)
+    print(f"Server balapan {args.kesulitan} ({durasi} detik) di {args.host}:{port}")
+
+    loop = asyncio.get_running_loop()
+    enter = asyncio.Event()
+    threading.Thread(target=_baca_enter, args=(loop, enter), name="PembacaEnter", daemon=True).start()
+    try:
+        pertama = True
+        while True:
+            if pertama and args.pemain:
+                print(f"Menunggu {args.pemain} pemain...")
+                await server.tunggu_pemain(args.pemain)
+            else:
+                print("Tekan Enter untuk memulai balapan (Ctrl+C untuk keluar)")
+                enter.clear()
+                await enter.wait()
+            pertama = False
+            server.mulai_balapan(args.seed)
+            print(f"Balapan dimulai dengan {len(server.pemain)} pemain")
+            await server.tunggu_selesai()
+            cetak_papan(server)
+    finally:
+        await server.tutup()
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Server mode balapan MathSprint.")
+    parser.add_argument('--host', default='0.0.0.0', help="Alamat yang didengarkan (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=PORT_DEFAULT)
+    parser.add_argument('--kesulitan', choices=("MUDAH", "SEDANG", "SULIT"), default="SEDANG")
+    parser.add_argument('--durasi', type=float, help="Durasi balapan (detik), default sesuai kesulitan")
+    parser.add_argument('--pemain', type=int, help="Mulai otomatis saat jumlah pemain ini tergabung")
+    parser.add_argument('--seed', type=int, help="Seed urutan soal (default: acak setiap balapan)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(jalankan_server(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Bank soal MathSprint.
+
+Ruang soal setiap kesulitan terbatas (misal pembagian Sulit hanya hasil*b
+dengan hasil dan b di 2..10), jadi semua soal dihitung sekali saja ke tabel
+berbasis array (a, op, b, jawaban). Setiap sesi mengambil soal lewat
+permutasi acak (Fisher-Yates bertahap): O(1) per soal, tanpa pengulangan
+sampai ruang soal operator tersebut habis, dan tanpa eval().
+"""
+
+import random
+from array import array
+
+# Kode operator yang disimpan di tabel
+OPERATOR = ('+', '-', '*', '/')
+
+
+def hitung_jawaban(a, op, b):
+    """Hitung jawaban bilangan bulat untuk a op b."""
+    if op == '+':
+        return a + b
+    if op == '-':
+        return a - b
+    if op == '*':
+        return a * b
+    return a // b
+
+
+def periksa_jawaban(teks_input, jawaban):
+    """
+    True jika teks yang diketik pemain sama dengan jawaban.
+
+    Input kosong ("") atau non-numerik (misal "-") dianggap salah.
+    """
+    try:
+        return int(teks_input) == jawaban
+    except (TypeError, ValueError):
+        return False
+
+
+def _pasangan_operand(op, rentang_a, rentang_b):
+    """
+    Hasilkan semua pasangan (a, b) untuk satu operator.
+
+    '-' hanya menghasilkan a >= b (tanpa jawaban negatif). Untuk '/',
+    rentang_a adalah rentang hasil bagi, sehingga a = hasil * b selalu
+    habis dibagi.
+    """
+    for x in range(rentang_a[0], rentang_a[1] + 1):
+        for b in range(rentang_b[0], rentang_b[1] + 1):
+            if op == '-' and x < b:
+                continue
+            if op == '/':
+                yield x * b, b
+            else:
+                yield x, b
+
+
+class TabelSoal:
+    """Seluruh soal satu kesulitan dalam array paralel (a, op, b, jawaban)."""
+
+    def __init__(self, daftar_aturan):
+        self.a = array('i')
+        self.op = array('b')
+        self.b = array('i')
+        self.jawaban = array('i')
+        self.rentang_op = [] # (awal, akhir) indeks per operator, urut seperti aturan
+
+        for op, rentang_a, rentang_b in daftar_aturan:
+            kode = OPERATOR.index(op)
+            awal = len(self.a)
+            for a, b in _pasangan_operand(op, rentang_a, rentang_b):
+                self.a.append(a)
+                self.op.append(kode)
+                self.b.append(b)
+                self.jawaban.append(hitung_jawaban(a, op, b))
+            self.rentang_op.append((awal, len(self.a)))
+
+    def __len__(self):
+        return len(self.a)
+
+    def soal(self, indeks):
+        """Kembalikan soal ke-indeks sebagai tuple (a, op, b, jawaban)."""
+        return self.a[indeks], OPERATOR[self.op[indeks]], self.b[indeks], self.jawaban[indeks]
+
+
+class SamplerSoal:
+    """
+    Pengambil soal tanpa pengulangan untuk satu sesi.
+
+    Operator dipilih acak dengan peluang sama (seperti random.choice di versi
+    lama), lalu soal diambil dari permutasi operator tersebut. Permutasi
+    dibangun bertahap: setiap pengambilan menukar satu elemen, jadi tidak
+    ada pengocokan penuh di awal sesi.
+    """
+
+    def __init__(self, tabel, seed=None):
+        self.tabel = tabel
+        self.rng = random.Random(seed)
+        self._permutasi = [array('i', range(awal, akhir)) for awal, akhir in tabel.rentang_op]
+        self._posisi = [0] * len(self._permutasi)
+
+    def berikutnya(self):
+        """Ambil soal berikutnya sebagai tuple (a, op, b, jawaban)."""
+        rng = self.rng
+        i = rng.randrange(len(self._permutasi))
+        permutasi = self._permutasi[i]
+        posisi = self._posisi[i]
+        if posisi >= len(permutasi):
+            posisi = 0 # Semua soal operator ini sudah keluar, mulai siklus baru
+        j = rng.randrange(posisi, len(permutasi))
+        permutasi[posisi], permutasi[j] = permutasi[j], permutasi[posisi]
+        self._posisi[i] = posisi + 1
+        return self.tabel.soal(permutasi[posisi])
+
+    def daftar_soal(self, jumlah):
+        """Ambil beberapa soal sekaligus (misal untuk tantangan harian)."""
+        return [self.berikutnya() for _ in range(jumlah)]
+
+
+class BankSoal:
+    """Tabel soal untuk semua kesulitan, dihitung sekali saat game dimulai."""
+
+    def __init__(self, ruang_soal):
+        self.tabel = {kesulitan: TabelSoal(aturan) for kesulitan, aturan in ruang_soal.items()}
+
+    def sampler(self, kesulitan, seed=None):
+        """Buat sampler baru untuk satu sesi."""
+        return SamplerSoal(self.tabel[kesulitan], seed)
+
+    def daftar_soal(self, kesulitan, jumlah, seed):
+        """Daftar soal yang selalu sama untuk seed yang sama."""
+        return self.sampler(kesulitan, seed).daftar_soal(jumlah)
+
+
+def seed_tantangan_harian(tanggal):
+    """Seed tantangan harian: sama untuk semua pemain pada tanggal yang sama."""
+    return tanggal.toordinal()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Mengukur alat_skor.py (export/merge) pada file skor besar dari banyak komputer.
+
+    python benchmarks/alat_skor.py [jumlah_entri] [jumlah_file]
+
+Membuat jumlah_file file scores.json terurut (seperti yang ditulis game,
+sebagian entri sengaja diduplikasi antar file), lalu menjalankan setiap
+perintah di proses baru dan mencatat waktu serta memori puncak (RSS).
+Sebagai pembanding, cara naif json.load semua file + sort di memori.
+Hasil merge diperiksa sama dengan hasil cara naif.
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dijalankan di proses anak: perintah alat_skor, lalu cetak RSS puncak (KB)
+KODE_ALAT = """
+import resource, sys
+sys.path.insert(0, {root!r})
+import alat_skor
+kode = alat_skor.main_cli(sys.argv[1:])
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)
+sys.exit(kode)
+"""
+
+KODE_NAIF = """
+import json, resource, sys
+entri = []
+for path in sys.argv[2:]:
+    with open(path) as f:
+        entri.extend(json.load(f))
+unik = {(e['nama'], e['skor'], e.get('tanggal', '')) for e in entri}
+daftar = sorted(unik, key=lambda e: (-e[1], e[2], e[0]))
+with open(sys.argv[1], 'w') as f:
+    for nama, skor, tanggal in daftar:
+        f.write(json.dumps({"nama": nama, "skor": skor, "tanggal": tanggal}, ensure_ascii=False) + '\\n')
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)
+"""
+
+
+def buat_file(folder, jumlah_entri, jumlah_file, rng):
+    """File scores.json per komputer, terurut skor menurun; ~1% entri juga ada di file lain."""
+    paths = []
+    bersama = []
+    per_file = jumlah_entri // jumlah_file
+    for i in range(jumlah_file):
+        entri = [{"nama": f"Siswa{rng.randrange(5000)}", "skor": rng.randrange(0, 3000, 5),
+                  "tanggal": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+                 for _ in range(per_file)]
+        entri[:len(bersama)] = bersama
+        bersama = rng.sample(entri, per_file // 100)
+        entri.sort(key=lambda e: e['skor'], reverse=True)
+        path = os.path.join(folder, f"lab{i:02d}.json")
+        with open(path, 'w') as f:
+            json.dump(entri, f, indent=4)
+        paths.append(path)
+    return paths
+
+
+def jalankan(nama, kode, argumen):
+    mulai = time.perf_counter()
+    proses = subprocess.run([sys.executable, '-c', kode] + argumen, capture_output=True, text=True)
+    detik = time.perf_counter() - mulai
+    if proses.returncode != 0:
+        raise SystemExit(f"{nama} gagal:\n{proses.stderr}")
+    rss_mb = int(proses.stderr.split()[-1]) / 1024
+    print(f"{nama:<28} {detik:7.2f} s   RSS puncak {rss_mb:7.1f} MB")
+
+
+def main_benchmark(jumlah_entri=1000000, jumlah_file=40):
+    rng = random.Random(1)
+    kode_alat = KODE_ALAT.format(root=ROOT)
+    with tempfile.TemporaryDirectory() as folder:
+        paths = buat_file(folder, jumlah_entri, jumlah_file, rng)
+        ukuran_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+        print(f"{jumlah_file} file, {jumlah_entri} entri, {ukuran_mb:.0f} MB")
+
+        keluaran = os.path.join(folder, "global.jsonl")
+        keluaran_naif = os.path.join(folder, "naif.jsonl")
+        jalankan("export -> csv", kode_alat, ['export', *paths, '-o', os.path.join(folder, "semua.csv")])
+        jalankan("merge (semua)", kode_alat, ['merge', *paths, '-o', keluaran, '--tmp', folder])
+        jalankan("merge --teratas 100", kode_alat,
+                 ['merge', *paths, '-o', os.path.join(folder, "top.jsonl"), '--teratas', '100'])
+        jalankan("naif: json.load + sort", KODE_NAIF, [keluaran_naif, *paths])
+
+        with open(keluaran, 'rb') as a, open(keluaran_naif, 'rb') as b:
+            sama = a.read() == b.read()
+        with open(keluaran) as f:
+            jumlah_keluaran = sum(1 for _ in f)
+        print(f"Hasil merge: {jumlah_keluaran} entri unik, "
+              f"{'sama dengan' if sama else 'BERBEDA dari'} cara naif")
+    return 0 if sama else 1
+
+
+if __name__ == "__main__":
+    argumen = [int(a) for a in sys.argv[1:3]]
+    sys.exit(main_benchmark(*argumen))
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Uji beban server mode balapan dengan klien simulasi.
+
+    python benchmarks/balapan.py [jumlah_klien] [durasi_detik]
+
+Server dan semua klien berjalan di satu loop asyncio pada localhost. Setiap
+klien bergabung, menunggu pesan mulai, lalu menjawab soal yang dikirim
+server (AntrianSoal, seperti game) setelah umpan balik jawaban sebelumnya
+selesai ditambah latensi acak, sebagian sengaja salah. Dicatat: jawaban per
+detik, latensi jawab -> hasil, jumlah siaran papan dibanding jumlah jawaban,
+penilaian server yang berbeda dari perkiraan klien, dan jawaban yang
+ditolak (keduanya harus 0 untuk klien yang mengikuti aturan game).
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main  # noqa: E402
+from balapan import AntrianSoal, ServerBalapan, kodekan  # noqa: E402
+from bank_soal import BankSoal  # noqa: E402
+from inti_game import UMPAN_BALIK_BENAR, UMPAN_BALIK_SALAH  # noqa: E402
+from profiler import persentil  # noqa: E402
+
+KESULITAN = main.KESULITAN_SEDANG
+AKURASI = 0.8
+LATENSI_JAWAB = (0.05, 0.3) # Detik "berpikir" per soal (acak seragam)
+
+
+class StatistikKlien:
+    def __init__(self):
+        self.latensi = [] # Detik dari kirim jawaban sampai pesan hasil
+        self.papan = 0 # Pesan papan yang diterima
+        self.beda_penilaian = 0
+        self.ditolak = 0
+
+
+async def klien_simulasi(port, nama, rng, statistik):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(kodekan({'tipe': 'gabung', 'nama': nama}))
+    hasil_diterima = asyncio.Event()
+    tunggu_hasil = {} # nomor -> (waktu kirim, perkiraan benar)
+    antrian = AntrianSoal()
+    tugas_jawab = None
+
+    async def jawab():
+        nomor = 1
+        umpan_balik = 0.0 # Durasi umpan balik jawaban sebelumnya
+        while True:
+            await asyncio.sleep(umpan_balik + rng.uniform(*LATENSI_JAWAB))
+            _, _, _, jawaban = antrian.berikutnya()
+            benar = rng.random() < AKURASI
+            teks = str(jawaban if benar else jawaban + 1)
+            hasil_diterima.clear()
+            tunggu_hasil[nomor] = (time.perf_counter(), benar)
+            writer.write(kodekan({'tipe': 'jawab', 'nomor': nomor, 'input': teks}))
+            await hasil_diterima.wait()
+            umpan_balik = (UMPAN_BALIK_BENAR if benar else UMPAN_BALIK_SALAH).durasi
+            nomor += 1
+
+    try:
+        async for baris in reader:
+            pesan = json.loads(baris)
+            tipe = pesan['tipe']
+            if tipe == 'mulai':
+                for nomor, soal in enumerate(pesan['soal'], 1):
+                    antrian.tambah(nomor, *soal)
+                tugas_jawab = asyncio.create_task(jawab())
+            elif tipe == 'soal':
+                antrian.tambah(pesan['nomor'], pesan['a'], pesan['op'], pesan['b'])
+            elif tipe == 'hasil':
+                waktu_kirim, perkiraan = tunggu_hasil.pop(pesan['nomor'])
+                statistik.latensi.append(time.perf_counter() - waktu_kirim)
+                statistik.beda_penilaian += pesan['benar'] != perkiraan
+                hasil_diterima.set()
+            elif tipe == 'ditolak':
+                statistik.ditolak += 1
+                hasil_diterima.set()
+            elif tipe == 'papan':
+                statistik.papan += 1
+            elif tipe == 'selesai':
+                break
+    finally:
+        if tugas_jawab is not None:
+            tugas_jawab.cancel()
+        writer.close()
+
+
+async def uji_beban(jumlah_klien, durasi):
+    bank = BankSoal(main.RUANG_SOAL)
+    server = ServerBalapan(bank, KESULITAN, durasi, main.PENGATURAN_KESULITAN[KESULITAN][1])
+    port = await server.buka('127.0.0.1', 0)
+
+    rng = random.Random(0)
+    semua_statistik = [StatistikKlien() for _ in range(jumlah_klien)]
+    tugas = [asyncio.create_task(klien_simulasi(port, f"Bot{i}", random.Random(rng.random()), s))
+             for i, s in enumerate(semua_statistik)]
+    await server.tunggu_pemain(jumlah_klien)
+
+    cpu_mulai = time.process_time()
+    mulai = time.perf_counter()
+    server.mulai_balapan(seed=1)
+    await asyncio.gather(*tugas)
+    lama = time.perf_counter() - mulai
+    cpu = time.process_time() - cpu_mulai
+    await server.tutup()
+
+    latensi = sorted(x for s in semua_statistik for x in s.latensi)
+    print(f"{jumlah_klien} klien, balapan {durasi:.0f} detik (+{lama - durasi:.1f} detik toleransi)")
+    print(f"Jawaban dinilai server: {server.jumlah_jawaban} ({server.jumlah_jawaban / durasi:.0f}/detik)")
+    print(f"Latensi jawab->hasil: p50 {persentil(latensi, 50) * 1000:.2f} ms  "
+          f"p95 {persentil(latensi, 95) * 1000:.2f} ms  p99 {persentil(latensi, 99) * 1000:.2f} ms")
+    print(f"Siaran papan: {server.jumlah_siaran} (dilewati untuk klien lambat: {server.siaran_dilewati}), "
+          f"rata-rata {sum(s.papan for s in semua_statistik) / jumlah_klien:.1f} papan diterima per klien")
+    print(f"Penilaian berbeda: {sum(s.beda_penilaian for s in semua_statistik)}  "
+          f"ditolak: {sum(s.ditolak for s in semua_statistik)}")
+    print(f"CPU proses (server + semua klien): {cpu:.2f} detik ({cpu / lama:.0%})")
+
+
+def main_benchmark():
+    jumlah_klien = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    durasi = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    asyncio.run(uji_beban(jumlah_klien, durasi))
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Membandingkan waktu memuat suara: decode MP3 vs cache PCM (cache_audio.py).
+
+Dijalankan dengan driver audio dummy milik SDL:
+    python benchmarks/cache_audio.py [jumlah_putaran]
+
+Cache ditulis ke folder sementara, jadi folder .cache milik game tidak disentuh.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame  # noqa: E402
+
+import main  # noqa: E402
+from cache_audio import CacheAudio  # noqa: E402
+
+DAFTAR_SUARA = (main.PATH_SOUND_BENAR, main.PATH_SOUND_SALAH)
+
+
+def ukur(fungsi, putaran):
+    """Median waktu (ms) memuat semua suara dengan fungsi(path)."""
+    hasil = []
+    for _ in range(putaran):
+        mulai = time.perf_counter()
+        for path in DAFTAR_SUARA:
+            fungsi(path)
+        hasil.append((time.perf_counter() - mulai) * 1000)
+    return statistics.median(hasil)
+
+
+def main_benchmark():
+    putaran = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pygame.mixer.init()
+    with tempfile.TemporaryDirectory() as folder:
+        cache = CacheAudio(folder)
+        for path in DAFTAR_SUARA:
+            cache.muat(path) # Isi cache lebih dulu
+
+        decode_ms = ukur(pygame.mixer.Sound, putaran)
+        cache_ms = ukur(cache.muat, putaran)
+
+    print(f"Format mixer {pygame.mixer.get_init()}, {len(DAFTAR_SUARA)} suara, {putaran} putaran")
+    print(f"Decode MP3  median {decode_ms:7.2f} ms")
+    print(f"Cache PCM   median {cache_ms:7.2f} ms  ({decode_ms / cache_ms:.1f}x lebih cepat)")
+    pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    main_benchmark()
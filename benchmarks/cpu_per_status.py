@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Mengukur pemakaian CPU per status game dengan dan tanpa mode idle.
+
+Dijalankan headless dengan driver video/audio dummy milik SDL:
+    python benchmarks/cpu_per_status.py [detik_per_status]
+
+Untuk setiap status, loop game (jalankan_frame) dijalankan selama beberapa
+detik tanpa input, lalu dicatat rasio waktu CPU proses terhadap waktu nyata.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+
+def siapkan_status(game, status):
+    """Pindahkan game ke status tertentu beserta data yang dibutuhkan."""
+    if status in (main.STATE_BERMAIN, main.STATE_PAUSE, main.STATE_HASIL_AKHIR):
+        game.kesulitan_terpilih = main.KESULITAN_MUDAH
+        game.mulai_game_baru()
+        game.status_game_sekarang = main.STATE_BERMAIN
+        if status == main.STATE_PAUSE:
+            game.pause_game()
+        elif status == main.STATE_HASIL_AKHIR:
+            game.selesaikan_game()
+    else:
+        game.status_game_sekarang = status
+
+
+def ukur_cpu(game, status, detik, mode_idle):
+    """Kembalikan persentase CPU rata-rata selama status dijalankan."""
+    game.mode_idle = mode_idle
+    siapkan_status(game, status)
+    game.status_terakhir_digambar = None
+
+    cpu_awal = time.process_time()
+    nyata_awal = time.perf_counter()
+    while time.perf_counter() - nyata_awal < detik:
+        game.jalankan_frame()
+    cpu = time.process_time() - cpu_awal
+    nyata = time.perf_counter() - nyata_awal
+    return 100.0 * cpu / nyata
+
+
+def main_benchmark():
+    detik = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    daftar_status = [
+        main.STATE_MENU_UTAMA,
+        main.STATE_PILIH_KESULITAN,
+        main.STATE_CARA_BERMAIN,
+        main.STATE_PAUSE,
+        main.STATE_HASIL_AKHIR,
+        main.STATE_BERMAIN,
+    ]
+
+    # Skor, telemetri & rekaman ditulis ke folder sementara, bukan ke file milik pemain
+    with tempfile.TemporaryDirectory() as folder:
+        game = main.MathSprintGame(path_skor=os.path.join(folder, "scores.json"),
+                                   path_telemetri=os.path.join(folder, "telemetri.jsonl"),
+                                   folder_rekaman=os.path.join(folder, "rekaman"))
+        print(f"{'Status':<18}{'CPU tanpa idle':>16}{'CPU dengan idle':>18}")
+        for status in daftar_status:
+            tanpa_idle = ukur_cpu(game, status, detik, False)
+            dengan_idle = ukur_cpu(game, status, detik, True)
+            print(f"{status:<18}{tanpa_idle:>15.1f}%{dengan_idle:>17.1f}%")
+        game.papan_skor.tutup()
+        if game.telemetri is not None:
+            game.telemetri.tutup()
+
+
+if __name__ == "__main__":
+    main_benchmark()
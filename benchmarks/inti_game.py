@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Mengukur biaya logika per jawaban: status sesi lama (dict berkunci string,
+dict umpan balik baru setiap jawaban) dibandingkan Sesi berbasis __slots__
+di inti_game.py. Tanpa display dan tanpa suara:
+
+    python benchmarks/inti_game.py [jumlah_jawaban]
+
+Satu "jawaban" = ketik input, Enter (nilai jawaban & mulai umpan balik),
+langkah logika sampai umpan balik selesai, lalu soal berikutnya. Dicatat
+waktu per jawaban dan jumlah blok memori (tracemalloc) yang dialokasikan
+dan masih hidup setelah satu jawaban, plus ukuran objek status.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bank_soal import BankSoal, periksa_jawaban  # noqa: E402
+from inti_game import LANGKAH_LOGIKA, Sesi, SELESAI_UMPAN_BALIK  # noqa: E402
+from main import RUANG_SOAL, WARNA_HIJAU_BENAR, WARNA_MERAH_SALAH  # noqa: E402
+
+KESULITAN = 'SEDANG'
+BATAS_WAKTU = 10 ** 6 # Sesi tidak pernah habis selama pengukuran
+SKOR_PER_SOAL = 15
+
+
+class SesiDict:
+    """Salinan logika sesi sebelum inti_game.py (data_game_aktif di main.py)."""
+
+    def __init__(self, sampler, waktu_mulai):
+        self.sampler_soal = sampler
+        self.data_game_aktif = {
+            'skor': 0,
+            'jumlah_benar': 0,
+            'jumlah_salah': 0,
+            'nomor_soal': 1,
+            'input_jawaban': "",
+            'soal_teks': "",
+            'soal': None,
+            'jawaban_benar': 0,
+            'waktu_mulai_soal': 0,
+            'sedang_umpan_balik': False,
+            'tik_selesai_umpan_balik': 0,
+            'info_umpan_balik': {},
+            'waktu_mulai_game': waktu_mulai,
+            'tik_logika': 0,
+        }
+        self.data_game_aktif['total_batas_waktu'] = BATAS_WAKTU
+        self.data_game_aktif['skor_per_soal'] = SKOR_PER_SOAL
+        self.waktu_main = waktu_mulai
+        self.buat_soal_baru()
+
+    def buat_soal_baru(self):
+        a, op, b, jawaban = self.sampler_soal.berikutnya()
+        self.data_game_aktif['soal_teks'] = f"{a} {op} {b}"
+        self.data_game_aktif['soal'] = (a, op, b)
+        self.data_game_aktif['jawaban_benar'] = jawaban
+        self.data_game_aktif['waktu_mulai_soal'] = self.waktu_main
+
+    def tambah_input(self, karakter):
+        if not self.data_game_aktif['sedang_umpan_balik']:
+            if karakter.isdigit() or (karakter == '-' and not self.data_game_aktif['input_jawaban']):
+                self.data_game_aktif['input_jawaban'] += karakter
+
+    def proses_jawaban(self):
+        if self.data_game_aktif['sedang_umpan_balik']:
+            return
+        jawaban_benar = self.data_game_aktif['jawaban_benar']
+        benar = periksa_jawaban(self.data_game_aktif['input_jawaban'], jawaban_benar)
+        if benar:
+            self.data_game_aktif['skor'] += self.data_game_aktif['skor_per_soal']
+            self.data_game_aktif['jumlah_benar'] += 1
+            self.data_game_aktif['info_umpan_balik'] = {
+                'teks': "Benar!",
+                'warna': WARNA_HIJAU_BENAR,
+                'durasi': 0.8,
+                'jawaban_ditampilkan': None
+            }
+        else:
+            self.data_game_aktif['jumlah_salah'] += 1
+            self.data_game_aktif['info_umpan_balik'] = {
+                'teks': "Salah!",
+                'warna': WARNA_MERAH_SALAH,
+                'durasi': 1.0,
+                'jawaban_ditampilkan': jawaban_benar
+            }
+        durasi = self.data_game_aktif['info_umpan_balik']['durasi']
+        self.data_game_aktif['sedang_umpan_balik'] = True
+        self.data_game_aktif['tik_selesai_umpan_balik'] = self.tik_sesi() + round(durasi / LANGKAH_LOGIKA)
+
+    def tik_sesi(self):
+        return int((self.waktu_main - self.data_game_aktif['waktu_mulai_game']) / LANGKAH_LOGIKA)
+
+    def langkah(self):
+        """Satu iterasi loop perbarui_logika lama. True jika soal berganti."""
+        data = self.data_game_aktif
+        data['tik_logika'] += 1
+        if data['sedang_umpan_balik']:
+            if data['tik_logika'] >= data['tik_selesai_umpan_balik']:
+                data['sedang_umpan_balik'] = False
+                self.lanjut_soal_berikutnya()
+                return True
+        elif data['tik_logika'] >= round(data['total_batas_waktu'] / LANGKAH_LOGIKA):
+            raise RuntimeError("waktu habis")
+        return False
+
+    def lanjut_soal_berikutnya(self):
+        self.data_game_aktif['nomor_soal'] += 1
+        self.data_game_aktif['input_jawaban'] = ""
+        self.buat_soal_baru()
+
+
+def jawab_dict(sesi, input_jawaban):
+    for karakter in input_jawaban:
+        sesi.tambah_input(karakter)
+    # Enter di tengah langkah logika sekarang (int() pada batas langkah bisa jatuh ke langkah sebelumnya)
+    sesi.waktu_main = sesi.data_game_aktif['waktu_mulai_game'] + (sesi.data_game_aktif['tik_logika'] + 0.5) * LANGKAH_LOGIKA
+    sesi.proses_jawaban()
+    while not sesi.langkah():
+        pass
+    return sesi.data_game_aktif['jawaban_benar']
+
+
+def jawab_slots(sesi, input_jawaban):
+    for karakter in input_jawaban:
+        sesi.tambah_input(karakter)
+    sesi.jawab(sesi.tik)
+    while sesi.langkah() != SELESAI_UMPAN_BALIK:
+        pass
+    sesi.lanjut_soal(sesi.waktu_mulai + sesi.tik * LANGKAH_LOGIKA)
+    return sesi.soal.jawaban
+
+
+def daftar_input(jumlah):
+    """Input bergantian benar/salah (umpan balik keduanya sama-sama diuji)."""
+    jawaban = BankSoal(RUANG_SOAL).daftar_soal(KESULITAN, jumlah + 1, seed=7)
+    return [str(j) if i % 2 == 0 else str(j + 1) for i, (_, _, _, j) in enumerate(jawaban)]
+
+
+def ukur(nama, buat_sesi, jawab, daftar):
+    sesi = buat_sesi()
+    mulai = time.perf_counter()
+    for input_jawaban in daftar:
+        jawab(sesi, input_jawaban)
+    biaya_us = (time.perf_counter() - mulai) / len(daftar) * 1e6
+
+    # Alokasi: blok memori baru yang masih hidup setelah satu jawaban (rata-rata)
+    sesi = buat_sesi()
+    jawab(sesi, daftar[0]) # Cache string/int pertama tidak ikut dihitung
+    sampel = daftar[1:201]
+    tracemalloc.start()
+    total_blok = 0
+    for input_jawaban in sampel:
+        sebelum = tracemalloc.take_snapshot()
+        jawab(sesi, input_jawaban)
+        sesudah = tracemalloc.take_snapshot()
+        total_blok += sum(s.count_diff for s in sesudah.compare_to(sebelum, 'filename')
+                          if s.count_diff > 0 and s.traceback[0].filename != tracemalloc.__file__)
+    tracemalloc.stop()
+    print(f"{nama:<8} {biaya_us:7.2f} us/jawaban   +{total_blok / len(sampel):4.1f} blok hidup/jawaban")
+    return biaya_us
+
+
+def main_benchmark(jumlah=50000):
+    bank = BankSoal(RUANG_SOAL)
+    daftar = daftar_input(jumlah)
+    print(f"{jumlah} jawaban, kesulitan {KESULITAN}")
+
+    buat_dict = lambda: SesiDict(bank.sampler(KESULITAN, seed=7), 0.0)
+    buat_slots = lambda: Sesi(bank.sampler(KESULITAN, seed=7), KESULITAN, BATAS_WAKTU, SKOR_PER_SOAL, 0.0)
+
+    # Kedua model harus memberi hasil yang sama
+    a, b = buat_dict(), buat_slots()
+    for input_jawaban in daftar[:500]:
+        jawab_dict(a, input_jawaban)
+        jawab_slots(b, input_jawaban)
+    data = a.data_game_aktif
+    assert (data['skor'], data['jumlah_benar'], data['jumlah_salah'], data['nomor_soal'], data['tik_logika']) == \
+           (b.skor, b.jumlah_benar, b.jumlah_salah, b.nomor_soal, b.tik), "hasil model berbeda"
+
+    lama = ukur("dict", buat_dict, jawab_dict, daftar)
+    baru = ukur("slots", buat_slots, jawab_slots, daftar)
+    print(f"Percepatan: {lama / baru:.2f}x")
+
+    sesi = buat_slots()
+    ukuran_dict = sys.getsizeof(a.data_game_aktif) + sys.getsizeof(a.data_game_aktif['info_umpan_balik'])
+    ukuran_slots = sys.getsizeof(sesi) + sys.getsizeof(sesi.soal)
+    print(f"Ukuran status: dict {ukuran_dict} B, slots {ukuran_slots} B (Sesi + Soal, tanpa isi)")
+
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark penyimpanan skor SQLite dengan 100.000 sesi.
+
+    python benchmarks/sqlite_skor.py [jumlah_baris]
+
+Membandingkan query Top-N per kesulitan dan skor terbaik pemain di SQLite
+(memakai indeks) dengan cara lama: memuat seluruh JSON lalu mengurutkan.
+"""
+
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from penyimpanan_sqlite import PenyimpananSkorSQLite, SQL_KOLOM_HASIL  # noqa: E402
+
+DAFTAR_KESULITAN = ("MUDAH", "SEDANG", "SULIT")
+
+
+def buat_baris(jumlah, rng):
+    awal = datetime.date(2025, 1, 1)
+    for _ in range(jumlah):
+        benar = rng.randint(0, 40)
+        yield (
+            f"Siswa{rng.randint(1, 2000)}",
+            rng.choice(DAFTAR_KESULITAN),
+            benar * 10,
+            benar,
+            rng.randint(0, 10),
+            rng.uniform(45, 90),
+            (awal + datetime.timedelta(days=rng.randint(0, 365))).isoformat(),
+        )
+
+
+def rata_rata_ms(fungsi, ulangan):
+    mulai = time.perf_counter()
+    for _ in range(ulangan):
+        fungsi()
+    return (time.perf_counter() - mulai) * 1000.0 / ulangan
+
+
+def main_benchmark():
+    jumlah = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)
+    baris = list(buat_baris(jumlah, rng))
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = PenyimpananSkorSQLite(os.path.join(folder, "scores.db"))
+
+        mulai = time.perf_counter()
+        db.simpan_banyak(baris)
+        print(f"Insert {jumlah} baris: {(time.perf_counter() - mulai) * 1000:.1f} ms")
+
+        print(f"top_n(SULIT, 5):            {rata_rata_ms(lambda: db.top_n('SULIT', 5), 1000):.3f} ms")
+        print(f"skor_terbaik_pemain:        {rata_rata_ms(lambda: db.skor_terbaik_pemain('Siswa7'), 1000):.3f} ms")
+        print(f"skor_terbaik_pemain(SULIT): {rata_rata_ms(lambda: db.skor_terbaik_pemain('Siswa7', 'SULIT'), 1000):.3f} ms")
+        print(f"riwayat_pemain (1 bulan):   {rata_rata_ms(lambda: db.riwayat_pemain('Siswa7', '2025-03-01', '2025-03-31'), 1000):.3f} ms")
+
+        # Cara lama: muat seluruh file lalu urutkan
+        path_json = os.path.join(folder, "scores.json")
+        with open(path_json, "w") as f:
+            json.dump([{"nama": b[0], "skor": b[2], "tanggal": b[6]} for b in baris], f)
+
+        def muat_dan_urutkan():
+            with open(path_json) as f:
+                skor = json.load(f)
+            skor.sort(key=lambda x: x['skor'], reverse=True)
+            return skor[:5]
+
+        print(f"JSON muat + sort (lama):    {rata_rata_ms(muat_dan_urutkan, 5):.3f} ms")
+
+        print("\nRencana query:")
+        for sql, parameter in (
+            (SQL_KOLOM_HASIL + " WHERE kesulitan = ? ORDER BY skor DESC LIMIT ?", ("SULIT", 5)),
+            (SQL_KOLOM_HASIL + " WHERE nama = ? ORDER BY skor DESC LIMIT 1", ("Siswa7",)),
+            (SQL_KOLOM_HASIL + " WHERE nama = ? AND tanggal BETWEEN ? AND ? ORDER BY tanggal",
+             ("Siswa7", "2025-03-01", "2025-03-31")),
+        ):
+            rencana = db._conn.execute("EXPLAIN QUERY PLAN " + sql, parameter).fetchall()
+            print(" -", "; ".join(r[3] for r in rencana))
+        db.tutup()
+
+
+if __name__ == "__main__":
+    main_benchmark()
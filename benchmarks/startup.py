@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Mengukur waktu startup MathSprint: dari proses dijalankan sampai frame
+pertama yang interaktif, dan sampai semua aset (font, suara, musik) siap.
+
+Setiap putaran menjalankan proses baru `python main.py --ukur-startup`
+(driver video/audio dummy milik SDL), lalu dilaporkan median dan maksimum:
+    python benchmarks/startup.py [jumlah_putaran]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POLA_HASIL = re.compile(r"frame_pertama_ms=([\d.]+) aset_siap_ms=([\d.]+)")
+
+
+def satu_putaran():
+    """Jalankan game sekali; kembalikan (proses_ms, frame_pertama_ms, aset_siap_ms)."""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    mulai = time.perf_counter()
+    keluaran = subprocess.run([sys.executable, "main.py", "--ukur-startup"], cwd=ROOT, env=env,
+                              capture_output=True, text=True, check=True).stdout
+    proses_ms = (time.perf_counter() - mulai) * 1000
+    cocok = POLA_HASIL.search(keluaran)
+    if cocok is None:
+        raise RuntimeError(f"Keluaran tidak dikenali:\n{keluaran}")
+    return proses_ms, float(cocok.group(1)), float(cocok.group(2))
+
+
+def main_benchmark():
+    putaran = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    hasil = [satu_putaran() for _ in range(putaran)]
+
+    print(f"{putaran} putaran (ms sejak main.py mulai dieksekusi)")
+    for i, label in ((1, "Frame pertama"), (2, "Aset siap"), (0, "Proses total")):
+        nilai = [h[i] for h in hasil]
+        print(f"{label:<15} median {statistics.median(nilai):8.1f}  maks {max(nilai):8.1f}")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+Suite benchmark jalur panas MathSprint, headless (driver dummy SDL).
+
+    python benchmarks/suite.py --json hasil.json
+    python benchmarks/suite.py --bandingkan baseline.json --ambang 0.15
+    python benchmarks/suite.py --filter frame/ --resolusi 800x600 1920x1080
+    python benchmarks/suite.py --render tekstur --filter frame/ --bandingkan permukaan.json
+
+Yang diukur (waktu per panggilan, median dari beberapa putaran):
+- render_teks (teks statis dari cache & teks HUD dinamis) dan widget Tombol
+  (gambar satu tombol; hover berganti lalu hanya widget dirty digambar ulang)
+- soal baru per kesulitan (Sesi.lanjut_soal: sampler bank soal + isi Soal)
+- muat_skor_tertinggi / simpan_skor_tertinggi untuk file skor yang makin besar
+- satu frame penuh (perbarui + gambar + present, seluruh layar digambar
+  ulang) setiap status di 800x600, 1080p, dan 4K
+
+Hasil ditulis sebagai JSON. Dengan --bandingkan, setiap hasil dibandingkan
+dengan baseline; yang lebih lambat dari ambang ditandai REGRESI dan kode
+keluar 1 (untuk CI).
+
+--render tekstur mengukur frame dengan backend Renderer SDL2 (render_tekstur.py;
+headless memakai renderer software). Nama kasus sama dengan backend permukaan,
+jadi --bandingkan dengan hasil backend permukaan langsung menunjukkan selisihnya.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame  # noqa: E402
+
+import main  # noqa: E402
+from jam_game import JamGame  # noqa: E402
+
+VERSI_FORMAT = 1
+RESOLUSI = ("800x600", "1920x1080", "3840x2160")
+UKURAN_FILE_SKOR = (10, 1000, 10000, 100000)
+PUTARAN = 7 # Putaran per kasus; yang dilaporkan median-nya
+AMBANG_DEFAULT = 0.15 # 15% lebih lambat dari baseline = regresi
+
+DAFTAR_STATUS_FRAME = (main.STATE_MENU_UTAMA, main.STATE_BERMAIN, main.STATE_PAUSE, main.STATE_HASIL_AKHIR)
+
+
+def ukur(fungsi, waktu_target, putaran=PUTARAN):
+    """
+    Median waktu per panggilan (mikrodetik).
+
+    Jumlah panggilan per putaran dikalibrasi agar satu putaran memakan
+    sekitar waktu_target / putaran detik.
+    """
+    ulangan = 1
+    while True:
+        mulai = time.perf_counter()
+        for _ in range(ulangan):
+            fungsi()
+        durasi = time.perf_counter() - mulai
+        if durasi >= waktu_target / putaran / 4 or ulangan >= 1 << 20:
+            break
+        ulangan *= 4
+    ulangan = max(1, int(ulangan * (waktu_target / putaran) / max(durasi, 1e-9)))
+
+    hasil = []
+    for _ in range(putaran):
+        mulai = time.perf_counter()
+        for _ in range(ulangan):
+            fungsi()
+        hasil.append((time.perf_counter() - mulai) / ulangan * 1e6)
+    return {'us': statistics.median(hasil), 'us_min': min(hasil), 'ulangan': ulangan}
+
+
+class Suite:
+    """Kumpulan kasus benchmark terhadap satu instance game headless."""
+
+    def __init__(self, folder, waktu_target, pola=None, mode_render=main.RENDER_PERMUKAAN):
+        self.folder = folder
+        self.waktu_target = waktu_target
+        self.pola = pola
+        self.hasil = {}
+        self.game = main.MathSprintGame(headless=True, jam=JamGame(virtual=True),
+                                        path_skor=os.path.join(folder, "scores.json"),
+                                        path_telemetri=None, folder_rekaman=None, mode_render=mode_render)
+
+    def dipilih(self, *nama):
+        """True jika salah satu kasus lolos --filter."""
+        return not self.pola or any(p in n for p in self.pola for n in nama)
+
+    def kasus(self, nama, fungsi, waktu_target=None):
+        if not self.dipilih(nama):
+            return
+        hasil = ukur(fungsi, waktu_target or self.waktu_target)
+        self.hasil[nama] = hasil
+        print(f"{nama:<36}{hasil['us']:>12.2f} us{1e6 / hasil['us']:>14.0f} /s")
+
+    # --- Teks & tombol ---
+
+    def teks_dan_tombol(self):
+        game = self.game
+        if game.render_tekstur:
+            return # Tanpa present perintah Renderer hanya menumpuk di antrian; diukur lewat frame/
+        game.status_game_sekarang = main.STATE_MENU_UTAMA
+        x, y = game.lebar // 2, game.tinggi // 2
+
+        def teks_statis():
+            game.render_teks("Mulai Bermain", game.font_sedang, main.WARNA_PUTIH, x, y)
+
+        def teks_dinamis():
+            game.render_teks("Waktu: 42s", game.font_sedang, main.WARNA_PUTIH, x, y, dinamis=True)
+
+        layar = game.ambil_layar_widget(main.STATE_MENU_UTAMA)
+        layar.gambar(game.layar, penuh=True)
+        tombol = layar.tombol()[0]
+        posisi_hover = (tombol.rect.center, (0, 0)) # Di atas tombol / di luar semua tombol
+        giliran = [0]
+
+        def gambar_tombol():
+            tombol.gambar(game.layar)
+
+        def hover_tombol():
+            giliran[0] ^= 1
+            layar.perbarui_hover(posisi_hover[giliran[0]])
+            layar.gambar(game.layar)
+
+        self.kasus("render_teks/statis", teks_statis)
+        self.kasus("render_teks/dinamis", teks_dinamis)
+        self.kasus("tombol/gambar", gambar_tombol)
+        self.kasus("tombol/hover", hover_tombol)
+        game.rect_dirty = []
+
+    # --- Soal ---
+
+    def soal(self):
+        game = self.game
+        for kesulitan in (main.KESULITAN_MUDAH, main.KESULITAN_SEDANG, main.KESULITAN_SULIT):
+            game.kesulitan_terpilih = kesulitan
+            game.mulai_game_baru(seed=1)
+            sesi = game.sesi
+            self.kasus(f"soal_baru/{kesulitan}", lambda: sesi.lanjut_soal(0.0))
+
+    # --- Skor ---
+
+    def skor(self):
+        game = self.game
+        papan = game.papan_skor
+        papan.batas = None # Simpan semua entri agar file tetap sebesar N
+        for jumlah in UKURAN_FILE_SKOR:
+            jenis = ('muat', 'muat_cache', 'simpan', 'simpan_tertulis')
+            if not self.dipilih(*(f"skor/{j}/{jumlah}" for j in jenis)):
+                continue
+            entri = [{"nama": f"Siswa{i}", "skor": (jumlah - i) * 5, "tanggal": "2025-01-01"}
+                     for i in range(jumlah)]
+            with open(papan.path, 'w') as f:
+                json.dump(entri, f, indent=4)
+
+            def muat_dingin():
+                papan._mtime = None # Paksa file dibaca ulang seperti saat file berubah
+                papan._waktu_cek_terakhir = None
+                game.muat_skor_tertinggi()
+
+            waktu = min(self.waktu_target, 0.05 + jumlah * 2e-5) # File besar: cukup beberapa panggilan
+            self.kasus(f"skor/muat/{jumlah}", muat_dingin, waktu)
+            # Panggilan biasa (setiap frame layar hasil) hanya membaca cache di memori
+            self.kasus(f"skor/muat_cache/{jumlah}", game.muat_skor_tertinggi)
+
+            def simpan():
+                # Waktu yang dibayar loop game (penulisan file di thread latar belakang)
+                game.simpan_skor_tertinggi("Bench", 1)
+                papan._skor.pop() # File tetap N entri untuk panggilan berikutnya
+
+            def simpan_sampai_tertulis():
+                game.simpan_skor_tertinggi("Bench", 1)
+                papan._antrian.join()
+                papan._skor.pop()
+
+            self.kasus(f"skor/simpan/{jumlah}", simpan, waktu)
+            papan._antrian.join()
+            self.kasus(f"skor/simpan_tertulis/{jumlah}", simpan_sampai_tertulis, waktu * 4)
+        papan.batas = 5
+        if os.path.exists(papan.path):
+            os.remove(papan.path)
+        papan._skor = []
+
+    # --- Frame penuh per status ---
+
+    def siapkan_status(self, status):
+        game = self.game
+        if status in (main.STATE_BERMAIN, main.STATE_PAUSE, main.STATE_HASIL_AKHIR):
+            game.kesulitan_terpilih = main.KESULITAN_MUDAH
+            game.mulai_game_baru(seed=1)
+            game.status_game_sekarang = main.STATE_BERMAIN
+            game.gambar_layar_bermain()
+            if status == main.STATE_PAUSE:
+                game.pause_game()
+            elif status == main.STATE_HASIL_AKHIR:
+                game.selesaikan_game()
+        else:
+            game.status_game_sekarang = status
+
+    def frame_penuh(self, resolusi):
+        game = self.game
+        ukuran = tuple(int(x) for x in resolusi.split('x'))
+        if game.render_tekstur:
+            game.layar.ubah_ukuran(ukuran)
+        else:
+            game.layar = pygame.display.set_mode(ukuran)
+        game.atur_ukuran_layar(ukuran)
+        for status in DAFTAR_STATUS_FRAME:
+            nama = f"frame/{resolusi}/{status}"
+            if not self.dipilih(nama):
+                continue
+            self.siapkan_status(status)
+            aktif = game.status_aktif
+
+            def frame():
+                # Seluruh layar digambar & dikirim ulang seperti frame pertama setiap layar
+                game.status_terakhir_digambar = None
+                game.nilai_terakhir = {}
+                aktif.perbarui()
+                aktif.gambar()
+                game.presentasikan(aktif.nama)
+
+            frame() # Lapisan statis & widget dibuat di frame pertama
+            self.kasus(nama, frame)
+            game.resume_game()
+        game.status_game_sekarang = main.STATE_MENU_UTAMA
+
+    def jalankan(self, daftar_resolusi):
+        self.teks_dan_tombol()
+        self.soal()
+        self.skor()
+        for resolusi in daftar_resolusi:
+            self.frame_penuh(resolusi)
+        self.game.papan_skor.tutup()
+        if self.game.render_tekstur:
+            self.game.layar.tutup()
+        return self.hasil
+
+
+def info_lingkungan():
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'sdl': ".".join(map(str, pygame.get_sdl_version())),
+        'platform': platform.platform(),
+        'prosesor': platform.processor() or platform.machine(),
+        'waktu': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def bandingkan(hasil, baseline, ambang):
+    """Cetak perbandingan dengan baseline. Kembalikan daftar nama kasus yang regresi."""
+    regresi = []
+    print(f"\n{'Kasus':<36}{'Baseline':>12}{'Sekarang':>12}{'Rasio':>8}")
+    for nama, baru in hasil.items():
+        lama = baseline.get(nama)
+        if lama is None:
+            print(f"{nama:<36}{'-':>12}{baru['us']:>12.2f}{'baru':>8}")
+            continue
+        rasio = baru['us'] / lama['us']
+        tanda = ""
+        if rasio > 1 + ambang:
+            tanda = "  REGRESI"
+            regresi.append(nama)
+        elif rasio < 1 - ambang:
+            tanda = "  lebih cepat"
+        print(f"{nama:<36}{lama['us']:>12.2f}{baru['us']:>12.2f}{rasio:>7.2f}x{tanda}")
+    hilang = sum(1 for nama in baseline if nama not in hasil)
+    if hilang:
+        print(f"{hilang} kasus di baseline tidak diukur kali ini")
+    return regresi
+
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Suite benchmark jalur panas MathSprint (headless).")
+    parser.add_argument('--json', help="Tulis hasil ke file JSON")
+    parser.add_argument('--bandingkan', metavar='BASELINE', help="File JSON hasil sebelumnya")
+    parser.add_argument('--ambang', type=float, default=AMBANG_DEFAULT,
+                        help="Batas perlambatan relatif sebelum dianggap regresi (default: %(default)s)")
+    parser.add_argument('--waktu', type=float, default=0.5, help="Detik per kasus (default: %(default)s)")
+    parser.add_argument('--resolusi', nargs='+', default=RESOLUSI, help="Resolusi frame penuh (LEBARxTINGGI)")
+    parser.add_argument('--render', choices=(main.RENDER_PERMUKAAN, main.RENDER_TEKSTUR),
+                        default=main.RENDER_PERMUKAAN, help="Backend render (default: %(default)s)")
+    parser.add_argument('--filter', nargs='+', metavar='POLA', help="Hanya kasus yang namanya memuat POLA")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        suite = Suite(folder, args.waktu, args.filter, args.render)
+        render = main.RENDER_TEKSTUR if suite.game.render_tekstur else main.RENDER_PERMUKAAN
+        hasil = suite.jalankan(args.resolusi)
+
+    laporan = {'versi': VERSI_FORMAT, 'lingkungan': info_lingkungan(), 'render': render, 'hasil': hasil}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(laporan, f, indent=4)
+        print(f"Hasil ditulis ke {args.json}")
+
+    if args.bandingkan:
+        with open(args.bandingkan) as f:
+            baseline = json.load(f)
+        regresi = bandingkan(hasil, baseline['hasil'], args.ambang)
+        if regresi:
+            print(f"{len(regresi)} regresi > {args.ambang:.0%}: {', '.join(regresi)}")
+            return 1
+        print(f"Tidak ada regresi > {args.ambang:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
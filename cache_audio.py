@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Cache audio hasil decode untuk MathSprint.
+
+pygame.mixer.Sound men-decode file MP3 dari awal setiap kali game dimulai.
+Modul ini menyimpan PCM hasil decode (Sound.get_raw()) ke folder cache saat
+suara pertama kali dimuat. Peluncuran berikutnya membuat Sound langsung dari
+file mentah tersebut (memory-mapped) tanpa decode.
+
+Nama entri cache berisi hash isi file sumber dan format mixer (frekuensi,
+ukuran sampel, kanal), jadi entri otomatis tidak terpakai lagi jika file
+sumber atau konfigurasi mixer berubah; entri lama untuk sumber yang sama
+dihapus saat entri baru ditulis.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+
+import pygame
+
+EKSTENSI_CACHE = ".pcm"
+
+
+def hash_file(path, ukuran_blok=1 << 16):
+    """SHA-1 isi file (hex)."""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(ukuran_blok), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+class CacheAudio:
+    """Folder cache PCM mentah per file suara dan format mixer."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.hit = 0
+        self.miss = 0
+
+    def _awalan(self, path):
+        """Awalan nama entri untuk satu file sumber (dipakai untuk menghapus entri lama)."""
+        return os.path.basename(path).replace('.', '_') + "-"
+
+    def path_entri(self, path, format_mixer):
+        """Path file cache untuk sumber path dengan format mixer (frekuensi, ukuran, kanal)."""
+        frekuensi, ukuran, kanal = format_mixer
+        nama = f"{self._awalan(path)}{hash_file(path)}-{frekuensi}_{ukuran}_{kanal}{EKSTENSI_CACHE}"
+        return os.path.join(self.folder, nama)
+
+    def muat(self, path):
+        """
+        Buat Sound untuk path, dari cache jika ada.
+
+        FileNotFoundError dan pygame.error dari file sumber diteruskan ke
+        pemanggil seperti pygame.mixer.Sound(path). Masalah pada folder cache
+        tidak pernah menggagalkan pemuatan: suara tetap di-decode seperti biasa.
+        """
+        format_mixer = pygame.mixer.get_init()
+        entri = self.path_entri(path, format_mixer)
+
+        suara = self._baca_entri(entri, format_mixer)
+        if suara is not None:
+            self.hit += 1
+            return suara
+
+        self.miss += 1
+        suara = pygame.mixer.Sound(path)
+        try:
+            self._tulis_entri(entri, suara.get_raw())
+            self._hapus_entri_lama(path, entri)
+        except OSError as e:
+            print(f"Warning: Gagal menyimpan cache audio {entri}: {e}")
+        return suara
+
+    def _baca_entri(self, entri, format_mixer):
+        """Sound dari file PCM mentah (memory-mapped), None jika tidak ada/rusak."""
+        _, ukuran, kanal = format_mixer
+        ukuran_frame = abs(ukuran) // 8 * kanal
+        try:
+            with open(entri, 'rb') as f:
+                panjang = os.fstat(f.fileno()).st_size
+                if panjang == 0 or panjang % ukuran_frame:
+                    return None # Entri terpotong (misal disk penuh saat ditulis)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return pygame.mixer.Sound(buffer=data) # Buffer disalin oleh pygame
+        except (OSError, ValueError, pygame.error):
+            return None
+
+    def _tulis_entri(self, entri, data):
+        """Tulis entri secara atomik (file sementara lalu os.replace)."""
+        os.makedirs(self.folder, exist_ok=True)
+        fd, path_sementara = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path_sementara, entri)
+        except BaseException:
+            if os.path.exists(path_sementara):
+                os.remove(path_sementara)
+            raise
+
+    def _hapus_entri_lama(self, path, entri_baru):
+        """Hapus entri untuk sumber yang sama dengan hash atau format mixer lama."""
+        awalan = self._awalan(path)
+        nama_baru = os.path.basename(entri_baru)
+        for nama in os.listdir(self.folder):
+            if nama.startswith(awalan) and nama.endswith(EKSTENSI_CACHE) and nama != nama_baru:
+                os.remove(os.path.join(self.folder, nama))
+
+    def bersihkan(self):
+        """Hapus semua entri cache."""
+        if not os.path.isdir(self.folder):
+            return
+        for nama in os.listdir(self.folder):
+            if nama.endswith(EKSTENSI_CACHE):
+                os.remove(os.path.join(self.folder, nama))
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Cache permukaan teks untuk MathSprint.
+
+Me-render teks dengan font.render() adalah biaya CPU terbesar per frame.
+Modul ini menyimpan hasil render agar teks yang sama (judul, label tombol,
+instruksi) cukup di-render sekali saja:
+
+- CacheTeks: cache LRU terbatas dengan kunci (teks, font, warna, antialias).
+- AtlasGlyph: kumpulan glyph per font & warna, dipakai untuk teks HUD yang
+  sering berubah (timer, skor, nomor soal) dengan cara menyusun glyph
+  yang sudah di-render, bukan me-render ulang seluruh string.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from profiler import catat_alokasi
+
+# Karakter yang langsung di-render saat atlas dibuat (angka & tanda minus)
+KARAKTER_ATLAS_AWAL = "0123456789-"
+
+
+def _ke_format_layar(permukaan):
+    """Konversi permukaan ke format piksel layar (jika layar sudah ada); dihitung satu alokasi."""
+    if pygame.display.get_surface() is not None:
+        permukaan = permukaan.convert_alpha()
+    return catat_alokasi(permukaan)
+
+
+class AtlasGlyph:
+    """
+    Atlas glyph untuk satu kombinasi (font, warna, antialias).
+
+    Setiap karakter di-render sekali, lalu string disusun dengan mem-blit
+    glyph satu per satu.
+    """
+
+    def __init__(self, cache, font, warna, antialias=True):
+        self.cache = cache
+        self.font = font
+        self.warna = warna
+        self.antialias = antialias
+        self.tinggi = font.get_height()
+        self._glyph = {}
+        for karakter in KARAKTER_ATLAS_AWAL:
+            self.glyph(karakter)
+
+    def glyph(self, karakter):
+        """Ambil permukaan glyph, render jika belum ada di atlas."""
+        permukaan = self._glyph.get(karakter)
+        if permukaan is None:
+            permukaan = _ke_format_layar(self.font.render(karakter, self.antialias, self.warna))
+            self.cache.jumlah_render += 1
+            self._glyph[karakter] = permukaan
+        return permukaan
+
+    def ukuran(self, teks):
+        """Hitung ukuran (lebar, tinggi) teks jika disusun dari atlas."""
+        lebar = 0
+        for karakter in teks:
+            lebar += self.glyph(karakter).get_width()
+        return lebar, self.tinggi
+
+    def gambar(self, layar, teks, rect_teks):
+        """Blit glyph-glyph teks ke layar mulai dari rect_teks.topleft."""
+        x, y = rect_teks.topleft
+        for karakter in teks:
+            permukaan = self.glyph(karakter)
+            layar.blit(permukaan, (x, y))
+            x += permukaan.get_width()
+
+
+class CacheTeks:
+    """Cache LRU untuk permukaan teks yang sudah di-render."""
+
+    def __init__(self, kapasitas=256):
+        self.kapasitas = kapasitas
+        self._entri = OrderedDict()
+        self._atlas = {}
+
+        # Penghitung statistik
+        self.hit = 0
+        self.miss = 0
+        self.eviksi = 0
+        self.jumlah_render = 0  # Jumlah panggilan font.render()
+
+    def ambil(self, teks, font, warna, antialias=True):
+        """Kembalikan permukaan teks dari cache, render jika belum ada."""
+        kunci = (teks, font, warna, antialias)
+        permukaan = self._entri.get(kunci)
+        if permukaan is not None:
+            self.hit += 1
+            self._entri.move_to_end(kunci)
+            return permukaan
+
+        self.miss += 1
+        self.jumlah_render += 1
+        permukaan = _ke_format_layar(font.render(teks, antialias, warna))
+        self._entri[kunci] = permukaan
+        if len(self._entri) > self.kapasitas:
+            self._entri.popitem(last=False)  # Buang entri paling lama tidak dipakai
+            self.eviksi += 1
+        return permukaan
+
+    def atlas(self, font, warna, antialias=True):
+        """Kembalikan atlas glyph untuk (font, warna, antialias)."""
+        kunci = (font, warna, antialias)
+        atlas = self._atlas.get(kunci)
+        if atlas is None:
+            atlas = AtlasGlyph(self, font, warna, antialias)
+            self._atlas[kunci] = atlas
+        return atlas
+
+    def bersihkan(self):
+        """Kosongkan cache (misalnya setelah font diganti)."""
+        self._entri.clear()
+        self._atlas.clear()
+
+    def statistik(self):
+        """Kembalikan penghitung cache dalam bentuk dict."""
+        return {
+            'hit': self.hit,
+            'miss': self.miss,
+            'eviksi': self.eviksi,
+            'render': self.jumlah_render,
+            'entri': len(self._entri),
+            'atlas': len(self._atlas),
+        }
+
+    def reset_statistik(self):
+        """Set ulang semua penghitung ke nol."""
+        self.hit = 0
+        self.miss = 0
+        self.eviksi = 0
+        self.jumlah_render = 0
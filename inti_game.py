@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Inti aturan sesi MathSprint, tanpa pygame.
+
+Sesi menyimpan semua status permainan (skor, soal, input, umpan balik,
+langkah logika) di atribut __slots__, bukan di dict berkunci string. Umpan
+balik benar/salah adalah konstanta yang dibuat sekali, dan objek Soal
+dipakai ulang untuk setiap soal baru, jadi menjawab satu soal tidak membuat
+dict atau objek baru. Tampilan (main.py), simulasi, server balapan dan
+putar ulang rekaman memakai aturan yang sama dari sini; aturan bisa diuji
+tanpa display:
+
+    sesi = Sesi(bank.sampler('MUDAH', seed=1), 'MUDAH', 90, 10, waktu_mulai=0.0)
+    sesi.input_jawaban = str(sesi.soal.jawaban)
+    sesi.jawab(sesi.tik_pada(1.5))
+"""
+
+from bank_soal import periksa_jawaban
+
+# Langkah logika tetap (detik); satu-satunya definisi, dipakai juga oleh main.py
+LANGKAH_LOGIKA = 1.0 / 120
+
+# Kejadian dari Sesi.langkah()
+SELESAI_UMPAN_BALIK = 1
+WAKTU_HABIS = 2
+
+
+class UmpanBalik:
+    """Umpan balik setelah menjawab (konstanta, tidak dibuat per jawaban)."""
+
+    __slots__ = ('benar', 'teks', 'durasi', 'tampilkan_jawaban')
+
+    def __init__(self, benar, teks, durasi, tampilkan_jawaban):
+        self.benar = benar
+        self.teks = teks
+        self.durasi = durasi # Detik
+        self.tampilkan_jawaban = tampilkan_jawaban
+
+
+UMPAN_BALIK_BENAR = UmpanBalik(True, "Benar!", 0.8, False)
+UMPAN_BALIK_SALAH = UmpanBalik(False, "Salah!", 1.0, True)
+
+
+class Soal:
+    """Soal yang sedang tampil; satu objek per sesi, diisi ulang setiap soal baru."""
+
+    __slots__ = ('a', 'op', 'b', 'jawaban', 'teks')
+
+    def __init__(self):
+        self.isi(0, '+', 0, 0)
+
+    def isi(self, a, op, b, jawaban):
+        self.a = a
+        self.op = op
+        self.b = b
+        self.jawaban = jawaban
+        self.teks = f"{a} {op} {b}"
+
+
+class Sesi:
+    """
+    Status dan aturan satu sesi Time Attack.
+
+    Waktu (waktu_main, detik tanpa pause) selalu diberikan oleh pemanggil.
+    Timer sesi dan durasi umpan balik dihitung dalam langkah logika tetap:
+    langkah ke-n jatuh di waktu_mulai + n * langkah_logika.
+    """
+
+    __slots__ = ('sampler', 'kesulitan', 'batas_waktu', 'skor_per_soal', 'langkah_logika',
+                 'waktu_mulai', 'tik', 'tik_batas', 'skor', 'jumlah_benar', 'jumlah_salah',
+                 'nomor_soal', 'soal', 'waktu_mulai_soal', 'input_jawaban',
+                 'umpan_balik', 'tik_selesai_umpan_balik')
+
+    def __init__(self, sampler, kesulitan, batas_waktu, skor_per_soal, waktu_mulai,
+                 langkah_logika=LANGKAH_LOGIKA):
+        self.sampler = sampler
+        self.kesulitan = kesulitan
+        self.batas_waktu = batas_waktu
+        self.skor_per_soal = skor_per_soal
+        self.langkah_logika = langkah_logika
+        self.waktu_mulai = waktu_mulai
+        self.tik = 0 # Langkah logika yang sudah dijalankan
+        self.tik_batas = round(batas_waktu / langkah_logika)
+
+        self.skor = 0
+        self.jumlah_benar = 0
+        self.jumlah_salah = 0
+        self.nomor_soal = 0
+        self.soal = Soal()
+        self.waktu_mulai_soal = waktu_mulai # Untuk latensi menjawab (telemetri)
+        self.input_jawaban = ""
+        self.umpan_balik = None # UmpanBalik selama umpan balik tampil
+        self.tik_selesai_umpan_balik = 0
+        self.lanjut_soal(waktu_mulai)
+
+    # --- Waktu ---
+
+    def tik_pada(self, waktu):
+        """Indeks langkah logika tempat waktu (waktu_main) berada."""
+        return int((waktu - self.waktu_mulai) / self.langkah_logika)
+
+    def alpha_pada(self, waktu):
+        """Posisi waktu di antara langkah terakhir dan berikutnya (0..1), untuk interpolasi."""
+        alpha = (waktu - self.waktu_mulai) / self.langkah_logika - self.tik
+        return min(max(alpha, 0.0), 1.0)
+
+    def waktu_sisa(self, waktu):
+        return self.batas_waktu - (waktu - self.waktu_mulai)
+
+    def waktu_kejadian_berikutnya(self):
+        """Waktu kejadian logika berikutnya: akhir umpan balik atau akhir sesi."""
+        tik = self.tik_selesai_umpan_balik if self.umpan_balik is not None else self.tik_batas
+        tik = max(tik, self.tik + 1) # Diperiksa paling cepat di langkah berikutnya
+        return self.waktu_mulai + tik * self.langkah_logika
+
+    def langkah(self):
+        """Satu langkah logika. Kembalikan SELESAI_UMPAN_BALIK, WAKTU_HABIS, atau None."""
+        self.tik += 1
+        if self.umpan_balik is not None:
+            if self.tik >= self.tik_selesai_umpan_balik:
+                self.umpan_balik = None
+                return SELESAI_UMPAN_BALIK
+        elif self.tik >= self.tik_batas:
+            return WAKTU_HABIS
+        return None
+
+    # --- Aturan ---
+
+    def tambah_input(self, karakter):
+        """Tambahkan angka, atau '-' jika input masih kosong. True jika diterima."""
+        if self.umpan_balik is not None:
+            return False
+        if karakter.isdigit() or (karakter == '-' and not self.input_jawaban):
+            self.input_jawaban += karakter
+            return True
+        return False
+
+    def hapus_input(self):
+        if self.umpan_balik is None:
+            self.input_jawaban = self.input_jawaban[:-1]
+
+    def jawab(self, tik):
+        """
+        Nilai input untuk soal sekarang dan mulai umpan balik dari langkah tik.
+        Kembalikan UmpanBalik, atau None jika umpan balik masih tampil atau
+        waktu sesi sudah habis (server balapan juga menolak jawaban seperti ini).
+        """
+        if self.umpan_balik is not None or tik >= self.tik_batas:
+            return None
+        # Aturan yang sama dipakai server balapan untuk menilai ulang jawaban
+        if periksa_jawaban(self.input_jawaban, self.soal.jawaban):
+            self.skor += self.skor_per_soal
+            self.jumlah_benar += 1
+            umpan_balik = UMPAN_BALIK_BENAR
+        else:
+            self.jumlah_salah += 1
+            umpan_balik = UMPAN_BALIK_SALAH
+        self.umpan_balik = umpan_balik
+        self.tik_selesai_umpan_balik = tik + round(umpan_balik.durasi / self.langkah_logika)
+        return umpan_balik
+
+    def perpanjang_umpan_balik(self, umpan_balik):
+        """Tampilkan lagi umpan_balik sampai langkah berikutnya (mode balapan: soal belum tiba)."""
+        self.umpan_balik = umpan_balik
+        self.tik_selesai_umpan_balik = self.tik + 1
+
+    def lanjut_soal(self, waktu):
+        """Pindah ke soal berikutnya dari sampler."""
+        self.nomor_soal += 1
+        self.input_jawaban = ""
+        self.soal.isi(*self.sampler.berikutnya())
+        self.waktu_mulai_soal = waktu
+
+    def hasil(self, waktu):
+        """Ringkasan sesi untuk layar hasil & penyimpanan skor."""
+        return {
+            'skor': self.skor,
+            'benar': self.jumlah_benar,
+            'salah': self.jumlah_salah,
+            'waktu_total': waktu - self.waktu_mulai,
+            'kesulitan': self.kesulitan,
+        }
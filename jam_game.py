@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Jam game MathSprint.
+
+Satu objek jam yang di-sampel sekali per frame dengan time.perf_counter()
+(monoton, tidak terpengaruh perubahan jam sistem/NTP). Semua logika dan
+gambar dalam satu frame membaca nilai yang sama. Perhitungan waktu pause
+sudah ada di dalam jam, sehingga waktu_main tidak bertambah selama pause.
+
+Mode:
+- normal: mengikuti waktu nyata.
+- dipercepat: skala > 1 (misal 100x) untuk memutar ulang / mensimulasikan sesi.
+- virtual: jam hanya maju sebesar langkah setiap tick (untuk simulasi headless).
+"""
+
+import time
+
+
+class JamGame:
+    """Jam monoton yang di-sampel sekali per frame, dengan dukungan pause."""
+
+    def __init__(self, virtual=False, skala=1.0, langkah=1.0 / 60, sumber=time.perf_counter):
+        self.virtual = virtual
+        self.skala = skala # Kecepatan waktu game dibanding waktu nyata
+        self.langkah = langkah # Besar langkah per tick pada mode virtual (detik)
+        self._sumber = sumber
+        self._sampel_terakhir = sumber()
+
+        self.sekarang = 0.0 # Waktu game sejak jam dibuat (termasuk pause)
+        self.dt = 0.0 # Selisih waktu frame ini dengan frame sebelumnya
+
+        self.dijeda = False
+        self._mulai_jeda = 0.0
+        self._total_jeda = 0.0
+        self._tujuan = None # Target waktu_main tick berikutnya (lompat_ke)
+
+    def tick(self):
+        """Sampel jam untuk frame baru. Dipanggil sekali di awal setiap frame."""
+        if self._tujuan is not None:
+            dt = self._tujuan - self.waktu_main
+            self.sekarang = self._tujuan
+            self._total_jeda = 0.0
+            self._tujuan = None
+            self.dt = dt
+            return dt
+        if self.virtual:
+            dt = self.langkah
+        else:
+            sampel = self._sumber()
+            dt = (sampel - self._sampel_terakhir) * self.skala
+            self._sampel_terakhir = sampel
+        self.dt = dt
+        self.sekarang += dt
+        return dt
+
+    def baca(self):
+        """
+        Waktu game saat ini tanpa menunggu frame berikutnya.
+
+        Dipakai untuk memberi cap waktu pada input sedini mungkin. Pada mode
+        virtual nilainya sama dengan waktu frame.
+        """
+        if self.virtual:
+            return self.sekarang
+        return self.sekarang + (self._sumber() - self._sampel_terakhir) * self.skala
+
+    def baca_waktu_main(self):
+        """Seperti waktu_main, tetapi dibaca saat ini juga (untuk cap waktu input)."""
+        if self.dijeda:
+            return self._mulai_jeda - self._total_jeda
+        return self.baca() - self._total_jeda
+
+    @property
+    def waktu_main(self):
+        """Waktu game pada frame ini, tidak termasuk total durasi pause."""
+        if self.dijeda:
+            return self._mulai_jeda - self._total_jeda
+        return self.sekarang - self._total_jeda
+
+    def jeda(self):
+        """Hentikan waktu_main (pause)."""
+        if not self.dijeda:
+            self.dijeda = True
+            self._mulai_jeda = self.sekarang
+
+    def lanjutkan(self):
+        """Lanjutkan waktu_main setelah pause."""
+        if self.dijeda:
+            self._total_jeda += self.sekarang - self._mulai_jeda
+            self.dijeda = False
+
+    def lompat_ke(self, waktu_main):
+        """
+        Mode virtual: tick berikutnya membuat waktu_main tepat bernilai
+        waktu_main (bit-per-bit sama, untuk putar ulang rekaman).
+        """
+        if not self.virtual:
+            raise ValueError("lompat_ke hanya untuk jam virtual")
+        self.lanjutkan()
+        self._tujuan = waktu_main
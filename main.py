@@ -15,19 +15,42 @@ Struktur Proyek yang Diharapkan:
         |-- font.ttf (Opsional: font kustom)
 """
 
+import time
+WAKTU_MULAI_PROGRAM = time.perf_counter() # Untuk mengukur waktu startup (--ukur-startup)
+
+import io
+import os
 import pygame
 import sys
-import random
-import time
-import json
 import datetime
-import math
+import uuid
+
+from animasi import AnimasiKarakter, buat_sprite_karakter, RADIUS_KARAKTER
+from aset import ManajerAset
+from audio import AudioGame
+from balapan import AntrianSoal, KlienBalapan
+from bank_soal import BankSoal, seed_tantangan_harian
+from cache_audio import CacheAudio
+from cache_teks import CacheTeks
+from inti_game import Sesi, LANGKAH_LOGIKA, SELESAI_UMPAN_BALIK, WAKTU_HABIS
+from jam_game import JamGame
+from telemetri import AgregatJawaban, PencatatJawaban
+from tata_letak import hitung_tata_letak
+from widget import LayarWidget, Tombol, Label, InputTeks, Daftar
+from profiler import ProfilerFrame, FASE_EVENT, FASE_UPDATE, FASE_DRAW, FASE_PRESENT, catat_alokasi, jumlah_alokasi
+from papan_skor import PapanSkor
+from penyimpanan_sqlite import PenyimpananSkorSQLite
+from rekaman import Rekaman, EKSTENSI as EKSTENSI_REKAMAN
+from render_tekstur import KanvasTekstur, gambar_kotak
 
 # --- PENGATURAN DAN KONSTANTA ---
 # Ubah nilai-nilai ini untuk kustomisasi
 LEBAR_LAYAR = 800
 TINGGI_LAYAR = 600
 FPS = 60
+# Logika sesi (timer, umpan balik, animasi) maju dengan langkah tetap
+# LANGKAH_LOGIKA (didefinisikan di inti_game.py), terpisah dari FPS gambar;
+# posisi karakter diinterpolasi di antara langkah
 # TOTAL_SOAL_PER_SESI = 10 # Kita tidak lagi menggunakan total soal, tapi total waktu
 # DEBUG_MODE = False  # Set True untuk random.seed yang konsisten
 
@@ -50,6 +73,39 @@ WARNA_MERAH_SALAH = (220, 50, 70)
 WARNA_KUNING = (255, 200, 0)
 WARNA_OVERLAY_PAUSE = (0, 0, 0, 180) # Transparan
 
+# Jumlah maksimum permukaan teks yang disimpan di cache render
+KAPASITAS_CACHE_TEKS = 256
+
+# Mode dirty-rect: hanya area layar yang berubah yang dikirim ke display.
+# Set False untuk kembali ke pygame.display.flip() penuh setiap frame.
+MODE_DIRTY_RECT = True
+TOMBOL_DEBUG_DIRTY = pygame.K_F2 # Tampilkan/sembunyikan garis area dirty
+WARNA_DEBUG_DIRTY = (255, 0, 255)
+
+# Profiler per frame (lihat profiler.py)
+TOMBOL_PROFIL = pygame.K_F3 # Tampilkan/sembunyikan overlay profiler
+WARNA_LATAR_PROFIL = (0, 0, 0)
+
+# Mode tampilan:
+# - TAMPILAN_SKALA: resolusi logis tetap LEBAR_LAYAR x TINGGI_LAYAR, diskalakan
+#   ke layar penuh oleh SDL (pygame.SCALED). Kerja per frame sama di monitor apa pun.
+# - TAMPILAN_PENUH: fullscreen pada resolusi asli monitor.
+# - TAMPILAN_JENDELA: jendela yang bisa diubah ukurannya (VIDEORESIZE).
+TAMPILAN_SKALA = "skala"
+TAMPILAN_PENUH = "penuh"
+TAMPILAN_JENDELA = "jendela"
+MODE_TAMPILAN = TAMPILAN_SKALA
+VSYNC = True # Hanya untuk TAMPILAN_SKALA, diabaikan jika tidak didukung driver
+
+# Backend render (lihat render_tekstur.py):
+# - RENDER_PERMUKAAN: blit software ke permukaan display, flip/update dirty rect.
+# - RENDER_TEKSTUR: teks, wajah tombol, lapisan statis & sprite di-upload sekali
+#   sebagai Texture, frame disusun Renderer SDL2 (GPU jika ada). Kembali ke
+#   RENDER_PERMUKAAN jika pygame._sdl2 tidak tersedia.
+RENDER_PERMUKAAN = "permukaan"
+RENDER_TEKSTUR = "tekstur"
+MODE_RENDER = RENDER_PERMUKAAN
+
 # Status Game (Game States)
 STATE_MENU_UTAMA = "MENU_UTAMA"
 STATE_PILIH_KESULITAN = "PILIH_KESULITAN"
@@ -58,6 +114,26 @@ STATE_BERMAIN = "BERMAIN"
 STATE_PAUSE = "PAUSE"
 STATE_HASIL_AKHIR = "HASIL_AKHIR"
 
+# Mode idle: layar tanpa animasi/timer tidak digambar ulang 60x per detik,
+# tapi menunggu input (pygame.event.wait) dengan batas waktu.
+MODE_IDLE = True
+TIMEOUT_IDLE_MS = 500
+# Status yang selalu berjalan dengan FPS tetap (ada timer & animasi)
+STATUS_FPS_TETAP = (STATE_BERMAIN,)
+
+# Mode balapan (lihat balapan.py): thread jaringan mengirim event ini saat ada
+# pesan server, agar loop yang sedang idle (event.wait) langsung bangun
+EVENT_BALAPAN = pygame.event.custom_type()
+
+# Kelompok jenis event; setiap status mendaftarkan yang ia terima (StatusGame.event)
+# Jendela tertutup/diminimalkan lalu tampil lagi: isi display harus dikirim ulang penuh.
+# Selalu diizinkan, karena set_blocked(None) juga memblokir event jendela.
+EVENT_JENDELA = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN,
+                 pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWFOCUSGAINED)
+EVENT_UMUM = (pygame.QUIT, pygame.KEYDOWN, pygame.VIDEORESIZE, EVENT_BALAPAN) + EVENT_JENDELA
+EVENT_MOUSE = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION)
+EVENT_KETIK = (pygame.TEXTINPUT,) # Dibutuhkan SDL untuk mengisi event.unicode
+
 # Tingkat Kesulitan
 KESULITAN_MUDAH = "MUDAH"
 KESULITAN_SEDANG = "SEDANG"
@@ -70,12 +146,265 @@ PENGATURAN_KESULITAN = {
     KESULITAN_SULIT: [45, 20]  # Waktu 45 detik, 20 poin/soal
 }
 
+# Ruang soal per Kesulitan: (operator, rentang a, rentang b)
+# '-' hanya a >= b (tanpa jawaban negatif); untuk '/' rentang a = rentang hasil bagi
+RUANG_SOAL = {
+    KESULITAN_MUDAH: [('+', (0, 20), (0, 20)), ('-', (0, 20), (0, 20))],
+    KESULITAN_SEDANG: [('+', (0, 50), (0, 50)), ('-', (0, 50), (0, 50)), ('*', (0, 12), (0, 12))],
+    KESULITAN_SULIT: [('+', (10, 99), (10, 99)), ('-', (10, 99), (10, 99)),
+                      ('*', (2, 20), (2, 20)), ('/', (2, 10), (2, 10))],
+}
+
+# Tantangan harian: semua pemain mendapat urutan soal yang sama setiap hari
+MODE_TANTANGAN_HARIAN = False
+
+# Warna tombol & kesulitan per tombol di layar pilih kesulitan
+WARNA_TOMBOL_KESULITAN = {
+    "Mudah": WARNA_HIJAU_BENAR,
+    "Sedang": WARNA_KUNING,
+    "Sulit": WARNA_MERAH_SALAH,
+    "Kembali": WARNA_ABU_ABU,
+}
+KESULITAN_PER_TOMBOL = {
+    "Mudah": KESULITAN_MUDAH,
+    "Sedang": KESULITAN_SEDANG,
+    "Sulit": KESULITAN_SULIT,
+}
+
+INSTRUKSI_CARA_BERMAIN = [
+    "Jawab 10 soal aritmetika secepat mungkin.",
+    "Ketik jawabanmu menggunakan angka di keyboard.",
+    "Tekan 'Enter' untuk mengirim jawaban.",
+    "Tekan 'Backspace' untuk menghapus.",
+    "Setiap soal memiliki batas waktu.",
+    "Jika waktu habis atau jawaban salah, skor tidak bertambah.",
+    "Tekan 'P' selama bermain untuk Pause.",
+]
+
 # Path File
 FILE_SKOR_TERTINGGI = "scores.json"
 PATH_FONT_KUSTOM = "assets/font.ttf"
 PATH_SOUND_BENAR = "assets/correct.mp3"
 PATH_SOUND_SALAH = "assets/wrong.mp3"
 PATH_MUSIC_BGM = "assets/game.mp3" # <-- Tambahkan path untuk BGM
+# Cache PCM hasil decode suara (lihat cache_audio.py), None = selalu decode
+FOLDER_CACHE_AUDIO = ".cache/audio"
+# Buffer mixer kecil = suara umpan balik lebih cepat terdengar (lihat audio.py).
+# Naikkan (512/1024) jika suara terputus-putus di komputer lambat.
+UKURAN_BUFFER_AUDIO = 256
+KANAL_SFX = 2 # Kanal mixer yang dicadangkan untuk suara benar/salah
+
+# Riwayat sesi lengkap di SQLite (opsional). Jika True, scores.json lama
+# diimpor sekali ke database dan layar hasil menampilkan Top 5 per kesulitan.
+PAKAI_SQLITE = False
+FILE_DB_SKOR = "scores.db"
+
+# Telemetri per jawaban (lihat telemetri.py): log JSONL untuk laporan guru
+MODE_TELEMETRI = True
+FILE_TELEMETRI = "telemetri.jsonl"
+
+# Rekaman setiap sesi yang selesai (lihat rekaman.py), None = tidak merekam
+FOLDER_REKAMAN = "rekaman"
+
+
+# --- STATUS GAME ---
+# Setiap layar adalah objek status. jalankan_frame memanggil hook status aktif
+# (tanpa rantai if/elif); konten statis setiap layar di-render sekali ke
+# lapisan yang di-cache (lihat MathSprintGame.ambil_lapisan).
+
+class StatusGame:
+    """
+    Dasar status game dengan hook:
+    masuk (saat status aktif), keluar (saat ditinggalkan), tangani (event
+    frame ini), perbarui (logika) dan gambar (lapisan statis + bagian dinamis).
+    """
+
+    nama = None
+    # Jenis event yang diterima; selain itu diblokir di antrian SDL
+    # (misal MOUSEMOTION dan event audio/jendela saat bermain)
+    event = EVENT_UMUM + EVENT_MOUSE
+
+    def __init__(self, game):
+        self.game = game
+
+    def masuk(self):
+        self.game.ambil_lapisan(self.nama) # Render konten statis sekali
+
+    def keluar(self):
+        pass
+
+    def tangani(self, events):
+        pass
+
+    def perbarui(self):
+        pass
+
+    def gambar(self):
+        pass
+
+
+class StatusLayarWidget(StatusGame):
+    """Layar menu: lapisan statis menjadi latar, widget untuk tombol & teks yang berubah."""
+
+    @property
+    def layar(self):
+        # Diambil ulang setiap kali: LayarWidget dibuat ulang setelah font/ukuran layar berubah
+        return self.game.ambil_layar_widget(self.nama)
+
+    def masuk(self):
+        self.game.ambil_layar_widget(self.nama)
+
+    def tangani(self, events):
+        layar = self.layar
+        for event in events:
+            self.tangani_event(layar, event)
+
+    def tangani_event(self, layar, event):
+        aksi = layar.tangani_event(event)
+        if aksi is not None:
+            self.jalankan_aksi(aksi)
+
+    def jalankan_aksi(self, aksi):
+        """Aksi tombol yang diklik (label tombol)."""
+
+    def gambar(self):
+        self.game.gambar_layar_widget(self.nama, self.layar)
+
+
+class StatusMenuUtama(StatusLayarWidget):
+    """Layar menu utama dengan tombol-tombol."""
+
+    nama = STATE_MENU_UTAMA
+
+    def jalankan_aksi(self, aksi):
+        if aksi == "Mulai Bermain":
+            self.game.status_game_sekarang = STATE_PILIH_KESULITAN
+        elif aksi == "Cara Bermain":
+            self.game.status_game_sekarang = STATE_CARA_BERMAIN
+        elif aksi == "Keluar":
+            self.game.keluar_game()
+
+    def perbarui(self):
+        # Indikator pemuatan aset (hilang setelah semua aset terpasang)
+        aset = self.game.aset
+        teks_memuat = ""
+        if aset.sedang_memuat:
+            teks_memuat = f"Memuat aset... {aset.selesai}/{aset.total}"
+        self.layar['memuat'].atur_teks(teks_memuat)
+        self.layar['balapan'].atur_teks(self.game.info_balapan)
+
+
+class StatusPilihKesulitan(StatusLayarWidget):
+    """Layar pemilihan tingkat kesulitan."""
+
+    nama = STATE_PILIH_KESULITAN
+
+    def jalankan_aksi(self, aksi):
+        game = self.game
+        if aksi == "Kembali":
+            game.status_game_sekarang = STATE_MENU_UTAMA
+        elif aksi in KESULITAN_PER_TOMBOL:
+            game.kesulitan_terpilih = KESULITAN_PER_TOMBOL[aksi]
+            game.mulai_game_baru()
+            game.status_game_sekarang = STATE_BERMAIN
+
+
+class StatusCaraBermain(StatusLayarWidget):
+    """Layar instruksi cara bermain (judul & instruksi ada di lapisan statis)."""
+
+    nama = STATE_CARA_BERMAIN
+
+    def jalankan_aksi(self, aksi):
+        if aksi == "Kembali ke Menu":
+            self.game.status_game_sekarang = STATE_MENU_UTAMA
+
+
+class StatusBermain(StatusGame):
+    """Permainan berlangsung: input jawaban, timer sesi, HUD & animasi."""
+
+    nama = STATE_BERMAIN
+    event = EVENT_UMUM + EVENT_KETIK
+
+    def tangani(self, events):
+        self.game.handle_event_bermain(events)
+
+    def perbarui(self):
+        self.game.perbarui_logika()
+
+    def gambar(self):
+        self.game.gambar_layar_bermain()
+
+
+class StatusPause(StatusLayarWidget):
+    """Layar pause dari frame game yang dibekukan."""
+
+    nama = STATE_PAUSE
+
+    def masuk(self):
+        # Frame beku (game + overlay + judul) sudah disusun sekali di pause_game
+        # dan menjadi latar tombol; tombol hanya digambar ulang saat hover berubah.
+        layar = self.layar
+        if layar.latar is not self.game.layar_pause:
+            layar.atur_latar(self.game.layar_pause)
+
+    def keluar(self):
+        # Lepas referensi widget ke frame beku agar permukaan seukuran layar bisa dibebaskan
+        self.layar.atur_latar(None)
+
+    def tangani_event(self, layar, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            self.game.resume_game()
+        super().tangani_event(layar, event)
+
+    def jalankan_aksi(self, aksi):
+        if aksi == "Lanjut (P)":
+            self.game.resume_game()
+        elif aksi == "Kembali ke Menu":
+            self.game.layar_pause = None # Lepas frame beku
+            self.game.status_game_sekarang = STATE_MENU_UTAMA
+
+
+class StatusHasilAkhir(StatusLayarWidget):
+    """Layar statistik akhir, input nama, dan skor tertinggi."""
+
+    nama = STATE_HASIL_AKHIR
+    event = EVENT_UMUM + EVENT_MOUSE + EVENT_KETIK
+
+    def tangani(self, events):
+        game = self.game
+        input_nama = self.layar['input_nama']
+        input_nama.atur(game.input_nama_pemain, game.input_nama_aktif)
+        super().tangani(events)
+        game.input_nama_pemain = input_nama.teks
+        game.input_nama_aktif = input_nama.aktif
+
+    def jalankan_aksi(self, aksi):
+        game = self.game
+        input_nama = self.layar['input_nama']
+        if aksi == "Simpan Skor":
+            # Simpan skor dan kembali ke menu
+            game.simpan_skor_tertinggi(input_nama.teks, game.data_hasil_terakhir['skor'])
+            input_nama.lepas_fokus()
+            game.status_game_sekarang = STATE_MENU_UTAMA
+        elif aksi == "Menu Utama":
+            input_nama.lepas_fokus()
+            game.status_game_sekarang = STATE_MENU_UTAMA
+
+    def perbarui(self):
+        # Statistik & skor tertinggi (widget hanya digambar ulang jika teksnya berubah)
+        layar = self.layar
+        data = self.game.data_hasil_terakhir
+        layar['skor'].atur_teks(f"Total Skor: {data['skor']}")
+        layar['benar'].atur_teks(f"Jawaban Benar: {data['benar']}")
+        layar['salah'].atur_teks(f"Jawaban Salah: {data['salah']}")
+        layar['waktu_total'].atur_teks(f"Waktu Total: {data['waktu_total']:.2f} detik")
+        judul, baris = self.game.teks_skor_tertinggi()
+        layar['judul_skor'].atur_teks(judul)
+        layar['skor_tertinggi'].atur_item(baris)
+
+
+DAFTAR_KELAS_STATUS = (StatusMenuUtama, StatusPilihKesulitan, StatusCaraBermain,
+                       StatusBermain, StatusPause, StatusHasilAkhir)
 
 
 class MathSprintGame:
@@ -83,18 +412,58 @@ class MathSprintGame:
     Kelas utama yang mengelola seluruh status dan logika game.
     """
 
-    def __init__(self):
-        """Inisialisasi Pygame, aset, dan variabel status game."""
-        pygame.init()
-        pygame.mixer.init()  # Inisialisasi mixer untuk suara
+    def __init__(self, headless=False, ukuran_layar=None, path_skor=FILE_SKOR_TERTINGGI, jam=None,
+                 mode_tampilan=MODE_TAMPILAN, path_telemetri=FILE_TELEMETRI, folder_rekaman=FOLDER_REKAMAN,
+                 mode_render=MODE_RENDER):
+        """
+        Inisialisasi Pygame, aset, dan variabel status game.
+
+        headless=True menjalankan game tanpa monitor dan tanpa suara (driver
+        dummy SDL), dipakai oleh simulasi.py untuk pengujian otomatis.
+        jam dapat diisi JamGame virtual/dipercepat (lihat jam_game.py).
+        mode_tampilan: TAMPILAN_SKALA, TAMPILAN_PENUH atau TAMPILAN_JENDELA.
+        path_telemetri: file log jawaban, None untuk tidak mencatat.
+        folder_rekaman: folder rekaman sesi, None untuk tidak merekam.
+        mode_render: RENDER_PERMUKAAN atau RENDER_TEKSTUR.
+        """
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        # Hanya modul pygame yang dipakai (tanpa joystick, kamera, dll.)
+        pygame.display.init()
+        pygame.font.init()
+        # Mixer dengan buffer kecil & kanal cadangan untuk SFX (lihat audio.py)
+        self.audio = AudioGame(UKURAN_BUFFER_AUDIO, kanal_sfx=KANAL_SFX)
+        if not headless:
+            try:
+                self.audio.mulai()
+            except pygame.error as e:
+                print(f"Error inisialisasi audio: {e}. Mode senyap.")
 
         self.lebar = LEBAR_LAYAR
         self.tinggi = TINGGI_LAYAR
-        # self.layar = pygame.display.set_mode((self.lebar, self.tinggi)) # Ganti ke fullscreen
-        self.layar = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.lebar, self.tinggi = self.layar.get_rect().size # Dapatkan ukuran layar penuh
+        self.mode_tampilan = mode_tampilan
+        self.render_tekstur = mode_render == RENDER_TEKSTUR
+        self.layar = self.buat_layar(ukuran_layar)
         pygame.display.set_caption(JUDUL_GAME)
-        self.clock = pygame.time.Clock()
+        # Satu jam untuk semua logika & animasi, di-sampel sekali per frame
+        self.jam = jam if jam is not None else JamGame()
+
+        # Profiler per frame, aktif lewat F3 atau argumen --profil
+        self.profiler = ProfilerFrame()
+        self.tampil_profil = False
+
+        # Cache hasil render teks (lihat cache_teks.py)
+        self.cache_teks = CacheTeks(KAPASITAS_CACHE_TEKS)
+
+        # Font, suara dan musik dimuat di thread latar belakang (lihat aset.py),
+        # menu langsung tampil dengan font default lalu aset dipasang saat siap.
+        # Saat headless aset dimuat langsung agar simulasi selalu sama.
+        self.aset = ManajerAset()
+        self.cache_audio = CacheAudio(FOLDER_CACHE_AUDIO) if FOLDER_CACHE_AUDIO else None
+        self.waktu_frame_pertama = None
+        self.waktu_aset_siap = None
 
         # Memuat font
         self.muat_font()
@@ -105,550 +474,745 @@ class MathSprintGame:
         # Memuat dan memainkan musik latar (BGM)
         self.muat_musik()
 
-        # Variabel status game
-        self.status_game_sekarang = STATE_MENU_UTAMA
+        self.aset.mulai(latar=not headless)
+
+        # Objek status per layar; status awal diaktifkan di akhir __init__
+        self.daftar_status = {kelas.nama: kelas(self) for kelas in DAFTAR_KELAS_STATUS}
+        self.status_aktif = None
         self.kesulitan_terpilih = KESULITAN_MUDAH
         self.input_nama_pemain = "Player"
         self.input_nama_aktif = False
 
-        # Variabel untuk loop permainan
-        self.data_game_aktif = {}
+        # Sesi yang sedang/terakhir dimainkan (aturan tanpa pygame, lihat inti_game.py)
+        self.sesi = None
+
+        # Semua soal dihitung sekali (lihat bank_soal.py), diambil per sesi
+        self.bank_soal = BankSoal(RUANG_SOAL)
+        self.sampler_soal = None
+        self.seed_soal = None # Seed sesi terakhir (disimpan di rekaman)
+
+        # Frame beku untuk layar pause (dibuat di pause_game, dilepas saat resume)
+        self.layar_pause = None
 
-        # Variabel untuk animasi karakter
-        self.anim_state = 'idle'  # 'idle', 'jump', 'shake'
-        self.anim_timer = 0.0
+        # Animasi karakter (kurva dihitung sekali) & sprite karakter yang di-cache
+        self.animasi = AnimasiKarakter(LANGKAH_LOGIKA)
+        self.sprite_karakter = buat_sprite_karakter(WARNA_KUNING, WARNA_HITAM)
         # self.char_base_pos = (self.lebar // 2, self.tinggi // 2 + 50) # Pindahkan setelah self.lebar di-update
         
         # Variabel untuk data hasil akhir (disimpan saat game selesai)
         self.data_hasil_terakhir = {}
 
-        # Update posisi karakter berdasarkan ukuran layar penuh
-        self.char_base_pos = (self.lebar // 2, self.tinggi // 2 + 50)
+        # Papan skor: dimuat sekali, disimpan di latar belakang (lihat papan_skor.py)
+        self.papan_skor = PapanSkor(path_skor)
+
+        # Database riwayat sesi (opsional, lihat penyimpanan_sqlite.py)
+        self.db_skor = None
+        self.skor_per_kesulitan = [] # Top 5 kesulitan terpilih, diambil saat game selesai
+        self.baris_riwayat = None # {'id': ...} baris sesi terakhir di SQLite, diisi thread penulis
+        if PAKAI_SQLITE:
+            self.db_skor = PenyimpananSkorSQLite(FILE_DB_SKOR)
+            jumlah_impor = self.db_skor.impor_json(path_skor)
+            if jumlah_impor:
+                print(f"Berhasil mengimpor {jumlah_impor} skor dari {path_skor} ke {FILE_DB_SKOR}")
+
+        # Telemetri per jawaban: agregat di memori, log ditulis di latar belakang
+        self.telemetri = None
+        if MODE_TELEMETRI and path_telemetri:
+            self.telemetri = PencatatJawaban(path_telemetri)
+        self.agregat_jawaban = AgregatJawaban()
+        self.id_sesi = None
+
+        # Rekaman sesi untuk diputar ulang (lihat rekaman.py)
+        self.folder_rekaman = folder_rekaman
+        self.rekaman = None # Rekaman sesi yang sedang berjalan
+
+        # Mode balapan (lihat gabung_balapan)
+        self.balapan = None # KlienBalapan
+        self.sesi_balapan = False # True selama sesi yang dimainkan adalah balapan
+        self.papan_balapan = None # Pesan papan peringkat terakhir dari server
+        self.info_balapan = ""
+
+        # Variabel untuk mode dirty-rect
+        self.mode_dirty_rect = MODE_DIRTY_RECT
+        self.debug_dirty = False
+        self.rect_dirty = [] # Area yang berubah pada frame ini
+        self.nilai_terakhir = {} # kunci -> (nilai, rect) yang terakhir digambar
+        self.status_terakhir_digambar = None
+        self.rect_tombol = {} # Label tombol -> rect yang terakhir digambar
+        self.layar_widget = {} # Status -> LayarWidget (lihat widget.py)
+
+        # Tata letak & posisi karakter untuk ukuran layar sekarang
+        self.atur_ukuran_layar(self.layar.get_size())
+
+        # Variabel untuk mode idle (tidak dipakai saat headless: tidak ada input nyata)
+        self.mode_idle = MODE_IDLE and not headless
+        self.event_tertunda = [] # Event yang sudah diambil (dan diberi cap waktu) sebelum frame
+        self.waktu_awal_frame = time.perf_counter()
+
+        self.status_game_sekarang = STATE_MENU_UTAMA
+
+    @property
+    def status_game_sekarang(self):
+        return self.status_aktif.nama
+
+    @status_game_sekarang.setter
+    def status_game_sekarang(self, status):
+        """
+        Ganti status: hook keluar status lama, filter event SDL disesuaikan
+        dengan status baru, lalu hook masuk status baru.
+        """
+        if self.status_aktif is not None:
+            self.status_aktif.keluar()
+        self.status_aktif = self.daftar_status[status]
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.status_aktif.event)
+        self.status_aktif.masuk()
+
+    def buat_layar(self, ukuran_layar=None):
+        """Buat permukaan display (atau KanvasTekstur) sesuai mode tampilan."""
+        if self.render_tekstur:
+            try:
+                return self.buat_kanvas_tekstur(ukuran_layar)
+            except pygame.error as e:
+                print(f"Warning: render tekstur tidak tersedia ({e}). Menggunakan render permukaan.")
+                self.render_tekstur = False
+        if self.headless:
+            return pygame.display.set_mode(ukuran_layar or (self.lebar, self.tinggi))
+        if self.mode_tampilan == TAMPILAN_PENUH:
+            return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        if self.mode_tampilan == TAMPILAN_JENDELA:
+            return pygame.display.set_mode((self.lebar, self.tinggi), pygame.RESIZABLE)
+        flags = pygame.SCALED | pygame.FULLSCREEN
+        try:
+            return pygame.display.set_mode((self.lebar, self.tinggi), flags, vsync=int(VSYNC))
+        except pygame.error as e:
+            print(f"Warning: vsync tidak didukung ({e}). Menggunakan mode skala tanpa vsync.")
+            return pygame.display.set_mode((self.lebar, self.tinggi), flags)
+
+    def buat_kanvas_tekstur(self, ukuran_layar=None):
+        """Jendela SDL2 + Renderer dengan mode tampilan yang sama seperti buat_layar."""
+        if self.headless:
+            return KanvasTekstur(JUDUL_GAME, ukuran_layar or (self.lebar, self.tinggi), tersembunyi=True)
+        if self.mode_tampilan == TAMPILAN_PENUH:
+            return KanvasTekstur(JUDUL_GAME, pygame.display.get_desktop_sizes()[0], layar_penuh=True)
+        if self.mode_tampilan == TAMPILAN_JENDELA:
+            return KanvasTekstur(JUDUL_GAME, (self.lebar, self.tinggi), bisa_diubah=True)
+        try:
+            return KanvasTekstur(JUDUL_GAME, (self.lebar, self.tinggi), layar_penuh=True, skala=True, vsync=VSYNC)
+        except pygame.error as e:
+            if not VSYNC:
+                raise
+            print(f"Warning: vsync tidak didukung ({e}). Menggunakan mode skala tanpa vsync.")
+            return KanvasTekstur(JUDUL_GAME, (self.lebar, self.tinggi), layar_penuh=True, skala=True)
+
+    def atur_ukuran_layar(self, ukuran):
+        """Ambil tata letak (cache per resolusi) untuk ukuran layar baru."""
+        self.lebar, self.tinggi = ukuran
+        self.tata_letak = hitung_tata_letak(self.lebar, self.tinggi)
+        self.char_base_pos = self.tata_letak[STATE_BERMAIN].teks['karakter']
+        self.layar_widget = {} # Widget & lapisan statis dibuat ulang dengan tata letak baru
+        self.lapisan_statis = {}
+        self.nilai_terakhir = {}
+        self.status_terakhir_digambar = None # Gambar ulang layar penuh
+
+    def ubah_ukuran_jendela(self, ukuran):
+        """Tangani VIDEORESIZE pada mode jendela."""
+        if self.render_tekstur:
+            self.layar.ubah_ukuran(ukuran)
+        else:
+            self.layar = pygame.display.get_surface()
+            if self.layar.get_size() != tuple(ukuran):
+                self.layar = pygame.display.set_mode(ukuran, pygame.RESIZABLE)
+        self.atur_ukuran_layar(self.layar.get_size())
+        if self.layar_pause is not None:
+            # Frame beku pause diskalakan ke ukuran baru
+            self.layar_pause = catat_alokasi(pygame.transform.smoothscale(self.layar_pause, self.layar.get_size()))
 
     def muat_font(self):
-        """Mencoba memuat font kustom, jika gagal, gunakan font default."""
+        """Pasang font default sekarang; font kustom dimuat di latar belakang."""
+        self.font_judul = pygame.font.Font(None, 80)
+        self.font_besar = pygame.font.Font(None, 56)
+        self.font_sedang = pygame.font.Font(None, 36)
+        self.font_kecil = pygame.font.Font(None, 28)
+        self.aset.tambah('font', PATH_FONT_KUSTOM, self._baca_font_kustom)
+
+    def _baca_font_kustom(self):
+        """Baca isi file font kustom (thread pemuat), None jika gagal. Font dibuat di pasang_font."""
         try:
-            self.font_judul = pygame.font.Font(PATH_FONT_KUSTOM, 72)
-            self.font_besar = pygame.font.Font(PATH_FONT_KUSTOM, 48)
-            self.font_sedang = pygame.font.Font(PATH_FONT_KUSTOM, 30)
-            self.font_kecil = pygame.font.Font(PATH_FONT_KUSTOM, 22)
-            print(f"Berhasil memuat font kustom: {PATH_FONT_KUSTOM}")
+            with open(PATH_FONT_KUSTOM, 'rb') as f:
+                return f.read()
         except FileNotFoundError:
             print(f"Warning: Font kustom '{PATH_FONT_KUSTOM}' tidak ditemukan. Menggunakan font default.")
-            self.font_judul = pygame.font.Font(None, 80)
-            self.font_besar = pygame.font.Font(None, 56)
-            self.font_sedang = pygame.font.Font(None, 36)
-            self.font_kecil = pygame.font.Font(None, 28)
+        except OSError as e:
+            print(f"Error memuat font: {e}. Menggunakan font default.")
+        return None
+
+    def pasang_font(self, data):
+        """
+        Buat font kustom dari isi file (thread utama: SDL_ttf/FreeType tidak
+        thread-safe, jadi pygame.font.Font tidak dibuat di thread pemuat).
+        Kembalikan False jika font tidak valid.
+        """
+        try:
+            # Setiap Font membaca dari objek file sendiri
+            font = {atribut: pygame.font.Font(io.BytesIO(data), ukuran) for atribut, ukuran in
+                    (('font_judul', 72), ('font_besar', 48), ('font_sedang', 30), ('font_kecil', 22))}
         except pygame.error as e:
             print(f"Error memuat font: {e}. Menggunakan font default.")
-            self.font_judul = pygame.font.Font(None, 80)
-            self.font_besar = pygame.font.Font(None, 56)
-            self.font_sedang = pygame.font.Font(None, 36)
-            self.font_kecil = pygame.font.Font(None, 28)
+            return False
+        for atribut, objek_font in font.items():
+            setattr(self, atribut, objek_font)
+        print(f"Berhasil memuat font kustom: {PATH_FONT_KUSTOM}")
+        return True
 
     def muat_suara(self):
-        """Mencoba memuat file suara, jika gagal, set ke None."""
-        try:
-            self.sound_benar = pygame.mixer.Sound(PATH_SOUND_BENAR)
-            print(f"Berhasil memuat suara: {PATH_SOUND_BENAR}")
-        except FileNotFoundError:
-            print(f"Warning: File suara '{PATH_SOUND_BENAR}' tidak ditemukan. Mode senyap.")
-            self.sound_benar = None
-        except pygame.error as e:
-            print(f"Error memuat suara {PATH_SOUND_BENAR}: {e}. Mode senyap.")
-            self.sound_benar = None
+        """Daftarkan file suara ke pemuat aset; sampai siap, umpan balik tanpa suara."""
+        if not pygame.mixer.get_init():
+            return
+
+        self.aset.tambah('suara', 'benar', lambda: self._baca_suara(PATH_SOUND_BENAR))
+        self.aset.tambah('suara', 'salah', lambda: self._baca_suara(PATH_SOUND_SALAH))
 
+    def _baca_suara(self, path):
+        """Mencoba memuat file suara (thread pemuat), None jika gagal."""
         try:
-            self.sound_salah = pygame.mixer.Sound(PATH_SOUND_SALAH)
-            print(f"Berhasil memuat suara: {PATH_SOUND_SALAH}")
+            if self.cache_audio is not None:
+                suara = self.cache_audio.muat(path)
+            else:
+                suara = pygame.mixer.Sound(path)
+            print(f"Berhasil memuat suara: {path}")
+            return suara
         except FileNotFoundError:
-            print(f"Warning: File suara '{PATH_SOUND_SALAH}' tidak ditemukan. Mode senyap.")
-            self.sound_salah = None
+            print(f"Warning: File suara '{path}' tidak ditemukan. Mode senyap.")
         except pygame.error as e:
-            print(f"Error memuat suara {PATH_SOUND_SALAH}: {e}. Mode senyap.")
-            self.sound_salah = None
+            print(f"Error memuat suara {path}: {e}. Mode senyap.")
+        return None
 
     def muat_musik(self):
-        """Mencoba memuat dan memainkan musik BGM secara looping."""
+        """Daftarkan musik BGM ke pemuat aset; diputar looping setelah siap."""
+        if not pygame.mixer.get_init():
+            return
+
+        self.aset.tambah('musik', PATH_MUSIC_BGM, self._baca_musik)
+
+    def _baca_musik(self):
+        """Mencoba memuat musik BGM (thread pemuat), True jika berhasil."""
         try:
             pygame.mixer.music.load(PATH_MUSIC_BGM)
-            pygame.mixer.music.set_volume(0.5) # Atur volume (0.0 - 1.0), 0.5 = 50%
-            pygame.mixer.music.play(-1) # Mainkan secara looping (-1)
             print(f"Berhasil memuat musik: {PATH_MUSIC_BGM}")
+            return True
         except FileNotFoundError:
             print(f"Warning: File musik '{PATH_MUSIC_BGM}' tidak ditemukan. Mode senyap (tanpa musik).")
         except pygame.error as e:
             print(f"Error memuat musik {PATH_MUSIC_BGM}: {e}. Mode senyap.")
+        return None
+
+    def pasang_aset_siap(self):
+        """Pasang aset yang sudah selesai dimuat (dipanggil di thread utama, awal frame)."""
+        for jenis, nama, hasil in self.aset.ambil_hasil():
+            if hasil is None:
+                continue
+            if jenis == 'font':
+                if not self.pasang_font(hasil):
+                    continue
+                self.cache_teks.bersihkan() # Permukaan lama dirender dengan font default
+                self.layar_widget = {} # Widget & lapisan statis dibuat ulang dengan font baru
+                self.lapisan_statis = {}
+                self.status_terakhir_digambar = None # Gambar ulang layar penuh
+            elif jenis == 'suara':
+                self.audio.siapkan(nama, hasil) # Dipanaskan di kanal cadangan
+            elif jenis == 'musik':
+                pygame.mixer.music.set_volume(0.5) # Atur volume (0.0 - 1.0), 0.5 = 50%
+                pygame.mixer.music.play(-1) # Mainkan secara looping (-1)
+        if not self.aset.sedang_memuat and self.waktu_aset_siap is None:
+            self.waktu_aset_siap = time.perf_counter()
+            self.status_terakhir_digambar = None # Hapus indikator memuat
 
     def main_loop(self):
         """Loop utama game yang mengelola perpindahan status game."""
         while True:
-            # Menggambar layar berdasarkan status game
-            if self.status_game_sekarang == STATE_MENU_UTAMA:
-                self.tampil_menu_utama()
-            elif self.status_game_sekarang == STATE_PILIH_KESULITAN:
-                self.tampil_pilih_kesulitan()
-            elif self.status_game_sekarang == STATE_CARA_BERMAIN:
-                self.tampil_cara_bermain()
-            elif self.status_game_sekarang == STATE_BERMAIN:
-                self.loop_bermain()
-            elif self.status_game_sekarang == STATE_PAUSE:
-                self.tampil_pause()
-            elif self.status_game_sekarang == STATE_HASIL_AKHIR:
-                self.tampil_hasil_akhir()
-
-            # Update display
-            pygame.display.flip()
-            self.clock.tick(FPS)
-
-    # --- FUNGSI TAMPILAN (LAYAR) ---
-
-    def tampil_menu_utama(self):
-        """Menampilkan layar menu utama dengan tombol-tombol."""
-        self.layar.fill(WARNA_BIRU_NAVY)
-        self.render_teks(JUDUL_GAME, self.font_judul, WARNA_KUNING, self.lebar // 2, 150)
-
-        # Tombol
-        tombol_mulai = self.gambar_tombol("Mulai Bermain", self.lebar // 2 - 150, 300, 300, 50)
-        tombol_cara = self.gambar_tombol("Cara Bermain", self.lebar // 2 - 150, 370, 300, 50)
-        tombol_keluar = self.gambar_tombol("Keluar", self.lebar // 2 - 150, 440, 300, 50)
-
-        # Event handler untuk menu
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.keluar_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if tombol_mulai.collidepoint(event.pos):
-                    self.status_game_sekarang = STATE_PILIH_KESULITAN
-                elif tombol_cara.collidepoint(event.pos):
-                    self.status_game_sekarang = STATE_CARA_BERMAIN
-                elif tombol_keluar.collidepoint(event.pos):
-                    self.keluar_game()
-
-    def tampil_pilih_kesulitan(self):
-        """Menampilkan layar pemilihan tingkat kesulitan."""
-        self.layar.fill(WARNA_BIRU_NAVY)
-        self.render_teks("Pilih Tingkat Kesulitan", self.font_besar, WARNA_PUTIH, self.lebar // 2, 150)
-
-        # Tombol
-        tombol_mudah = self.gambar_tombol("Mudah", self.lebar // 2 - 150, 250, 300, 50, WARNA_HIJAU_BENAR)
-        tombol_sedang = self.gambar_tombol("Sedang", self.lebar // 2 - 150, 320, 300, 50, WARNA_KUNING)
-        tombol_sulit = self.gambar_tombol("Sulit", self.lebar // 2 - 150, 390, 300, 50, WARNA_MERAH_SALAH)
-        tombol_kembali = self.gambar_tombol("Kembali", self.lebar // 2 - 150, 480, 300, 50, WARNA_ABU_ABU)
-
-        # Event handler
+            self.jalankan_frame()
+
+    def jalankan_frame(self):
+        """Menjalankan satu frame: tunggu input (jika idle), gambar, tampilkan."""
+        if self.perlu_menunggu():
+            event = pygame.event.wait(TIMEOUT_IDLE_MS)
+            if event.type == pygame.NOEVENT:
+                return # Tidak ada input, layar tidak perlu digambar ulang
+            self.simpan_event(event)
+
+        self.waktu_awal_frame = time.perf_counter()
+        self.jam.tick()
+        if self.waktu_aset_siap is None:
+            self.pasang_aset_siap()
+        self.profiler.mulai_frame(self.status_game_sekarang, FASE_EVENT)
+
+        # Satu pompa event per frame, lalu diteruskan ke status aktif
+        events = self.pompa_event()
+        if self.balapan is not None:
+            self.proses_pesan_balapan() # Bisa memindahkan status (balapan dimulai)
+        status = self.status_aktif
+        status.tangani(events)
+
+        # Status yang ditinggalkan di frame ini tidak diperbarui/digambar lagi;
+        # status baru digambar penuh di frame berikutnya
+        if self.status_aktif is status:
+            self.profiler.fase(FASE_UPDATE)
+            status.perbarui()
+        if self.status_aktif is status:
+            self.profiler.fase(FASE_DRAW)
+            status.gambar()
+
+        if self.tampil_profil:
+            self.gambar_overlay_profil()
+
+        # Update display
+        self.profiler.fase(FASE_PRESENT)
+        self.presentasikan(status.nama)
+        self.profiler.selesai_frame()
+        if self.waktu_frame_pertama is None:
+            self.waktu_frame_pertama = time.perf_counter()
+        if not self.jam.virtual:
+            self.tunggu_frame_berikutnya()
+
+    def perlu_menunggu(self):
+        """True jika status aktif tidak punya animasi/timer dan sudah tampil."""
+        return (self.mode_idle
+                and self.waktu_aset_siap is not None # Tetap berjalan selama aset dimuat
+                and self.status_game_sekarang not in STATUS_FPS_TETAP
+                and self.status_game_sekarang == self.status_terakhir_digambar
+                and not pygame.event.peek()
+                and not (self.balapan is not None and self.balapan.ada_pesan()))
+
+    def simpan_event(self, event):
+        """Beri cap waktu (waktu_main saat ini) pada event dan simpan untuk frame berikutnya."""
+        event.waktu = self.jam.baca_waktu_main()
+        self.event_tertunda.append(event)
+
+    def pompa_event(self):
+        """
+        Ambil semua event sekali per frame. Event umum (keluar, F2/F3, ubah
+        ukuran jendela) ditangani di sini; semua event diteruskan ke status aktif.
+        """
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.keluar_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                pilihan = None
-                if tombol_mudah.collidepoint(event.pos):
-                    pilihan = KESULITAN_MUDAH
-                elif tombol_sedang.collidepoint(event.pos):
-                    pilihan = KESULITAN_SEDANG
-                elif tombol_sulit.collidepoint(event.pos):
-                    pilihan = KESULITAN_SULIT
-                elif tombol_kembali.collidepoint(event.pos):
-                    self.status_game_sekarang = STATE_MENU_UTAMA
-
-                if pilihan:
-                    self.kesulitan_terpilih = pilihan
-                    self.mulai_game_baru()
-                    self.status_game_sekarang = STATE_BERMAIN
-
-    def tampil_cara_bermain(self):
-        """Menampilkan layar instruksi cara bermain."""
-        self.layar.fill(WARNA_BIRU_NAVY)
-        self.render_teks("Cara Bermain", self.font_besar, WARNA_PUTIH, self.lebar // 2, 100)
-
-        instruksi = [
-            "Jawab 10 soal aritmetika secepat mungkin.",
-            "Ketik jawabanmu menggunakan angka di keyboard.",
-            "Tekan 'Enter' untuk mengirim jawaban.",
-            "Tekan 'Backspace' untuk menghapus.",
-            "Setiap soal memiliki batas waktu.",
-            "Jika waktu habis atau jawaban salah, skor tidak bertambah.",
-            "Tekan 'P' selama bermain untuk Pause.",
+            self.simpan_event(event)
+        events, self.event_tertunda = self.event_tertunda, []
+        for event in events:
+            self.tangani_event_umum(event)
+        return events
+
+    def tunggu_frame_berikutnya(self):
+        """
+        Pengganti clock.tick(FPS): sisa waktu frame dipakai menunggu input,
+        sehingga setiap event diberi cap waktu saat tiba, bukan saat frame
+        berikutnya dimulai.
+        """
+        batas = self.waktu_awal_frame + 1.0 / FPS
+        while True:
+            sisa_ms = int((batas - time.perf_counter()) * 1000)
+            if sisa_ms <= 0:
+                return
+            event = pygame.event.wait(sisa_ms)
+            if event.type != pygame.NOEVENT:
+                self.simpan_event(event)
+
+    def presentasikan(self, status_digambar):
+        """Kirim frame ke display: flip penuh atau hanya area dirty."""
+        # Layar baru selalu dikirim penuh
+        layar_penuh = status_digambar != self.status_terakhir_digambar
+        self.status_terakhir_digambar = status_digambar
+
+        if self.render_tekstur:
+            # Frame selalu disusun penuh dari tekstur; rect_dirty hanya untuk debug
+            if self.debug_dirty:
+                for rect in self.rect_dirty:
+                    gambar_kotak(self.layar, WARNA_DEBUG_DIRTY, rect, 1)
+            self.layar.present()
+        elif not self.mode_dirty_rect or layar_penuh:
+            pygame.display.flip()
+        elif self.rect_dirty:
+            if self.debug_dirty:
+                for rect in self.rect_dirty:
+                    gambar_kotak(self.layar, WARNA_DEBUG_DIRTY, rect, 1)
+            pygame.display.update(self.rect_dirty)
+        self.rect_dirty = []
+
+    def tandai_dirty(self, rect):
+        """Catat area layar yang berubah pada frame ini."""
+        self.rect_dirty.append(pygame.Rect(rect))
+
+    def tandai_jika_berubah(self, kunci, nilai, rect):
+        """
+        Tandai rect sebagai dirty hanya jika nilai untuk kunci ini berbeda
+        dari frame sebelumnya. Area lama ikut ditandai agar sisa gambar
+        sebelumnya (misal teks yang lebih panjang) ikut terhapus.
+        """
+        lama = self.nilai_terakhir.get(kunci)
+        if lama is not None and lama[0] == nilai:
+            return
+        rect = pygame.Rect(rect)
+        self.nilai_terakhir[kunci] = (nilai, rect)
+        if lama is not None:
+            rect = rect.union(lama[1])
+        self.rect_dirty.append(rect)
+
+    def tangani_event_umum(self, event):
+        """Event yang berlaku di semua layar (keluar, toggle debug, jendela tampil lagi)."""
+        if event.type == pygame.QUIT:
+            self.keluar_game()
+        if event.type == pygame.VIDEORESIZE and self.mode_tampilan == TAMPILAN_JENDELA:
+            self.ubah_ukuran_jendela(event.size)
+        if event.type in EVENT_JENDELA:
+            self.status_terakhir_digambar = None # Flip penuh, area di luar rect dirty bisa rusak
+        if event.type == pygame.KEYDOWN and event.key == TOMBOL_DEBUG_DIRTY:
+            self.debug_dirty = not self.debug_dirty
+        if event.type == pygame.KEYDOWN and event.key == TOMBOL_PROFIL:
+            self.tampil_profil = not self.tampil_profil
+            self.profiler.aktif = self.tampil_profil or self.profiler.mengekspor
+            self.status_terakhir_digambar = None # Gambar ulang penuh untuk menghapus sisa overlay
+
+    def gambar_overlay_profil(self):
+        """Menggambar ringkasan profiler (frame sebelumnya) di pojok kiri atas."""
+        render_sebelum = self.profiler.render_teks # Overlay tidak ikut dihitung
+        alokasi_sebelum = jumlah_alokasi()
+        data = self.profiler.frame_terakhir
+        if data is None:
+            return
+        p50, p95, p99 = self.profiler.persentil_ms()
+        baris = [
+            f"Frame p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f} ms",
+            f"event {data[FASE_EVENT]:.2f}  update {data[FASE_UPDATE]:.2f}  "
+            f"draw {data[FASE_DRAW]:.2f}  present {data[FASE_PRESENT]:.2f} ms",
+            f"render_teks {data['render_teks']}  alokasi {data['alokasi']}  [{data['status']}]",
         ]
+        if self.profiler.riwayat_latensi_suara:
+            s50, s95, _ = self.profiler.persentil_latensi_suara_ms()
+            baris.append(f"tombol->suara p50 {s50:.1f}  p95 {s95:.1f} ms (+buffer {self.audio.latensi_buffer * 1000:.1f} ms)")
+        rect_overlay = pygame.Rect(0, 0, 460, 10 + 24 * len(baris))
+        self.layar.fill(WARNA_LATAR_PROFIL, rect_overlay)
+        y_pos = 8
+        for teks in baris:
+            self.render_teks(teks, self.font_kecil, WARNA_PUTIH, 8, y_pos, center=False, dinamis=True)
+            y_pos += 24
+        self.tandai_dirty(rect_overlay)
+        self.profiler.render_teks = render_sebelum
+        self.profiler.lewati_alokasi(jumlah_alokasi() - alokasi_sebelum)
 
-        y_pos = 180
-        for line in instruksi:
-            self.render_teks(line, self.font_sedang, WARNA_PUTIH, self.lebar // 2, y_pos)
-            y_pos += 40
-
-        # Tombol
-        tombol_kembali = self.gambar_tombol("Kembali ke Menu", self.lebar // 2 - 150, 500, 300, 50, WARNA_ABU_ABU)
-
-        # Event handler
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.keluar_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if tombol_kembali.collidepoint(event.pos):
-                    self.status_game_sekarang = STATE_MENU_UTAMA
-
-    def tampil_pause(self):
-        """Menampilkan overlay pause di atas layar game."""
-        # Gambar layar game terakhir (sudah digambar oleh loop_bermain)
-        # Buat overlay transparan
-        overlay = pygame.Surface((self.lebar, self.tinggi), pygame.SRCALPHA)
-        overlay.fill(WARNA_OVERLAY_PAUSE)
-        self.layar.blit(overlay, (0, 0))
-
-        self.render_teks("PAUSED", self.font_judul, WARNA_KUNING, self.lebar // 2, 200)
-
-        # Tombol
-        tombol_resume = self.gambar_tombol("Lanjut (P)", self.lebar // 2 - 150, 300, 300, 50)
-        tombol_menu = self.gambar_tombol("Kembali ke Menu", self.lebar // 2 - 150, 370, 300, 50)
-        
-        # Event handler
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.keluar_game()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_p:
-                    self.resume_game() # Panggil fungsi resume
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if tombol_resume.collidepoint(event.pos):
-                    self.resume_game()
-                elif tombol_menu.collidepoint(event.pos):
-                    self.status_game_sekarang = STATE_MENU_UTAMA
-
-    def tampil_hasil_akhir(self):
-        """Menampilkan layar statistik akhir dan skor tertinggi."""
-        self.layar.fill(WARNA_BIRU_NAVY)
-        self.render_teks("Permainan Selesai!", self.font_besar, WARNA_KUNING, self.lebar // 2, 80)
-
-        # Statistik
-        stats_y = 150
-        self.render_teks(f"Total Skor: {self.data_hasil_terakhir['skor']}", self.font_sedang, WARNA_PUTIH, self.lebar // 2, stats_y)
-        stats_y += 40
-        self.render_teks(f"Jawaban Benar: {self.data_hasil_terakhir['benar']}", self.font_sedang, WARNA_HIJAU_BENAR, self.lebar // 2, stats_y)
-        stats_y += 40
-        self.render_teks(f"Jawaban Salah: {self.data_hasil_terakhir['salah']}", self.font_sedang, WARNA_MERAH_SALAH, self.lebar // 2, stats_y)
-        stats_y += 40
-        self.render_teks(f"Waktu Total: {self.data_hasil_terakhir['waktu_total']:.2f} detik", self.font_sedang, WARNA_PUTIH, self.lebar // 2, stats_y)
-        stats_y += 60
-
-        # Input Nama
-        self.render_teks("Masukkan Nama:", self.font_sedang, WARNA_PUTIH, self.lebar // 2, stats_y)
-        stats_y += 50
-        
-        # Kotak input nama
-        input_rect = pygame.Rect(self.lebar // 2 - 150, stats_y - 10, 300, 50)
-        warna_input_rect = WARNA_PUTIH if self.input_nama_aktif else WARNA_ABU_ABU
-        pygame.draw.rect(self.layar, warna_input_rect, input_rect, 2, 5)
-        self.render_teks(self.input_nama_pemain, self.font_sedang, WARNA_PUTIH, self.lebar // 2, stats_y + 15)
-
-        stats_y += 60
-        # Tombol Simpan & Menu
-        tombol_simpan = self.gambar_tombol("Simpan Skor", self.lebar // 2 - 170, stats_y, 150, 50)
-        tombol_menu = self.gambar_tombol("Menu Utama", self.lebar // 2 + 20, stats_y, 150, 50)
-        
-        # Event handler
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.keluar_game()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if tombol_simpan.collidepoint(event.pos):
-                    # Simpan skor dan kembali ke menu
-                    self.simpan_skor_tertinggi(self.input_nama_pemain, self.data_hasil_terakhir['skor'])
-                    self.input_nama_aktif = False
-                    self.status_game_sekarang = STATE_MENU_UTAMA
-                elif tombol_menu.collidepoint(event.pos):
-                    self.input_nama_aktif = False
-                    self.status_game_sekarang = STATE_MENU_UTAMA
-                elif input_rect.collidepoint(event.pos):
-                    self.input_nama_aktif = True
-                else:
-                    self.input_nama_aktif = False
-            
-            if event.type == pygame.KEYDOWN and self.input_nama_aktif:
-                if event.key == pygame.K_RETURN:
-                    self.input_nama_aktif = False
-                elif event.key == pygame.K_BACKSPACE:
-                    self.input_nama_pemain = self.input_nama_pemain[:-1]
-                else:
-                    if len(self.input_nama_pemain) < 15: # Batas nama
-                        self.input_nama_pemain += event.unicode
-        
-        # Tampilkan Skor Tertinggi
-        # self.tampil_skor_tertinggi(300, stats_y + 80) # Tampilkan di layar hasil
-        self.tampil_skor_tertinggi(self.lebar // 2, stats_y + 80) # Gunakan self.lebar
-        
-    def tampil_skor_tertinggi(self, x_center, y_start):
-        """Helper untuk menampilkan daftar 5 skor tertinggi."""
-        self.render_teks("Skor Tertinggi", self.font_sedang, WARNA_KUNING, x_center, y_start)
-        skor = self.muat_skor_tertinggi()
-        
-        if not skor:
-            self.render_teks("Belum ada skor", self.font_kecil, WARNA_PUTIH, x_center, y_start + 35)
-            return
+    # --- FUNGSI TAMPILAN (LAYAR) ---
 
-        y_pos = y_start + 35
-        for i, entri in enumerate(skor):
-            teks = f"{i+1}. {entri['nama']} - {entri['skor']} ({entri['tanggal']})"
-            self.render_teks(teks, self.font_kecil, WARNA_PUTIH, x_center, y_pos)
-            y_pos += 25
+    def teks_skor_tertinggi(self):
+        """Judul dan baris-baris daftar 5 skor tertinggi."""
+        if self.sesi_balapan:
+            # Papan peringkat balapan (diperbarui langsung dari server)
+            papan = self.papan_balapan
+            if papan is None:
+                return "Papan Balapan", []
+            judul = "Papan Balapan" if papan['tipe'] == 'selesai' else "Papan Balapan (sementara)"
+            return judul, [f"{i+1}. {nama} - {skor}" for i, (nama, skor, _, _) in enumerate(papan['teratas'][:5])]
+        if self.db_skor is not None:
+            # Top 5 untuk kesulitan yang baru dimainkan (dari SQLite)
+            judul = f"Skor Tertinggi ({self.kesulitan_terpilih.capitalize()})"
+            skor = self.skor_per_kesulitan
+        else:
+            judul = "Skor Tertinggi"
+            skor = self.muat_skor_tertinggi()
+        baris = [f"{i+1}. {entri['nama']} - {entri['skor']} ({entri['tanggal']})" for i, entri in enumerate(skor)]
+        return judul, baris
+
+    # --- LAYAR WIDGET ---
+
+    def ambil_layar_widget(self, status):
+        """LayarWidget untuk status; dibuat sekali, dibuat ulang setelah font/ukuran layar berubah."""
+        layar = self.layar_widget.get(status)
+        if layar is None:
+            layar = self.layar_widget[status] = self.buat_layar_widget(status)
+        return layar
+
+    def buat_layar_widget(self, status):
+        """Susun widget bagian dinamis satu layar; konten statis menjadi latar (lapisan)."""
+        tata_letak = self.tata_letak[status]
+        posisi = tata_letak.teks
+        if status == STATE_PAUSE:
+            latar = self.layar_pause # Frame beku, disusun di pause_game
+        else:
+            latar = self.ambil_lapisan(status)
+        layar = LayarWidget(self.cache_teks, latar)
+
+        if status == STATE_MENU_UTAMA:
+            layar.tambah(Label("", self.font_kecil, WARNA_ABU_ABU, posisi['memuat']), 'memuat')
+            layar.tambah(Label("", self.font_kecil, WARNA_KUNING, posisi['balapan']), 'balapan')
+        elif status == STATE_HASIL_AKHIR:
+            layar.tambah(Label("", self.font_sedang, WARNA_PUTIH, posisi['skor']), 'skor')
+            layar.tambah(Label("", self.font_sedang, WARNA_HIJAU_BENAR, posisi['benar']), 'benar')
+            layar.tambah(Label("", self.font_sedang, WARNA_MERAH_SALAH, posisi['salah']), 'salah')
+            layar.tambah(Label("", self.font_sedang, WARNA_PUTIH, posisi['waktu_total']), 'waktu_total')
+            layar.tambah(InputTeks(tata_letak.kotak['input_nama'], self.font_sedang, WARNA_PUTIH,
+                                   WARNA_PUTIH, WARNA_ABU_ABU, batas=15), 'input_nama')
+            x, y = posisi['skor_tertinggi']
+            layar.tambah(Label("", self.font_sedang, WARNA_KUNING, (x, y)), 'judul_skor')
+            layar.tambah(Daftar(self.font_kecil, WARNA_PUTIH, (x, y + 35), 25, "Belum ada skor"), 'skor_tertinggi')
+
+        for label, rect in tata_letak.tombol.items():
+            warna = WARNA_TOMBOL_KESULITAN.get(label, WARNA_ABU_ABU)
+            layar.tambah(Tombol(label, rect, self.font_sedang, warna, WARNA_BIRU_TERANG, WARNA_HITAM))
+        return layar
+
+    def ambil_lapisan(self, status):
+        """Lapisan statis status; dibuat sekali, dibuat ulang setelah font/ukuran layar berubah."""
+        lapisan = self.lapisan_statis.get(status)
+        if lapisan is None:
+            lapisan = self.lapisan_statis[status] = self.buat_lapisan_statis(status)
+        return lapisan
+
+    def buat_lapisan_statis(self, status):
+        """
+        Render konten statis satu layar (latar, judul, teks instruksi, label,
+        kotak input) ke permukaan seukuran layar. Setiap frame layar cukup
+        memakai lapisan ini lalu menggambar bagian dinamis di atasnya.
+        """
+        tata_letak = self.tata_letak[status]
+        posisi = tata_letak.teks
+        lapisan = pygame.Surface(self.layar.get_size())
+        if pygame.display.get_surface() is not None: # Render tekstur: dikonversi saat upload
+            lapisan = lapisan.convert()
+        catat_alokasi(lapisan)
+        lapisan.fill(WARNA_BIRU_NAVY)
+
+        teks = [] # (teks, font, warna, posisi)
+        if status == STATE_MENU_UTAMA:
+            teks.append((JUDUL_GAME, self.font_judul, WARNA_KUNING, posisi['judul']))
+        elif status == STATE_PILIH_KESULITAN:
+            teks.append(("Pilih Tingkat Kesulitan", self.font_besar, WARNA_PUTIH, posisi['judul']))
+        elif status == STATE_CARA_BERMAIN:
+            teks.append(("Cara Bermain", self.font_besar, WARNA_PUTIH, posisi['judul']))
+            for i, line in enumerate(INSTRUKSI_CARA_BERMAIN):
+                teks.append((line, self.font_sedang, WARNA_PUTIH, posisi[('instruksi', i)]))
+        elif status == STATE_BERMAIN:
+            pygame.draw.rect(lapisan, WARNA_PUTIH, tata_letak.kotak['input_jawaban'], 3, 5)
+        elif status == STATE_HASIL_AKHIR:
+            teks.append(("Permainan Selesai!", self.font_besar, WARNA_KUNING, posisi['judul']))
+            teks.append(("Masukkan Nama:", self.font_sedang, WARNA_PUTIH, posisi['label_nama']))
+
+        for isi, font, warna, (x, y) in teks:
+            self.render_teks(isi, font, warna, x, y, permukaan=lapisan)
+        return lapisan
+
+    def gambar_layar_widget(self, status, layar):
+        """Gambar layar widget: penuh saat layar baru tampil, selain itu hanya widget dirty."""
+        if self.status_terakhir_digambar != status:
+            layar.perbarui_hover(pygame.mouse.get_pos())
+            layar.gambar(self.layar, penuh=True)
+            for tombol in layar.tombol():
+                self.rect_tombol[tombol.label] = tombol.rect # Posisi tombol (untuk simulasi)
+        elif self.render_tekstur:
+            # Renderer tidak menyimpan isi frame sebelumnya: setiap frame disusun ulang
+            layar.gambar(self.layar, penuh=True)
+        else:
+            self.rect_dirty.extend(layar.gambar(self.layar))
 
     # --- FUNGSI LOGIKA GAME ---
 
-    def mulai_game_baru(self):
-        """Reset semua variabel untuk sesi permainan baru."""
-        self.data_game_aktif = {
-            'skor': 0,
-            'jumlah_benar': 0,
-            'jumlah_salah': 0,
-            'nomor_soal': 1,
-            'input_jawaban': "",
-            'soal_teks': "",
-            'jawaban_benar': 0,
-            'sedang_umpan_balik': False,
-            'waktu_mulai_umpan_balik': 0,
-            'info_umpan_balik': {}, # (teks, warna, durasi, jawaban_ditampilkan)
-            'waktu_mulai_game': time.time(),
-            # 'waktu_mulai_soal': time.time(), # Dihapus, kita pakai timer global
-            'waktu_pause_dimulai': 0, # Untuk menghitung total waktu pause
-            'total_waktu_pause': 0
-        }
-        
-        # Set pengaturan berdasarkan kesulitan
-        self.data_game_aktif['total_batas_waktu'] = PENGATURAN_KESULITAN[self.kesulitan_terpilih][0] # Ganti nama var
-        self.data_game_aktif['skor_per_soal'] = PENGATURAN_KESULITAN[self.kesulitan_terpilih][1]
+    def mulai_game_baru(self, seed=None, aturan=None, sampler=None):
+        """
+        Mulai sesi permainan baru.
+
+        Dengan seed, urutan soal sesi selalu sama (untuk tantangan harian).
+        aturan: (batas waktu, skor per soal), default dari PENGATURAN_KESULITAN.
+        sampler: sumber soal selain bank soal (AntrianSoal di mode balapan);
+        sesi seperti ini tidak direkam karena tidak bisa dibangun ulang dari seed.
+        """
+        if sampler is not None:
+            seed = None
+        else:
+            if seed is None and MODE_TANTANGAN_HARIAN:
+                seed = seed_tantangan_harian(datetime.date.today())
+            if seed is None:
+                seed = int.from_bytes(os.urandom(7), 'little') # Seed acak, tetap dicatat untuk rekaman
+            sampler = self.bank_soal.sampler(self.kesulitan_terpilih, seed)
+        self.seed_soal = seed
+        self.sampler_soal = sampler
+        self.id_sesi = uuid.uuid4().hex
+        self.sesi_balapan = False
+        self.jam.lanjutkan() # Sesi sebelumnya bisa saja ditinggal dalam keadaan pause
+        if self.folder_rekaman and seed is not None:
+            self.rekaman = Rekaman(seed, self.kesulitan_terpilih, self.jam.waktu_main)
+        else:
+            self.rekaman = None
+
+        if aturan is None:
+            aturan = PENGATURAN_KESULITAN[self.kesulitan_terpilih] # [total waktu sesi, skor per soal]
+        batas_waktu, skor_per_soal = aturan
+        self.sesi = Sesi(self.sampler_soal, self.kesulitan_terpilih, batas_waktu, skor_per_soal,
+                         self.jam.waktu_main, LANGKAH_LOGIKA) # Waktu pause sudah dikecualikan oleh jam
 
-        # Buat soal pertama
-        self.buat_soal_baru()
-        
         # Reset animasi
-        self.anim_state = 'idle'
-        self.anim_timer = 0.0
+        self.animasi.reset()
 
-    def loop_bermain(self):
-        """Loop utama saat permainan sedang berlangsung."""
-        
-        # Cek event dulu
-        self.handle_event_bermain()
-        
-        # Logika game
-        if self.data_game_aktif['sedang_umpan_balik']:
-            self.update_umpan_balik()
-        else:
-            # self.update_timer_soal() # Ganti ke timer sesi
-            self.update_timer_sesi()
-        
-        # Menggambar
-        self.gambar_layar_bermain()
-        
-    def handle_event_bermain(self):
+    def handle_event_bermain(self, events):
         """Menangani input user selama permainan."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.keluar_game()
+        for event in events:
             if event.type == pygame.KEYDOWN:
+                if self.rekaman is not None and event.key != pygame.K_p: # Pause tidak mengubah waktu_main
+                    self.rekaman.catat_tombol(self.jam.waktu_main, event.key, event.unicode)
                 if event.key == pygame.K_ESCAPE:
                     self.status_game_sekarang = STATE_MENU_UTAMA
-                elif event.key == pygame.K_p:
+                elif event.key == pygame.K_p and not self.sesi_balapan: # Balapan tidak bisa di-pause
                     self.pause_game()
                 
-                # Hanya proses input jika tidak sedang umpan balik
-                if not self.data_game_aktif['sedang_umpan_balik']:
-                    if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
-                        self.proses_jawaban()
-                    elif event.key == pygame.K_BACKSPACE:
-                        self.data_game_aktif['input_jawaban'] = self.data_game_aktif['input_jawaban'][:-1]
-                    elif event.unicode.isdigit() or (event.key == pygame.K_MINUS and not self.data_game_aktif['input_jawaban']):
-                        # Hanya terima angka, atau minus jika di awal
-                        self.data_game_aktif['input_jawaban'] += event.unicode
-
-    def update_timer_sesi(self):
-        """Memeriksa apakah total waktu sesi permainan sudah habis."""
-        # Hitung waktu berlalu dikurangi total waktu pause
-        waktu_berlalu = (time.time() - self.data_game_aktif['waktu_mulai_game']) - self.data_game_aktif['total_waktu_pause']
-        waktu_sisa = self.data_game_aktif['total_batas_waktu'] - waktu_berlalu
-        
-        if waktu_sisa <= 0:
-            self.selesaikan_game() # Langsung selesaikan game
-            
-    def update_umpan_balik(self):
-        """Memeriksa apakah durasi umpan balik (benar/salah) sudah selesai."""
-        durasi = self.data_game_aktif['info_umpan_balik']['durasi']
-        if time.time() - self.data_game_aktif['waktu_mulai_umpan_balik'] > durasi:
-            self.data_game_aktif['sedang_umpan_balik'] = False
-            self.lanjut_soal_berikutnya()
+                # Input diabaikan selama umpan balik (aturan di inti_game.Sesi)
+                if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
+                    self.proses_jawaban(event.waktu)
+                elif event.key == pygame.K_BACKSPACE:
+                    self.sesi.hapus_input()
+                elif event.unicode.isdigit() or event.key == pygame.K_MINUS:
+                    # Hanya terima angka, atau minus jika di awal
+                    self.sesi.tambah_input('-' if event.key == pygame.K_MINUS else event.unicode)
+
+    def perbarui_logika(self):
+        """
+        Majukan logika sesi dengan langkah tetap LANGKAH_LOGIKA sampai waktu
+        frame ini. Langkah ke-n jatuh tepat di waktu mulai sesi + n * LANGKAH,
+        jadi jumlah langkah hanya bergantung pada waktu_main frame (bukan pada
+        FPS atau frame yang lambat) dan putar ulang rekaman tetap identik.
+        Sisa waktu yang belum cukup satu langkah dipakai untuk interpolasi.
+        """
+        sesi = self.sesi
+        tik_target = sesi.tik_pada(self.jam.waktu_main)
+        while sesi.tik < tik_target and self.status_game_sekarang == STATE_BERMAIN:
+            self.animasi.tik()
+            umpan_balik = sesi.umpan_balik
+            kejadian = sesi.langkah()
+            if kejadian == SELESAI_UMPAN_BALIK and self.sesi_balapan and not self.sampler_soal.ada_soal():
+                # Soal berikutnya belum tiba dari server: umpan balik tetap tampil
+                if sesi.tik < sesi.tik_batas:
+                    sesi.perpanjang_umpan_balik(umpan_balik)
+                else:
+                    self.selesaikan_game()
+            elif kejadian == SELESAI_UMPAN_BALIK:
+                if self.rekaman is not None:
+                    self.rekaman.catat_frame(self.jam.waktu_main)
+                self.lanjut_soal_berikutnya()
+            elif kejadian == WAKTU_HABIS:
+                self.selesaikan_game() # Langsung selesaikan game
+
+    def waktu_kejadian_berikutnya(self):
+        """Waktu (waktu_main) kejadian logika berikutnya: akhir umpan balik atau akhir sesi."""
+        return self.sesi.waktu_kejadian_berikutnya()
 
     def gambar_layar_bermain(self):
         """Menggambar semua elemen UI saat game berlangsung."""
+        tata_letak = self.tata_letak[STATE_BERMAIN]
+        posisi = tata_letak.teks
+        sesi = self.sesi
+        umpan_balik = sesi.umpan_balik
         
-        # Background default
-        self.layar.fill(WARNA_BIRU_NAVY)
+        # Background & kotak input dari lapisan statis
+        self.layar.blit(self.ambil_lapisan(STATE_BERMAIN), (0, 0))
+
+        # Mulai/selesai umpan balik mengganti warna seluruh layar
+        self.tandai_jika_berubah('umpan_balik', umpan_balik is not None, self.layar.get_rect())
 
         # Jika sedang umpan balik, gambar background flash
-        if self.data_game_aktif['sedang_umpan_balik']:
-            warna_flash = self.data_game_aktif['info_umpan_balik']['warna']
-            self.layar.fill(warna_flash)
+        if umpan_balik is not None:
+            self.layar.fill(WARNA_HIJAU_BENAR if umpan_balik.benar else WARNA_MERAH_SALAH)
             
             # Tampilkan teks umpan balik
-            teks_umpan_balik = self.data_game_aktif['info_umpan_balik']['teks']
-            self.render_teks(teks_umpan_balik, self.font_besar, WARNA_PUTIH, self.lebar // 2, self.tinggi // 2 - 100)
+            self.render_teks(umpan_balik.teks, self.font_besar, WARNA_PUTIH, *posisi['umpan_balik'])
             
             # Tampilkan jawaban jika salah
-            jawaban_ditampilkan = self.data_game_aktif['info_umpan_balik'].get('jawaban_ditampilkan')
-            if jawaban_ditampilkan:
-                self.render_teks(f"Jawaban: {jawaban_ditampilkan}", self.font_sedang, WARNA_PUTIH, self.lebar // 2, self.tinggi // 2 - 50)
+            if umpan_balik.tampilkan_jawaban:
+                self.render_teks(f"Jawaban: {sesi.soal.jawaban}", self.font_sedang, WARNA_PUTIH, *posisi['jawaban'])
         
         else:
             # --- UI Game Normal ---
             # Timer (Gunakan timer sesi)
-            waktu_berlalu = (time.time() - self.data_game_aktif['waktu_mulai_game']) - self.data_game_aktif['total_waktu_pause']
-            waktu_sisa = self.data_game_aktif['total_batas_waktu'] - waktu_berlalu
+            waktu_sisa = sesi.waktu_sisa(self.jam.waktu_main)
             warna_timer = WARNA_PUTIH if waktu_sisa > 10 else WARNA_MERAH_SALAH # Peringatan 10 detik
-            self.render_teks(f"Waktu: {int(waktu_sisa)}s", self.font_sedang, warna_timer, self.lebar - 100, 50)
+            teks_timer = f"Waktu: {int(waktu_sisa)}s"
+            rect_timer = self.render_teks(teks_timer, self.font_sedang, warna_timer, *posisi['timer'], dinamis=True)
+            self.tandai_jika_berubah('timer', (teks_timer, warna_timer), rect_timer)
 
             # Indikator Soal (Hanya nomor soal)
-            teks_soal = f"Soal ke-{self.data_game_aktif['nomor_soal']}"
-            self.render_teks(teks_soal, self.font_sedang, WARNA_PUTIH, self.lebar // 2, 50)
+            teks_soal = f"Soal ke-{sesi.nomor_soal}"
+            rect_nomor = self.render_teks(teks_soal, self.font_sedang, WARNA_PUTIH, *posisi['nomor_soal'], dinamis=True)
+            self.tandai_jika_berubah('nomor_soal', teks_soal, rect_nomor)
             
             # Skor
-            self.render_teks(f"Skor: {self.data_game_aktif['skor']}", self.font_sedang, WARNA_PUTIH, 100, 50)
+            teks_skor = f"Skor: {sesi.skor}"
+            rect_skor = self.render_teks(teks_skor, self.font_sedang, WARNA_PUTIH, *posisi['skor'], dinamis=True)
+            self.tandai_jika_berubah('skor', teks_skor, rect_skor)
+
+            # Peringkat balapan
+            peringkat = self.peringkat_balapan()
+            if peringkat is not None:
+                teks_peringkat = f"Peringkat {peringkat[0]}/{peringkat[1]}"
+                rect_peringkat = self.render_teks(teks_peringkat, self.font_sedang, WARNA_KUNING,
+                                                  *posisi['peringkat'], dinamis=True)
+                self.tandai_jika_berubah('peringkat', teks_peringkat, rect_peringkat)
 
             # Teks Soal
-            self.render_teks(self.data_game_aktif['soal_teks'], self.font_besar, WARNA_PUTIH, self.lebar // 2, 200)
-
-            # Kotak Input Jawaban
-            input_rect = pygame.Rect(self.lebar // 2 - 150, 280, 300, 70)
-            pygame.draw.rect(self.layar, WARNA_PUTIH, input_rect, 3, 5)
-            
-            # Teks Jawaban yang diketik
-            self.render_teks(self.data_game_aktif['input_jawaban'], self.font_besar, WARNA_PUTIH, self.lebar // 2, 315)
-
-        # Update dan gambar animasi karakter
-        self.update_dan_gambar_animasi()
-
-    def buat_soal_baru(self):
-        """Membuat soal baru berdasarkan kesulitan dan menyimpannya."""
-        kesulitan = self.kesulitan_terpilih
-        op = '+'
-        a, b = 0, 0
-        jawaban = 0
-
-        try:
-            if kesulitan == KESULITAN_MUDAH:
-                op = random.choice(['+', '-'])
-                a = random.randint(0, 20)
-                b = random.randint(0, 20)
-                if op == '-' and a < b:
-                    a, b = b, a  # Hindari jawaban negatif untuk Mudah
-                
-            elif kesulitan == KESULITAN_SEDANG:
-                op = random.choice(['+', '-', '*'])
-                a = random.randint(0, 50)
-                b = random.randint(0, 50)
-                if op == '-' and a < b:
-                    a, b = b, a
-                if op == '*':
-                    a = random.randint(0, 12) # Perkalian sedang
-                    b = random.randint(0, 12)
-
-            elif kesulitan == KESULITAN_SULIT:
-                op = random.choice(['+', '-', '*', '/'])
-                if op == '+':
-                    a = random.randint(10, 99)
-                    b = random.randint(10, 99)
-                elif op == '-':
-                    a = random.randint(10, 99)
-                    b = random.randint(10, 99)
-                    if a < b:
-                        a, b = b, a
-                elif op == '*':
-                    a = random.randint(2, 20)
-                    b = random.randint(2, 20)
-                elif op == '/':
-                    # Buat pembagian yang menghasilkan bilangan bulat
-                    # Tentukan hasil dulu, lalu pengali, baru dapat angka yg dibagi
-                    hasil = random.randint(2, 10)
-                    b = random.randint(2, 10)
-                    a = hasil * b
-
-            soal_teks = f"{a} {op} {b}"
-            
-            # eval() aman di sini karena kita yg mengontrol string (a, op, b)
-            # Ganti / dengan // untuk pembagian integer
-            jawaban = eval(soal_teks.replace('/', '//'))
-
-            self.data_game_aktif['soal_teks'] = soal_teks
-            self.data_game_aktif['jawaban_benar'] = jawaban
-            
-        except Exception as e:
-            print(f"Error saat membuat soal: {e}. Membuat ulang...")
-            self.buat_soal_baru() # Rekursif jika ada error (jarang terjadi)
-
-    def proses_jawaban(self):
-        """Memvalidasi jawaban yang di-submit oleh pemain."""
-        if self.data_game_aktif['sedang_umpan_balik']:
+            rect_soal = self.render_teks(sesi.soal.teks, self.font_besar, WARNA_PUTIH, *posisi['soal'])
+            self.tandai_jika_berubah('soal', sesi.soal.teks, rect_soal)
+
+            # Teks Jawaban yang diketik (kotak input ada di lapisan statis)
+            input_rect = tata_letak.kotak['input_jawaban']
+            self.render_teks(sesi.input_jawaban, self.font_besar, WARNA_PUTIH, *posisi['input_jawaban'], dinamis=True)
+            self.tandai_jika_berubah('input_jawaban', sesi.input_jawaban, input_rect)
+
+        # Gambar karakter (animasi dimajukan di perbarui_logika)
+        self.gambar_karakter()
+
+    def proses_jawaban(self, waktu_input=None):
+        """
+        Memvalidasi jawaban yang di-submit oleh pemain.
+
+        waktu_input: cap waktu event Enter (waktu_main), untuk latensi menjawab.
+        """
+        sesi = self.sesi
+        # Umpan balik dimulai dari langkah logika frame ini
+        umpan_balik = sesi.jawab(sesi.tik_pada(self.jam.waktu_main))
+        if umpan_balik is None:
             return # Jangan proses jika sedang umpan balik
 
-        try:
-            # Coba konversi input string ke integer
-            jawaban_user = int(self.data_game_aktif['input_jawaban'])
-        except ValueError:
-            # Jika input kosong ("") atau non-numerik (misal "-")
-            jawaban_user = None # Dianggap salah
-
-        jawaban_benar = self.data_game_aktif['jawaban_benar']
-
-        if jawaban_user == jawaban_benar:
-            # --- Jawaban Benar ---
-            self.data_game_aktif['skor'] += self.data_game_aktif['skor_per_soal']
-            self.data_game_aktif['jumlah_benar'] += 1
-            if self.sound_benar:
-                self.sound_benar.play()
-            
-            # Set info umpan balik
-            self.data_game_aktif['info_umpan_balik'] = {
-                'teks': "Benar!",
-                'warna': WARNA_HIJAU_BENAR,
-                'durasi': 0.8,
-                'jawaban_ditampilkan': None
-            }
-            self.mulai_animasi('jump')
-
-        else:
-            # --- Jawaban Salah ---
-            self.data_game_aktif['jumlah_salah'] += 1
-            if self.sound_salah:
-                self.sound_salah.play()
-                
-            # Set info umpan balik
-            self.data_game_aktif['info_umpan_balik'] = {
-                'teks': "Salah!",
-                'warna': WARNA_MERAH_SALAH,
-                'durasi': 1.0,
-                'jawaban_ditampilkan': jawaban_benar
-            }
-            self.mulai_animasi('shake')
-
-        # Mulai timer umpan balik
-        self.data_game_aktif['sedang_umpan_balik'] = True
-        self.data_game_aktif['waktu_mulai_umpan_balik'] = time.time()
+        if waktu_input is None:
+            waktu_input = self.jam.waktu_main
+        # Suara lebih dulu agar latensi tombol -> suara sekecil mungkin
+        self.mainkan_suara('benar' if umpan_balik.benar else 'salah', waktu_input)
+        self.mulai_animasi('jump' if umpan_balik.benar else 'shake')
+        self.catat_jawaban(umpan_balik.benar, waktu_input)
+        if self.sesi_balapan:
+            self.balapan.kirim({'tipe': 'jawab', 'nomor': sesi.nomor_soal, 'input': sesi.input_jawaban})
         
-    # Fungsi ini tidak diperlukan lagi karena tidak ada timer per soal
-    # def handle_waktu_habis(self): ...
-    # (Kita hapus fungsi handle_waktu_habis)
+    def mainkan_suara(self, nama, waktu_input):
+        """Putar suara umpan balik dan catat latensi tombol -> suara di profiler."""
+        latensi = self.audio.mainkan(nama, waktu_input, self.jam.baca_waktu_main())
+        if latensi is not None:
+            self.profiler.catat_latensi_suara(latensi)
+
+    def catat_jawaban(self, benar, waktu_input):
+        """Catat satu jawaban ke agregat dan log telemetri."""
+        sesi = self.sesi
+        soal = sesi.soal
+        rekaman = {
+            'sesi': self.id_sesi,
+            'waktu': datetime.datetime.now().isoformat(timespec='seconds'),
+            'kesulitan': self.kesulitan_terpilih,
+            'nomor': sesi.nomor_soal,
+            'a': soal.a,
+            'op': soal.op,
+            'b': soal.b,
+            'jawaban': soal.jawaban,
+            'input': sesi.input_jawaban,
+            'benar': benar,
+            'latensi': round(waktu_input - sesi.waktu_mulai_soal, 4), # Detik sejak soal tampil, tanpa pause
+        }
+        self.agregat_jawaban.tambah(rekaman)
+        if self.telemetri is not None:
+            self.telemetri.catat(rekaman)
 
     def lanjut_soal_berikutnya(self):
-        """Pindah ke soal berikutnya."""
-        # Tidak perlu cek TOTAL_SOAL_PER_SESI, game berlanjut sampai waktu habis
-        
-        # if self.data_game_aktif['nomor_soal'] < TOTAL_SOAL_PER_SESI:
-        
-        self.data_game_aktif['nomor_soal'] += 1
-        self.data_game_aktif['input_jawaban'] = ""
-        self.buat_soal_baru()
-        # self.data_game_aktif['waktu_mulai_soal'] = time.time() # Hapus reset timer soal
-        
-        # else:
-        #     # Sesi selesai (Logika ini pindah ke update_timer_sesi)
-        #     self.selesaikan_game()
+        """Pindah ke soal berikutnya (game berlanjut sampai waktu habis)."""
+        self.sesi.lanjut_soal(self.jam.waktu_main)
 
     def selesaikan_game(self):
         """Menyiapkan data untuk layar hasil akhir."""
@@ -656,15 +1220,15 @@ class MathSprintGame:
         if self.status_game_sekarang != STATE_BERMAIN:
             return
 
-        waktu_total = (time.time() - self.data_game_aktif['waktu_mulai_game']) - self.data_game_aktif['total_waktu_pause']
-        
         # Simpan data statistik untuk ditampilkan di layar hasil
-        self.data_hasil_terakhir = {
-            'skor': self.data_game_aktif['skor'],
-            'benar': self.data_game_aktif['jumlah_benar'],
-            'salah': self.data_game_aktif['jumlah_salah'],
-            'waktu_total': waktu_total
-        }
+        self.data_hasil_terakhir = self.sesi.hasil(self.jam.waktu_main)
+        if self.db_skor is not None:
+            self.skor_per_kesulitan = self.db_skor.top_n(self.kesulitan_terpilih, 5)
+            self.catat_riwayat_sesi(self.data_hasil_terakhir)
+        if self.telemetri is not None:
+            self.telemetri.kirim() # Tulis sisa jawaban sesi ini di latar belakang
+        if self.rekaman is not None:
+            self.simpan_rekaman()
         
         # Pindah ke layar hasil
         self.status_game_sekarang = STATE_HASIL_AKHIR
@@ -674,116 +1238,258 @@ class MathSprintGame:
     def pause_game(self):
         """Mengaktifkan mode pause."""
         if self.status_game_sekarang == STATE_BERMAIN:
-            pygame.mixer.music.pause() # Jeda musik
-            self.status_game_sekarang = STATE_PAUSE
-            # Catat waktu saat pause dimulai
-            self.data_game_aktif['waktu_pause_dimulai'] = time.time()
+            if pygame.mixer.get_init():
+                pygame.mixer.music.pause() # Jeda musik
+            # Hentikan waktu game (timer sesi & umpan balik ikut berhenti)
+            self.jam.jeda()
+
+            # Bekukan frame game terakhir, gelapkan, dan tulis judul sekali saja.
+            # Selama pause, layar ini yang dipakai (tanpa blend alpha per frame).
+            if self.render_tekstur:
+                # Isi Renderer tidak bisa dibaca ulang: frame terakhir disusun lagi di permukaan biasa
+                kanvas, self.layar = self.layar, catat_alokasi(pygame.Surface(self.layar.get_size()))
+                self.gambar_layar_bermain()
+                self.layar_pause, self.layar = self.layar, kanvas
+            else:
+                self.layar_pause = catat_alokasi(self.layar.copy())
+            overlay = catat_alokasi(pygame.Surface((self.lebar, self.tinggi), pygame.SRCALPHA))
+            overlay.fill(WARNA_OVERLAY_PAUSE)
+            self.layar_pause.blit(overlay, (0, 0))
+            self.render_teks("PAUSED", self.font_judul, WARNA_KUNING, *self.tata_letak[STATE_PAUSE].teks['judul'],
+                             permukaan=self.layar_pause)
+            self.status_game_sekarang = STATE_PAUSE # Hook masuk memasang frame beku sebagai latar
 
     def resume_game(self):
         """Melanjutkan game dari mode pause."""
         if self.status_game_sekarang == STATE_PAUSE:
-            pygame.mixer.music.unpause() # Lanjutkan musik
-            # Hitung durasi pause
-            durasi_pause = time.time() - self.data_game_aktif['waktu_pause_dimulai']
-            # Tambahkan ke timer soal agar waktu tidak berkurang (DIHAPUS)
-            # self.data_game_aktif['waktu_mulai_soal'] += durasi_pause
-            # Tambahkan ke total waktu pause
-            self.data_game_aktif['total_waktu_pause'] += durasi_pause
+            if pygame.mixer.get_init():
+                pygame.mixer.music.unpause() # Lanjutkan musik
+            # Jam menghitung durasi pause sendiri
+            self.jam.lanjutkan()
+            self.layar_pause = None # Lepas frame beku
             
             self.status_game_sekarang = STATE_BERMAIN
 
     def keluar_game(self):
         """Keluar dari aplikasi Pygame."""
-        pygame.mixer.music.stop() # Hentikan musik
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop() # Hentikan musik
+        self.papan_skor.tutup() # Tunggu penyimpanan skor yang tertunda
+        if self.telemetri is not None:
+            self.telemetri.tutup()
+        if self.balapan is not None:
+            self.balapan.tutup()
+        self.profiler.tutup()
+        if self.db_skor is not None:
+            self.db_skor.tutup()
+        if self.render_tekstur:
+            self.layar.tutup() # Tekstur & renderer dilepas sebelum SDL ditutup
         pygame.quit()
         sys.exit()
 
+    # --- REKAMAN & PUTAR ULANG ---
+
+    def simpan_rekaman(self):
+        """Lengkapi rekaman sesi yang baru selesai dan tulis di latar belakang."""
+        rekaman, self.rekaman = self.rekaman, None
+        sesi = self.sesi
+        rekaman.selesai(self.jam.waktu_main, sesi.batas_waktu, sesi.skor_per_soal,
+                        sesi.skor, sesi.jumlah_benar, sesi.jumlah_salah)
+        nama = datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + f"-{self.id_sesi[:8]}{EKSTENSI_REKAMAN}"
+        path = os.path.join(self.folder_rekaman, nama)
+        self.papan_skor.kirim_tugas(lambda: rekaman.simpan(path))
+
+    def putar_ulang(self, rekaman, kecepatan=None):
+        """
+        Jalankan ulang rekaman lewat logika game (jam harus virtual) dan
+        bandingkan hasilnya. Kembalikan (cocok, {'skor', 'benar', 'salah'}).
+
+        kecepatan=None: hanya frame yang ada di rekaman, secepat mungkin.
+        Selain itu frame tambahan tiap 1/FPS waktu game diselipkan untuk
+        ditampilkan, dengan tempo kecepatan x waktu nyata. Frame tambahan
+        berhenti sebelum kejadian logika berikutnya, jadi hasilnya tetap sama.
+        """
+        folder_rekaman, self.folder_rekaman = self.folder_rekaman, None # Jangan merekam putar ulang
+        self.kesulitan_terpilih = rekaman.kesulitan
+        self.jam.lompat_ke(rekaman.waktu_mulai)
+        self.jam.tick()
+        self.mulai_game_baru(seed=rekaman.seed, aturan=(rekaman.batas_waktu, rekaman.skor_per_soal))
+        sesi = self.sesi
+        self.status_game_sekarang = STATE_BERMAIN
+
+        mulai_nyata = time.perf_counter()
+        langkah = 1.0 / FPS
+
+        def frame(waktu, tombol=()):
+            if kecepatan:
+                sisa = mulai_nyata + (waktu - rekaman.waktu_mulai) / kecepatan - time.perf_counter()
+                if sisa > 0:
+                    time.sleep(sisa)
+                pygame.event.clear(pygame.KEYDOWN) # Abaikan keyboard sungguhan selama putar ulang
+            for key, unicode in tombol:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0, scancode=0))
+            self.jam.lompat_ke(waktu)
+            self.jalankan_frame()
+
+        for waktu, tombol in rekaman.frame():
+            if kecepatan:
+                # Frame tambahan hanya untuk tampilan; berhenti satu langkah sebelum
+                # kejadian logika berikutnya supaya pembulatan float tidak memicunya
+                t = self.jam.waktu_main + langkah
+                while (t < min(waktu, self.waktu_kejadian_berikutnya() - langkah)
+                       and self.status_game_sekarang == STATE_BERMAIN):
+                    frame(t)
+                    t = self.jam.waktu_main + langkah
+            frame(waktu, tombol)
+            if self.status_game_sekarang != STATE_BERMAIN:
+                break
+
+        self.folder_rekaman = folder_rekaman
+        if self.status_game_sekarang == STATE_HASIL_AKHIR:
+            hasil = self.data_hasil_terakhir
+            hasil = {'skor': hasil['skor'], 'benar': hasil['benar'], 'salah': hasil['salah']}
+        else:
+            hasil = {'skor': sesi.skor, 'benar': sesi.jumlah_benar, 'salah': sesi.jumlah_salah}
+        return hasil == rekaman.hasil, hasil
+
+    # --- MODE BALAPAN ---
+
+    def gabung_balapan(self, host, port, nama):
+        """Hubungkan ke server balapan (lihat balapan.py) tanpa menahan loop game."""
+        self.balapan = KlienBalapan(host, port, nama, saat_pesan=self.bangunkan_loop)
+        self.info_balapan = f"Balapan: menghubungkan ke {host}:{port}..."
+        self.balapan.mulai()
+
+    @staticmethod
+    def bangunkan_loop():
+        """Dipanggil dari thread jaringan: kirim EVENT_BALAPAN agar event.wait selesai."""
+        try:
+            pygame.event.post(pygame.event.Event(EVENT_BALAPAN))
+        except pygame.error:
+            pass # Game sedang ditutup
+
+    def proses_pesan_balapan(self):
+        """Tangani pesan server yang sudah tiba (tidak menunggu jaringan)."""
+        for pesan in self.balapan.ambil_pesan():
+            tipe = pesan.get('tipe')
+            if tipe == 'selamat_datang':
+                self.info_balapan = f"Balapan: terhubung ({pesan['jumlah']} pemain), menunggu guru memulai"
+            elif tipe == 'mulai':
+                self.mulai_balapan(pesan)
+            elif tipe == 'soal':
+                if self.sesi_balapan:
+                    self.sampler_soal.tambah(pesan.get('nomor'), pesan.get('a'), pesan.get('op'), pesan.get('b'))
+            elif tipe in ('papan', 'selesai'):
+                self.papan_balapan = pesan
+                if tipe == 'selesai':
+                    self.info_balapan = "Balapan: selesai, menunggu balapan berikutnya"
+            elif tipe == 'putus':
+                self.info_balapan = f"Balapan: koneksi terputus ({pesan.get('alasan', '')})"
+
+    def mulai_balapan(self, pesan):
+        """Mulai sesi balapan dengan soal & aturan dari server, dari layar mana pun."""
+        if pesan.get('kesulitan') not in RUANG_SOAL:
+            return
+        antrian = AntrianSoal()
+        for nomor, soal in enumerate(pesan.get('soal') or (), 1):
+            antrian.tambah(nomor, *soal)
+        if not antrian.ada_soal():
+            return
+        self.kesulitan_terpilih = pesan['kesulitan']
+        # Soal berikutnya dikirim server satu per satu; waktu = sisa waktu balapan
+        self.mulai_game_baru(aturan=(pesan['sisa'], pesan['skor_per_soal']), sampler=antrian)
+        self.sesi_balapan = True
+        self.papan_balapan = None
+        self.info_balapan = "Balapan: berlangsung"
+        self.layar_pause = None
+        if pygame.mixer.get_init():
+            pygame.mixer.music.unpause()
+        self.status_game_sekarang = STATE_BERMAIN
+
+    def peringkat_balapan(self):
+        """(peringkat, jumlah pemain) dari papan terakhir, atau None di luar balapan."""
+        if not self.sesi_balapan or self.papan_balapan is None:
+            return None
+        skor = self.sesi.skor
+        skor_semua = self.papan_balapan['skor_semua']
+        return 1 + sum(1 for s in skor_semua if s > skor), max(len(skor_semua), 1)
+
     # --- FUNGSI ANIMASI ---
 
     def mulai_animasi(self, tipe):
         """Memulai animasi karakter ('jump' atau 'shake')."""
-        if tipe == 'jump':
-            self.anim_state = 'jump'
-            self.anim_timer = 0.5 # Durasi lompatan
-        elif tipe == 'shake':
-            self.anim_state = 'shake'
-            self.anim_timer = 0.6 # Durasi geleng
-
-    def update_dan_gambar_animasi(self):
-        """Mengupdate posisi karakter berdasarkan status animasi."""
-        dt = self.clock.get_time() / 1000.0 # Delta time
-        pos_x, pos_y = self.char_base_pos
+        self.animasi.mulai(tipe)
 
-        if self.anim_state != 'idle':
-            self.anim_timer -= dt
-            if self.anim_timer <= 0:
-                self.anim_state = 'idle'
-                self.anim_timer = 0
-            
-            elif self.anim_state == 'jump':
-                # Menggunakan rumus parabola sederhana
-                # progress = 1 (awal) -> 0 (akhir)
-                progress = self.anim_timer / 0.5 
-                # y = -x^2 + 1 (parabola terbalik, 0..1)
-                jump_height = (-4 * (progress**2) + 4 * progress) * 30 # Skala 30px
-                pos_y -= jump_height
-
-            elif self.anim_state == 'shake':
-                # Menggunakan sinus untuk efek geleng
-                shake_amount = math.sin(self.anim_timer * 50) * 15 # Frekuensi * Amplitudo
-                pos_x += shake_amount
-
-        # Gambar karakter (lingkaran kuning sederhana)
-        pygame.draw.circle(self.layar, WARNA_KUNING, (int(pos_x), int(pos_y)), 25)
-        # Mata
-        pygame.draw.circle(self.layar, WARNA_HITAM, (int(pos_x) - 8, int(pos_y) - 5), 4)
-        pygame.draw.circle(self.layar, WARNA_HITAM, (int(pos_x) + 8, int(pos_y) - 5), 4)
+    def gambar_karakter(self):
+        """Blit sprite karakter di posisi dasar + offset animasi (diinterpolasi)."""
+        dx, dy = self.animasi.offset_antara(self.sesi.alpha_pada(self.jam.waktu_main))
+        pos_x, pos_y = self.char_base_pos
+        posisi = (int(pos_x + dx) - RADIUS_KARAKTER, int(pos_y + dy) - RADIUS_KARAKTER)
+        rect_karakter = self.layar.blit(self.sprite_karakter, posisi)
+        self.tandai_jika_berubah('karakter', rect_karakter.topleft, rect_karakter)
 
 
     # --- FUNGSI UTILITAS ---
 
-    def render_teks(self, teks, font, warna, x, y, center=True):
-        """Helper untuk me-render teks ke layar."""
-        obj_teks = font.render(teks, True, warna)
-        rect_teks = obj_teks.get_rect()
+    def render_teks(self, teks, font, warna, x, y, center=True, dinamis=False, permukaan=None):
+        """
+        Helper untuk me-render teks ke layar (atau ke permukaan lain jika diberikan).
+
+        Teks statis diambil dari cache LRU. Teks yang sering berubah (HUD:
+        timer, skor, nomor soal, input angka) pakai dinamis=True agar disusun
+        dari atlas glyph dan tidak memenuhi cache.
+        """
+        self.profiler.render_teks += 1
+        if dinamis:
+            atlas = self.cache_teks.atlas(font, warna)
+            rect_teks = pygame.Rect((0, 0), atlas.ukuran(teks))
+        else:
+            obj_teks = self.cache_teks.ambil(teks, font, warna)
+            rect_teks = obj_teks.get_rect()
         if center:
             rect_teks.center = (x, y)
         else:
             rect_teks.topleft = (x, y)
-        self.layar.blit(obj_teks, rect_teks)
-
-    def gambar_tombol(self, teks, x, y, w, h, warna_default=WARNA_ABU_ABU, warna_hover=WARNA_BIRU_TERANG):
-        """Menggambar tombol dan mendeteksi hover."""
-        mouse_pos = pygame.mouse.get_pos()
-        rect_tombol = pygame.Rect(x, y, w, h)
-        
-        warna = warna_default
-        if rect_tombol.collidepoint(mouse_pos):
-            warna = warna_hover
-            
-        pygame.draw.rect(self.layar, warna, rect_tombol, border_radius=10)
-        self.render_teks(teks, self.font_sedang, WARNA_HITAM, x + w // 2, y + h // 2)
-        
-        return rect_tombol # Kembalikan rect untuk deteksi klik
+        if permukaan is None:
+            permukaan = self.layar
+        if dinamis:
+            atlas.gambar(permukaan, teks, rect_teks)
+        else:
+            permukaan.blit(obj_teks, rect_teks)
+        return rect_teks
 
     def muat_skor_tertinggi(self):
-        """Memuat daftar skor tertinggi dari file JSON."""
-        try:
-            with open(FILE_SKOR_TERTINGGI, 'r') as f:
-                skor = json.load(f)
-            # Pastikan diurutkan berdasarkan skor (descending)
-            skor.sort(key=lambda x: x['skor'], reverse=True)
-            return skor
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Jika file tidak ada atau rusak, kembalikan list kosong
-            return []
+        """Mengambil daftar skor tertinggi (terurut) dari cache papan skor."""
+        return self.papan_skor.daftar()
+
+    def catat_riwayat_sesi(self, data_hasil):
+        """
+        Catat sesi yang baru selesai di riwayat SQLite, termasuk skor 0 dan sesi
+        yang ditinggalkan lewat "Menu Utama". Nama diisi nanti oleh simpan_skor_tertinggi.
+        """
+        data_sesi = dict(data_hasil)
+        baris = self.baris_riwayat = {}
+
+        def simpan():
+            baris['id'] = self.db_skor.simpan_sesi(None, data_sesi)
+
+        self.papan_skor.kirim_tugas(simpan)
 
     def simpan_skor_tertinggi(self, nama, skor):
-        """Menyimpan skor baru ke file JSON."""
+        """Menyimpan skor baru ke file JSON (dan nama pemain ke riwayat SQLite jika aktif)."""
+        if self.db_skor is not None and self.baris_riwayat is not None:
+            baris = self.baris_riwayat
+
+            def ganti_nama():
+                # Antrian penulis FIFO: baris sesi sudah disimpan oleh catat_riwayat_sesi
+                if 'id' in baris:
+                    self.db_skor.ganti_nama(baris['id'], nama)
+
+            self.papan_skor.kirim_tugas(ganti_nama)
+
         if skor <= 0:
             return # Jangan simpan skor 0
 
-        daftar_skor = self.muat_skor_tertinggi()
         tanggal_hari_ini = datetime.date.today().isoformat()
         
         entri_baru = {
@@ -792,21 +1498,44 @@ class MathSprintGame:
             "tanggal": tanggal_hari_ini
         }
         
-        daftar_skor.append(entri_baru)
-        # Urutkan lagi
-        daftar_skor.sort(key=lambda x: x['skor'], reverse=True)
-        # Ambil Top 5
-        daftar_skor = daftar_skor[:5]
-        
-        try:
-            with open(FILE_SKOR_TERTINGGI, 'w') as f:
-                json.dump(daftar_skor, f, indent=4)
-        except IOError as e:
-            print(f"Error: Tidak bisa menyimpan skor ke {FILE_SKOR_TERTINGGI}: {e}")
+        # Diurutkan & dipotong ke Top 5 di memori, ditulis ke file di latar belakang
+        self.papan_skor.tambah(entri_baru)
 
 
 # --- Titik Masuk Program ---
 
 if __name__ == "__main__":
-    game = MathSprintGame()
+    import argparse
+
+    if sys.argv[1:2] == ['scores']:
+        # Alat file skor (export/import/merge), lihat alat_skor.py
+        import alat_skor
+        sys.exit(alat_skor.main_cli(sys.argv[2:], prog="main.py scores"))
+
+    parser = argparse.ArgumentParser(description=JUDUL_GAME)
+    parser.add_argument('--profil', metavar='FILE',
+                        help="Catat waktu setiap frame ke FILE (.csv atau .jsonl)")
+    parser.add_argument('--tampilan', choices=(TAMPILAN_SKALA, TAMPILAN_PENUH, TAMPILAN_JENDELA),
+                        default=MODE_TAMPILAN, help="Mode tampilan (default: %(default)s)")
+    parser.add_argument('--render', choices=(RENDER_PERMUKAAN, RENDER_TEKSTUR),
+                        default=MODE_RENDER, help="Backend render (default: %(default)s)")
+    parser.add_argument('--ukur-startup', action='store_true',
+                        help="Cetak waktu sampai frame pertama & aset siap (ms), lalu keluar")
+    parser.add_argument('--balapan', metavar='HOST:PORT',
+                        help="Ikut balapan kelas di server ini (lihat balapan.py)")
+    parser.add_argument('--nama', default="Player", help="Nama di papan balapan")
+    args = parser.parse_args()
+
+    game = MathSprintGame(mode_tampilan=args.tampilan, mode_render=args.render)
+    if args.balapan:
+        host, _, port = args.balapan.rpartition(':')
+        game.gabung_balapan(host or "127.0.0.1", int(port), args.nama)
+    if args.profil:
+        game.profiler.mulai_ekspor(args.profil)
+    if args.ukur_startup:
+        while game.waktu_aset_siap is None:
+            game.jalankan_frame()
+        print(f"frame_pertama_ms={(game.waktu_frame_pertama - WAKTU_MULAI_PROGRAM) * 1000:.1f} "
+              f"aset_siap_ms={(game.waktu_aset_siap - WAKTU_MULAI_PROGRAM) * 1000:.1f}")
+        game.keluar_game()
     game.main_loop()
\ No newline at end of file
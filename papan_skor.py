@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Layanan papan skor (leaderboard) untuk MathSprint.
+
+Daftar skor dimuat sekali lalu disimpan di memori dalam keadaan sudah
+terurut. File hanya dibaca ulang jika waktu modifikasinya (mtime) berubah,
+misalnya ketika beberapa komputer memakai file skor yang sama di drive
+bersama. Penyimpanan dilakukan oleh thread penulis di latar belakang
+dengan pola file sementara + fsync + rename, sehingga file tidak pernah
+terpotong saat crash dan loop game tidak pernah tertahan oleh disk.
+"""
+
+import json
+import os
+import queue
+import stat
+import tempfile
+import threading
+import time
+
+# umask proses, dibaca sekali saat impor (os.umask tidak aman dipanggil dari thread penulis)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def samakan_mode_file(fd, path):
+    """
+    Beri file sementara (fd dari mkstemp, mode 0600) mode file path yang akan
+    digantinya, atau 0666 dikurangi umask untuk file baru (seperti open()),
+    agar os.replace tidak membuat file skor hanya bisa dibaca pemiliknya.
+    """
+    if not hasattr(os, 'fchmod'): # Windows: mode POSIX tidak berlaku
+        return
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.fchmod(fd, mode)
+
+
+class PapanSkor:
+    """Cache skor tertinggi di memori dengan penulisan atomik di latar belakang."""
+
+    def __init__(self, path, batas=5, interval_cek=1.0):
+        self.path = path
+        self.batas = batas # Jumlah entri yang disimpan (Top N)
+        self.interval_cek = interval_cek # Jeda minimum antar pengecekan mtime (detik)
+
+        self._skor = []
+        self._mtime = None
+        self._waktu_cek_terakhir = None
+        self._tulisan_tertunda = 0 # Jumlah penyimpanan yang belum selesai
+        self._lock = threading.Lock()
+
+        self._antrian = queue.Queue()
+        self._thread_penulis = None
+
+    # --- Membaca ---
+
+    def daftar(self):
+        """
+        Kembalikan daftar skor terurut (descending).
+
+        Aman dipanggil setiap frame: file hanya di-stat paling sering sekali
+        per interval_cek dan hanya dibaca ulang jika mtime berubah. List yang
+        dikembalikan jangan diubah oleh pemanggil.
+        """
+        sekarang = time.monotonic()
+        if (self._waktu_cek_terakhir is None
+                or sekarang - self._waktu_cek_terakhir >= self.interval_cek):
+            self._waktu_cek_terakhir = sekarang
+            self._muat_jika_berubah()
+        return self._skor
+
+    def _baca_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _muat_jika_berubah(self):
+        """Muat ulang file jika mtime berbeda dari yang terakhir diketahui."""
+        mtime = self._baca_mtime()
+        with self._lock:
+            # Selama masih ada tulisan tertunda, data di memori lebih baru
+            if mtime == self._mtime or self._tulisan_tertunda:
+                return
+            self._skor = self._baca_file()
+            self._mtime = mtime
+
+    def _baca_file(self):
+        try:
+            with open(self.path, 'r') as f:
+                skor = json.load(f)
+            # Pastikan diurutkan berdasarkan skor (descending)
+            skor.sort(key=lambda x: x['skor'], reverse=True)
+            return skor
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Jika file tidak ada atau rusak, kembalikan list kosong
+            return []
+
+    # --- Menulis ---
+
+    def tambah(self, entri):
+        """Tambahkan entri skor ke memori dan jadwalkan penyimpanan ke file."""
+        # Pastikan perubahan dari instance lain tidak tertimpa
+        self._muat_jika_berubah()
+        with self._lock:
+            daftar_skor = self._skor + [entri]
+            daftar_skor.sort(key=lambda x: x['skor'], reverse=True)
+            self._skor = daftar_skor[:self.batas]
+            self._tulisan_tertunda += 1
+            salinan = list(self._skor)
+        self.kirim_tugas(lambda: self._tulis_atomik(salinan))
+
+    def kirim_tugas(self, tugas):
+        """Jalankan callable tugas di thread penulis (berurutan, FIFO)."""
+        if self._thread_penulis is None:
+            self._thread_penulis = threading.Thread(
+                target=self._loop_penulis, name="PenulisSkor", daemon=True)
+            self._thread_penulis.start()
+        self._antrian.put(tugas)
+
+    def _loop_penulis(self):
+        while True:
+            tugas = self._antrian.get()
+            try:
+                if tugas is None:
+                    return
+                tugas()
+            except Exception as e:
+                print(f"Error pada penulis skor: {e}")
+            finally:
+                self._antrian.task_done()
+
+    def _tulis_atomik(self, daftar_skor):
+        """Tulis ke file sementara, fsync, lalu rename ke path tujuan."""
+        folder = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, path_sementara = tempfile.mkstemp(
+                dir=folder, prefix=".scores-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(daftar_skor, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    samakan_mode_file(f.fileno(), self.path)
+                os.replace(path_sementara, self.path)
+            except BaseException:
+                os.unlink(path_sementara)
+                raise
+        except OSError as e:
+            print(f"Error: Tidak bisa menyimpan skor ke {self.path}: {e}")
+        finally:
+            # Tulisan sendiri tidak perlu dibaca ulang
+            with self._lock:
+                self._tulisan_tertunda -= 1
+                self._mtime = self._baca_mtime()
+
+    def tutup(self, timeout=5.0):
+        """Tunggu semua penyimpanan yang tertunda selesai, lalu hentikan thread."""
+        if self._thread_penulis is None:
+            return
+        self._antrian.put(None)
+        self._thread_penulis.join(timeout)
+        self._thread_penulis = None
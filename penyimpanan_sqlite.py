@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Penyimpanan skor berbasis SQLite (opsional) untuk MathSprint.
+
+Berbeda dengan scores.json yang hanya menyimpan 5 skor teratas, di sini
+setiap sesi disimpan lengkap (nama, kesulitan, skor, benar, salah,
+waktu_total, tanggal). Query Top-N per kesulitan dan skor terbaik pemain
+memakai indeks, sehingga tetap cepat walaupun ada ribuan sesi per komputer.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS sesi (
+    id INTEGER PRIMARY KEY,
+    nama TEXT NOT NULL,
+    kesulitan TEXT,             -- NULL untuk skor hasil impor scores.json lama
+    skor INTEGER NOT NULL,
+    benar INTEGER NOT NULL DEFAULT 0,
+    salah INTEGER NOT NULL DEFAULT 0,
+    waktu_total REAL NOT NULL DEFAULT 0,
+    tanggal TEXT NOT NULL,      -- Tanggal ISO (YYYY-MM-DD)
+    dibuat TEXT NOT NULL        -- Waktu penyimpanan ISO
+);
+CREATE INDEX IF NOT EXISTS idx_sesi_kesulitan_skor ON sesi (kesulitan, skor DESC);
+CREATE INDEX IF NOT EXISTS idx_sesi_nama_tanggal ON sesi (nama, tanggal);
+CREATE INDEX IF NOT EXISTS idx_sesi_nama_skor ON sesi (nama, skor DESC);
+CREATE TABLE IF NOT EXISTS meta (
+    kunci TEXT PRIMARY KEY,
+    nilai TEXT
+);
+"""
+
+KOLOM_SESI = ("nama", "kesulitan", "skor", "benar", "salah", "waktu_total", "tanggal")
+
+SQL_INSERT_SESI = (
+    "INSERT INTO sesi (nama, kesulitan, skor, benar, salah, waktu_total, tanggal, dibuat)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_KOLOM_HASIL = "SELECT nama, kesulitan, skor, benar, salah, waktu_total, tanggal FROM sesi"
+
+
+class PenyimpananSkorSQLite:
+    """Menyimpan dan meng-query seluruh riwayat sesi di database SQLite."""
+
+    def __init__(self, path):
+        self.path = path
+        # Koneksi dipakai dari thread game (query) dan thread penulis (insert)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SKEMA)
+
+    def tutup(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Menulis ---
+
+    def simpan_sesi(self, nama, data_hasil, tanggal=None):
+        """Simpan satu sesi lengkap (isi data_hasil_terakhir). Kembalikan id barisnya."""
+        baris = (
+            nama if nama else "Player",
+            data_hasil.get('kesulitan'),
+            data_hasil['skor'],
+            data_hasil.get('benar', 0),
+            data_hasil.get('salah', 0),
+            data_hasil.get('waktu_total', 0.0),
+            tanggal or datetime.date.today().isoformat(),
+        )
+        dibuat = datetime.datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            return self._conn.execute(SQL_INSERT_SESI, baris + (dibuat,)).lastrowid
+
+    def ganti_nama(self, id_sesi, nama):
+        """Ganti nama pemain pada sesi yang sudah tersimpan (nama diisi setelah sesi selesai)."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE sesi SET nama = ? WHERE id = ?", (nama if nama else "Player", id_sesi))
+
+    def simpan_banyak(self, daftar_baris):
+        """Simpan banyak baris (urutan kolom sesuai KOLOM_SESI) dalam satu transaksi."""
+        dibuat = datetime.datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            self._conn.executemany(
+                SQL_INSERT_SESI, (tuple(baris) + (dibuat,) for baris in daftar_baris))
+
+    def impor_json(self, path_json):
+        """
+        Impor scores.json lama satu kali saja.
+
+        Path yang sudah pernah diimpor dicatat di tabel meta, sehingga
+        pemanggilan berikutnya tidak menggandakan data. Entri rusak (bukan
+        objek, tanpa skor angka) dilewati. Mengembalikan jumlah entri yang
+        diimpor.
+        """
+        kunci = "impor:" + os.path.abspath(path_json)
+        with self._lock:
+            sudah = self._conn.execute(
+                "SELECT 1 FROM meta WHERE kunci = ?", (kunci,)).fetchone()
+        if sudah:
+            return 0
+
+        try:
+            with open(path_json, 'r') as f:
+                daftar_skor = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except json.JSONDecodeError as e:
+            print(f"Warning: {path_json} rusak, impor dilewati: {e}")
+            return 0
+
+        if not isinstance(daftar_skor, list):
+            print(f"Warning: {path_json} bukan daftar skor, impor dilewati")
+            return 0
+        baris = []
+        for entri in daftar_skor:
+            try:
+                skor = int(entri['skor'])
+            except (TypeError, KeyError, ValueError):
+                continue
+            baris.append((entri.get('nama') or "Player", None, skor, 0, 0, 0.0,
+                          entri.get('tanggal') or datetime.date.today().isoformat()))
+        if len(baris) < len(daftar_skor):
+            print(f"Warning: {len(daftar_skor) - len(baris)} entri rusak di {path_json} dilewati")
+        dibuat = datetime.datetime.now().isoformat(timespec='seconds')
+        # Data dan penanda impor ditulis dalam satu transaksi
+        with self._lock, self._conn:
+            self._conn.executemany(SQL_INSERT_SESI, (b + (dibuat,) for b in baris))
+            self._conn.execute(
+                "INSERT INTO meta (kunci, nilai) VALUES (?, ?)", (kunci, dibuat))
+        return len(baris)
+
+    # --- Query ---
+
+    def _query(self, sql, parameter):
+        with self._lock:
+            return [dict(baris) for baris in self._conn.execute(sql, parameter)]
+
+    def top_n(self, kesulitan, n=5):
+        """Top-N sesi untuk satu kesulitan (memakai idx_sesi_kesulitan_skor)."""
+        return self._query(
+            SQL_KOLOM_HASIL + " WHERE kesulitan = ? ORDER BY skor DESC LIMIT ?",
+            (kesulitan, n))
+
+    def skor_terbaik_pemain(self, nama, kesulitan=None):
+        """
+        Sesi dengan skor tertinggi milik pemain (opsional per kesulitan).
+
+        Memakai idx_sesi_nama_skor: baris pemain dibaca dari skor tertinggi,
+        jadi query berhenti di baris pertama yang cocok.
+        """
+        if kesulitan is None:
+            hasil = self._query(
+                SQL_KOLOM_HASIL + " WHERE nama = ? ORDER BY skor DESC LIMIT 1",
+                (nama,))
+        else:
+            hasil = self._query(
+                SQL_KOLOM_HASIL + " WHERE nama = ? AND kesulitan = ? ORDER BY skor DESC LIMIT 1",
+                (nama, kesulitan))
+        return hasil[0] if hasil else None
+
+    def riwayat_pemain(self, nama, dari=None, sampai=None):
+        """Semua sesi pemain dalam rentang tanggal (memakai idx_sesi_nama_tanggal)."""
+        return self._query(
+            SQL_KOLOM_HASIL + " WHERE nama = ? AND tanggal BETWEEN ? AND ? ORDER BY tanggal",
+            (nama, dari or "0000-00-00", sampai or "9999-99-99"))
+
+    def jumlah_sesi(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sesi").fetchone()[0]
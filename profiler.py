@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Profiler per frame untuk MathSprint.
+
+Mencatat durasi fase event, update, draw dan present di setiap frame,
+beserta jumlah panggilan render_teks, alokasi permukaan, dan latensi
+tombol -> suara umpan balik (lihat audio.py). Hasilnya
+ditampilkan di overlay (F3) dengan persentil p50/p95/p99 dari beberapa
+ratus frame terakhir, dan bisa diekspor ke file CSV/JSONL untuk analisis.
+
+Saat tidak aktif, setiap penanda fase hanya berupa satu pengecekan boolean.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+
+FASE_EVENT = 'event'
+FASE_UPDATE = 'update'
+FASE_DRAW = 'draw'
+FASE_PRESENT = 'present'
+DAFTAR_FASE = (FASE_EVENT, FASE_UPDATE, FASE_DRAW, FASE_PRESENT)
+
+KOLOM_EKSPOR = ('frame', 'status') + DAFTAR_FASE + ('total', 'render_teks', 'alokasi', 'latensi_suara')
+
+# Jumlah permukaan (pygame.Surface) yang dibuat sejak program mulai. Semua
+# tempat yang membuat permukaan baru (Surface(), font.render, copy, transform,
+# convert) melewatkan hasilnya ke catat_alokasi, jadi ini satu-satunya penghitung.
+_jumlah_alokasi = 0
+
+
+def catat_alokasi(permukaan):
+    """Hitung satu permukaan baru, lalu kembalikan permukaan itu apa adanya."""
+    global _jumlah_alokasi
+    _jumlah_alokasi += 1
+    return permukaan
+
+
+def jumlah_alokasi():
+    """Total permukaan yang tercatat lewat catat_alokasi."""
+    return _jumlah_alokasi
+
+
+def persentil(nilai_terurut, p):
+    """Persentil p (0..100) dari list yang sudah terurut (nearest-rank)."""
+    if not nilai_terurut:
+        return 0.0
+    indeks = min(len(nilai_terurut) - 1, int(round(p / 100.0 * (len(nilai_terurut) - 1))))
+    return nilai_terurut[indeks]
+
+
+class ProfilerFrame:
+    """Pengukur waktu per fase dengan jendela bergulir untuk persentil."""
+
+    def __init__(self, ukuran_jendela=300):
+        self.aktif = False
+        self.nomor_frame = 0
+
+        # Data frame yang sedang berjalan
+        self.status = None
+        self.durasi_fase = dict.fromkeys(DAFTAR_FASE, 0.0)
+        self._fase = None
+        self._mulai_fase = 0.0
+        self.render_teks = 0 # Diisi oleh MathSprintGame.render_teks
+        self.alokasi = 0 # Alokasi pygame.Surface di frame terakhir (lihat catat_alokasi)
+        self._alokasi_awal = 0
+        self.latensi_suara = None # Latensi tombol -> suara di frame ini (detik)
+
+        # Jendela bergulir (detik) untuk overlay
+        self.riwayat_total = deque(maxlen=ukuran_jendela)
+        self.riwayat_latensi_suara = deque(maxlen=ukuran_jendela)
+        self.frame_terakhir = None # dict hasil frame terakhir
+
+        self._file = None
+        self._penulis_csv = None
+
+    # --- Penanda fase ---
+
+    def mulai_frame(self, status, fase=FASE_DRAW):
+        """Mulai frame baru pada fase awal tertentu."""
+        self.render_teks = 0
+        self.alokasi = 0
+        self._alokasi_awal = _jumlah_alokasi
+        self.latensi_suara = None
+        if not self.aktif:
+            self._fase = None
+            return
+        self.status = status
+        for nama in DAFTAR_FASE:
+            self.durasi_fase[nama] = 0.0
+        self._fase = fase
+        self._mulai_fase = time.perf_counter()
+
+    def fase(self, nama):
+        """Pindah ke fase lain; waktu sejak penanda sebelumnya masuk fase lama."""
+        if not self.aktif or self._fase is None:
+            return
+        sekarang = time.perf_counter()
+        self.durasi_fase[self._fase] += sekarang - self._mulai_fase
+        self._fase = nama
+        self._mulai_fase = sekarang
+
+    def lewati_alokasi(self, jumlah):
+        """Jangan hitung jumlah alokasi terakhir di frame ini (misal milik overlay profiler)."""
+        self._alokasi_awal += jumlah
+
+    def selesai_frame(self):
+        """Tutup frame: catat ke jendela bergulir dan ke file ekspor (jika ada)."""
+        if not self.aktif or self._fase is None:
+            return
+        self.fase(None)
+        self.alokasi = _jumlah_alokasi - self._alokasi_awal
+        total = sum(self.durasi_fase.values())
+        self.riwayat_total.append(total)
+        self.nomor_frame += 1
+
+        self.frame_terakhir = {
+            'frame': self.nomor_frame,
+            'status': self.status,
+            **{nama: self.durasi_fase[nama] * 1000.0 for nama in DAFTAR_FASE},
+            'total': total * 1000.0,
+            'render_teks': self.render_teks,
+            'alokasi': self.alokasi,
+            'latensi_suara': None if self.latensi_suara is None else self.latensi_suara * 1000.0,
+        }
+        if self._file is not None:
+            self._tulis(self.frame_terakhir)
+
+    def catat_latensi_suara(self, detik):
+        """Catat latensi dari cap waktu tombol sampai suara umpan balik diputar."""
+        self.latensi_suara = detik
+        self.riwayat_latensi_suara.append(detik)
+
+    # --- Ringkasan ---
+
+    def persentil_ms(self):
+        """(p50, p95, p99) durasi frame dalam milidetik dari jendela bergulir."""
+        terurut = sorted(self.riwayat_total)
+        return tuple(persentil(terurut, p) * 1000.0 for p in (50, 95, 99))
+
+    def persentil_latensi_suara_ms(self):
+        """(p50, p95, p99) latensi tombol -> suara dalam milidetik."""
+        terurut = sorted(self.riwayat_latensi_suara)
+        return tuple(persentil(terurut, p) * 1000.0 for p in (50, 95, 99))
+
+    # --- Ekspor ---
+
+    @property
+    def mengekspor(self):
+        return self._file is not None
+
+    def mulai_ekspor(self, path):
+        """Tulis data setiap frame ke path (.csv atau .jsonl); otomatis mengaktifkan profiler."""
+        self._file = open(path, 'w', newline='')
+        if path.endswith('.csv'):
+            self._penulis_csv = csv.DictWriter(self._file, fieldnames=KOLOM_EKSPOR)
+            self._penulis_csv.writeheader()
+        self.aktif = True
+
+    def _tulis(self, baris):
+        if self._penulis_csv is not None:
+            self._penulis_csv.writerow(baris)
+        else:
+            self._file.write(json.dumps(baris) + '\n')
+
+    def tutup(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._penulis_csv = None
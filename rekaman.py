@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Rekaman sesi MathSprint untuk diputar ulang.
+
+Satu rekaman berisi seed soal, kesulitan, aturan sesi, hasil akhir, dan
+input selama bermain. Yang dicatat hanya frame yang mengubah logika game:
+frame yang memproses tombol, frame saat umpan balik selesai, dan frame saat
+sesi berakhir. Waktunya adalah waktu_main apa adanya (tanpa pause), dan
+waktu mulai sesi ada di header: putar ulang membawa jam virtual tepat ke
+nilai-nilai itu, sehingga logika game menghitung selisih float yang sama
+bit-per-bit. Hasilnya sesi yang sama persis, jadi skor, benar dan salah bisa
+diverifikasi.
+
+Format file (little-endian): header struct, lalu tiga array paralel
+(waktu 'd', kode 'i', unicode 'I'). Satu sesi 60 detik biasanya < 4 KB.
+
+    python rekaman.py rekaman/*.msr              # verifikasi secepat mungkin (headless)
+    python rekaman.py sesi.msr --kecepatan 1     # tonton ulang 1x (atau 4, 10, ...)
+    python rekaman.py sesi.msr --info
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+MAGIC = b'MSRK'
+VERSI = 1
+EKSTENSI = ".msr"
+
+# Kode entri selain tombol (kode >= 0 adalah pygame key)
+KODE_FRAME = -1 # Frame logika tanpa input (umpan balik selesai)
+KODE_AKHIR = -2 # Frame saat sesi berakhir
+
+_HEADER = struct.Struct('<4sBB') # magic, versi, panjang nama kesulitan
+_DATA = struct.Struct('<qddHiiiI') # seed, waktu mulai, batas waktu, skor/soal, skor, benar, salah, jumlah entri
+
+
+def _ke_little_endian(arr):
+    if sys.byteorder == 'big':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class Rekaman:
+    """Rekaman satu sesi: header + array paralel (waktu, kode, unicode)."""
+
+    def __init__(self, seed, kesulitan, waktu_mulai=0.0):
+        self.seed = seed
+        self.kesulitan = kesulitan
+        self.waktu_mulai = waktu_mulai # waktu_main saat sesi dimulai
+        self.batas_waktu = 0.0
+        self.skor_per_soal = 0
+        self.hasil = None # {'skor', 'benar', 'salah'} saat sesi selesai
+        self.waktu = array('d')
+        self.kode = array('i')
+        self.unicode = array('I')
+
+    # --- Merekam (dipanggil dari loop game, hanya append ke array) ---
+
+    def catat_tombol(self, waktu, key, unicode):
+        self.waktu.append(waktu)
+        self.kode.append(key)
+        self.unicode.append(ord(unicode) if len(unicode) == 1 else 0)
+
+    def catat_frame(self, waktu, kode=KODE_FRAME):
+        self.waktu.append(waktu)
+        self.kode.append(kode)
+        self.unicode.append(0)
+
+    def selesai(self, waktu, batas_waktu, skor_per_soal, skor, benar, salah):
+        self.catat_frame(waktu, KODE_AKHIR)
+        self.batas_waktu = batas_waktu
+        self.skor_per_soal = skor_per_soal
+        self.hasil = {'skor': skor, 'benar': benar, 'salah': salah}
+
+    # --- Memutar ---
+
+    def frame(self):
+        """Iterasi (waktu_main, [(key, unicode), ...]) per frame, urut waktu."""
+        i, n = 0, len(self.waktu)
+        while i < n:
+            waktu = self.waktu[i]
+            tombol = []
+            while i < n and self.waktu[i] == waktu:
+                if self.kode[i] >= 0:
+                    kode_unicode = self.unicode[i]
+                    tombol.append((self.kode[i], chr(kode_unicode) if kode_unicode else ""))
+                i += 1
+            yield waktu, tombol
+
+    @property
+    def durasi(self):
+        return self.waktu[-1] - self.waktu_mulai if self.waktu else 0.0
+
+    # --- Format biner ---
+
+    def ke_bytes(self):
+        kesulitan = self.kesulitan.encode('utf-8')
+        hasil = self.hasil or {'skor': 0, 'benar': 0, 'salah': 0}
+        return b''.join((
+            _HEADER.pack(MAGIC, VERSI, len(kesulitan)),
+            kesulitan,
+            _DATA.pack(self.seed, self.waktu_mulai, self.batas_waktu, self.skor_per_soal,
+                       hasil['skor'], hasil['benar'], hasil['salah'], len(self.waktu)),
+            _ke_little_endian(self.waktu),
+            _ke_little_endian(self.kode),
+            _ke_little_endian(self.unicode),
+        ))
+
+    @classmethod
+    def dari_bytes(cls, data):
+        try:
+            magic, versi, panjang = _HEADER.unpack_from(data, 0)
+            if magic != MAGIC or versi != VERSI:
+                raise ValueError
+            posisi = _HEADER.size
+            kesulitan = data[posisi:posisi + panjang].decode('utf-8')
+            posisi += panjang
+            seed, waktu_mulai, batas_waktu, skor_per_soal, skor, benar, salah, jumlah = _DATA.unpack_from(data, posisi)
+            posisi += _DATA.size
+        except (struct.error, UnicodeDecodeError, ValueError):
+            raise ValueError("Bukan file rekaman MathSprint (atau versi tidak didukung)") from None
+
+        rekaman = cls(seed, kesulitan, waktu_mulai)
+        rekaman.batas_waktu = batas_waktu
+        rekaman.skor_per_soal = skor_per_soal
+        rekaman.hasil = {'skor': skor, 'benar': benar, 'salah': salah}
+        for arr in (rekaman.waktu, rekaman.kode, rekaman.unicode):
+            ukuran = arr.itemsize * jumlah
+            if len(data) < posisi + ukuran:
+                raise ValueError("File rekaman terpotong")
+            arr.frombytes(data[posisi:posisi + ukuran])
+            if sys.byteorder == 'big':
+                arr.byteswap()
+            posisi += ukuran
+        return rekaman
+
+    def simpan(self, path):
+        """Tulis rekaman secara atomik (file sementara, fsync, lalu os.replace)."""
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, path_sementara = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.ke_bytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path_sementara, path)
+        except BaseException:
+            if os.path.exists(path_sementara):
+                os.remove(path_sementara)
+            raise
+
+    @classmethod
+    def muat(cls, path):
+        with open(path, 'rb') as f:
+            return cls.dari_bytes(f.read())
+
+
+# --- Putar ulang dari baris perintah ---
+
+def _teks_hasil(hasil):
+    return f"skor {hasil['skor']}, benar {hasil['benar']}, salah {hasil['salah']}"
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Putar ulang & verifikasi rekaman sesi MathSprint.")
+    parser.add_argument('file', nargs='+', help="File rekaman (.msr)")
+    parser.add_argument('--kecepatan', type=float,
+                        help="Tampilkan di layar dengan kecepatan ini (1 = waktu nyata). "
+                             "Default: headless secepat mungkin")
+    parser.add_argument('--info', action='store_true', help="Hanya tampilkan isi header")
+    args = parser.parse_args(argv)
+
+    if args.info:
+        for path in args.file:
+            rekaman = Rekaman.muat(path)
+            print(f"{path}: {rekaman.kesulitan}, seed {rekaman.seed}, {rekaman.durasi:.1f} detik, "
+                  f"{len(rekaman.waktu)} entri, {_teks_hasil(rekaman.hasil)}")
+        return 0
+
+    # Game diimpor di sini karena main.py mengimpor modul ini
+    import main
+    from jam_game import JamGame
+
+    with tempfile.TemporaryDirectory() as folder:
+        game = main.MathSprintGame(headless=args.kecepatan is None, jam=JamGame(virtual=True),
+                                   path_skor=os.path.join(folder, "scores.json"),
+                                   path_telemetri=None, folder_rekaman=None)
+        jumlah_beda = 0
+        for path in args.file:
+            rekaman = Rekaman.muat(path)
+            cocok, hasil = game.putar_ulang(rekaman, args.kecepatan)
+            if cocok:
+                print(f"OK    {path}: {_teks_hasil(hasil)}")
+            else:
+                jumlah_beda += 1
+                print(f"BEDA  {path}: rekaman {_teks_hasil(rekaman.hasil)}, putar ulang {_teks_hasil(hasil)}")
+        game.papan_skor.tutup()
+    print(f"{len(args.file) - jumlah_beda}/{len(args.file)} rekaman cocok")
+    return 1 if jumlah_beda else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Backend render berbasis tekstur (pygame._sdl2 Renderer) untuk MathSprint.
+
+Di jalur biasa semua digambar dengan blit software ke permukaan layar, lalu
+seluruh permukaan dikirim ke display setiap flip(). KanvasTekstur dipakai
+sebagai pengganti permukaan layar (self.layar) dengan sebagian API Surface
+yang dipakai game (blit, fill, get_size, get_rect):
+
+- Setiap permukaan yang di-blit (lapisan statis layar, teks dari CacheTeks,
+  glyph atlas HUD, wajah tombol, sprite karakter) di-upload sekali menjadi
+  Texture. Cache-nya berkunci lemah (weakref), jadi tekstur ikut dilepas
+  saat permukaannya dibuang dari CacheTeks.
+- Setiap frame disusun dengan Renderer.blit (copy tekstur) dan fill_rect,
+  lalu present(); tidak ada upload permukaan layar penuh.
+- Kotak garis/bersudut (gambar_kotak) di-render sekali ke permukaan
+  beralpha per (ukuran, warna, tebal, radius) lalu di-copy sebagai tekstur.
+
+Renderer SDL bisa memakai GPU atau renderer software (SDL_RENDER_DRIVER=
+software, juga dengan driver video dummy), jadi backend ini bisa diuji di
+komputer tanpa GPU. Jika pygame._sdl2 tidak tersedia, TERSEDIA = False dan
+game memakai jalur permukaan biasa.
+"""
+
+import atexit
+import weakref
+
+import pygame
+
+from profiler import catat_alokasi
+
+try:
+    from pygame._sdl2 import video
+except ImportError: # pygame lama / build tanpa modul _sdl2
+    video = None
+
+TERSEDIA = video is not None
+
+# Kanvas yang belum ditutup. Tekstur & renderer harus dilepas sebelum SDL
+# ditutup (keluar karena error pun); satu hook atexit untuk semua kanvas,
+# berkunci lemah agar kanvas yang dibuang tidak tertahan sampai proses selesai.
+_kanvas_terbuka = weakref.WeakSet()
+
+
+@atexit.register
+def _tutup_semua_kanvas():
+    for kanvas in list(_kanvas_terbuka):
+        kanvas.tutup()
+
+
+def gambar_kotak(permukaan, warna, rect, lebar=0, radius=0):
+    """pygame.draw.rect untuk Surface maupun KanvasTekstur."""
+    if isinstance(permukaan, KanvasTekstur):
+        return permukaan.kotak(warna, rect, lebar, radius)
+    return pygame.draw.rect(permukaan, warna, rect, lebar, radius)
+
+
+class KanvasTekstur:
+    """Pengganti permukaan layar yang menyusun frame dari Texture di Renderer SDL2."""
+
+    def __init__(self, judul, ukuran, layar_penuh=False, skala=False, bisa_diubah=False,
+                 vsync=False, tersembunyi=False):
+        """
+        ukuran: ukuran jendela (dan resolusi logis jika skala=True).
+        layar_penuh: fullscreen desktop; tanpa skala, ukuran kanvas = resolusi monitor.
+        skala: resolusi logis tetap yang diskalakan Renderer ke ukuran jendela.
+        pygame.error diteruskan jika jendela/renderer tidak bisa dibuat.
+        """
+        if not TERSEDIA:
+            raise pygame.error("pygame._sdl2.video tidak tersedia")
+        self.window = video.Window(judul, size=ukuran, fullscreen_desktop=layar_penuh,
+                                   resizable=bisa_diubah, hidden=tersembunyi)
+        self.renderer = video.Renderer(self.window, accelerated=-1, vsync=vsync)
+        self.skala = skala
+        if skala:
+            self.renderer.logical_size = ukuran
+            self.ukuran = tuple(ukuran)
+        else:
+            self.ukuran = tuple(self.window.size)
+        self._tekstur = weakref.WeakKeyDictionary() # Surface -> Texture
+        self._kotak = {} # (ukuran, warna, lebar, radius) -> Texture
+        self.jumlah_upload = 0 # Tekstur yang dibuat (untuk profiler/benchmark)
+        _kanvas_terbuka.add(self)
+
+    # --- Sebagian API Surface ---
+
+    def get_size(self):
+        return self.ukuran
+
+    def get_width(self):
+        return self.ukuran[0]
+
+    def get_height(self):
+        return self.ukuran[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.ukuran)
+        for nama, nilai in kwargs.items():
+            setattr(rect, nama, nilai)
+        return rect
+
+    def ubah_ukuran(self, ukuran):
+        """Ukuran jendela berubah (VIDEORESIZE) atau diubah oleh pemanggil."""
+        if tuple(self.window.size) != tuple(ukuran):
+            self.window.size = ukuran
+        if self.skala:
+            self.renderer.logical_size = ukuran
+        self.ukuran = tuple(ukuran)
+
+    def tekstur(self, permukaan):
+        """Texture untuk permukaan, di-upload sekali (permukaan dianggap tidak berubah)."""
+        tekstur = self._tekstur.get(permukaan)
+        if tekstur is None:
+            tekstur = video.Texture.from_surface(self.renderer, permukaan)
+            self._tekstur[permukaan] = tekstur
+            self.jumlah_upload += 1
+        return tekstur
+
+    def blit(self, permukaan, tujuan, area=None):
+        tekstur = self.tekstur(permukaan)
+        if area is None:
+            rect = pygame.Rect(tujuan[0], tujuan[1], tekstur.width, tekstur.height)
+            self.renderer.blit(tekstur, rect)
+        else:
+            area = pygame.Rect(area).clip(tekstur.get_rect())
+            rect = pygame.Rect(tujuan[0], tujuan[1], area.width, area.height)
+            self.renderer.blit(tekstur, rect, area)
+        return rect
+
+    def fill(self, warna, rect=None):
+        self.renderer.draw_color = pygame.Color(warna)
+        if rect is None:
+            self.renderer.clear()
+            return self.get_rect()
+        rect = pygame.Rect(rect)
+        self.renderer.fill_rect(rect)
+        return rect
+
+    def kotak(self, warna, rect, lebar=0, radius=0):
+        """Seperti pygame.draw.rect; kotak polos langsung fill_rect."""
+        rect = pygame.Rect(rect)
+        if lebar == 0 and radius == 0:
+            return self.fill(warna, rect)
+        kunci = (rect.size, tuple(warna), lebar, radius)
+        tekstur = self._kotak.get(kunci)
+        if tekstur is None:
+            permukaan = catat_alokasi(pygame.Surface(rect.size, pygame.SRCALPHA))
+            pygame.draw.rect(permukaan, warna, permukaan.get_rect(), lebar, radius)
+            tekstur = video.Texture.from_surface(self.renderer, permukaan)
+            self._kotak[kunci] = tekstur
+            self.jumlah_upload += 1
+        self.renderer.blit(tekstur, rect)
+        return rect
+
+    # --- Frame ---
+
+    def present(self):
+        self.renderer.present()
+
+    def tutup(self):
+        """Lepas semua tekstur, renderer dan jendela. Aman dipanggil berkali-kali."""
+        _kanvas_terbuka.discard(self)
+        self._tekstur.clear()
+        self._kotak.clear()
+        self.renderer = None
+        self.window = None
+
+    def baca_piksel(self):
+        """Salinan frame terakhir yang disusun (sebelum present) sebagai Surface."""
+        # to_surface() dengan resolusi logis (skala) tidak aman di pygame 2.6
+        if self.skala:
+            raise pygame.error("baca_piksel tidak didukung dengan resolusi logis")
+        return self.renderer.to_surface()
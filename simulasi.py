@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Simulasi headless MathSprint dengan pemain bot.
+
+Game dijalankan tanpa monitor dan tanpa suara (driver dummy SDL) dengan jam
+virtual, lalu bot memainkan sesi lengkap: menu -> pilih kesulitan ->
+bermain -> hasil -> simpan skor. Bot mengirim event KEYDOWN seperti
+keyboard sungguhan, dengan akurasi dan latensi menjawab yang bisa diatur.
+
+Contoh:
+    python simulasi.py --sesi 2000
+    python simulasi.py --sesi 20 --frame-tetap --json hasil.json
+
+Secara default jam virtual melompat langsung ke kejadian berikutnya
+(jawaban bot, akhir umpan balik, akhir sesi), sehingga ribuan sesi bisa
+dijalankan per menit. --frame-tetap memajukan jam 1/FPS per frame seperti
+game sungguhan, untuk mengukur waktu frame di CI.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+import main  # noqa: E402
+from jam_game import JamGame  # noqa: E402
+from profiler import persentil  # noqa: E402
+
+# Ukuran layar simulasi (resolusi dasar game)
+UKURAN_LAYAR_SIMULASI = (main.LEBAR_LAYAR, main.TINGGI_LAYAR)
+
+LABEL_KESULITAN = {
+    main.KESULITAN_MUDAH: "Mudah",
+    main.KESULITAN_SEDANG: "Sedang",
+    main.KESULITAN_SULIT: "Sulit",
+}
+
+# Batas frame per sesi agar simulasi yang macet tidak berjalan selamanya
+BATAS_FRAME_PER_TAHAP = 100000
+
+
+class BotPemain:
+    """
+    Pemain bot dengan akurasi dan latensi menjawab acak.
+
+    Latensi mengikuti distribusi log-normal (waktu reaksi manusia condong ke
+    kanan) dengan rata-rata dan simpangan baku dalam detik.
+    """
+
+    def __init__(self, akurasi=0.8, latensi_rata=2.0, latensi_sd=0.7, nama="Bot", seed=None):
+        self.akurasi = akurasi
+        self.latensi_rata = latensi_rata
+        self.latensi_sd = latensi_sd
+        self.nama = nama
+        self.rng = random.Random(seed)
+
+        # Parameter log-normal dari rata-rata & simpangan baku yang diminta
+        varians = (latensi_sd / latensi_rata) ** 2
+        self._sigma = math.sqrt(math.log(1 + varians))
+        self._mu = math.log(latensi_rata) - self._sigma ** 2 / 2
+
+    def latensi(self):
+        """Waktu (detik) sampai bot menekan Enter."""
+        return self.rng.lognormvariate(self._mu, self._sigma)
+
+    def jawaban(self, jawaban_benar):
+        """Teks yang diketik bot untuk soal dengan jawaban_benar."""
+        if self.rng.random() < self.akurasi:
+            return str(jawaban_benar)
+        return str(jawaban_benar + self.rng.choice((-2, -1, 1, 2, 10)))
+
+
+def event_ketik(karakter):
+    """Buat event KEYDOWN untuk satu karakter seperti dari keyboard."""
+    if karakter == '\r':
+        kunci = pygame.K_RETURN
+    elif karakter == '\b':
+        kunci = pygame.K_BACKSPACE
+    elif karakter == '-':
+        kunci = pygame.K_MINUS
+    else:
+        kunci = pygame.key.key_code(karakter)
+    return pygame.event.Event(pygame.KEYDOWN, key=kunci, unicode=karakter.strip('\r\b'), mod=0, scancode=0)
+
+
+class SimulatorSesi:
+    """Menjalankan sesi lengkap MathSprint dengan bot dan jam virtual."""
+
+    def __init__(self, game, langkah_maks=1.0, frame_tetap=False):
+        self.game = game
+        self.jam = game.jam # Harus JamGame(virtual=True)
+        self.langkah_frame = 1.0 / main.FPS
+        self.langkah_maks = langkah_maks
+        self.frame_tetap = frame_tetap
+        self.waktu_frame = [] # Durasi nyata setiap frame (detik)
+
+    # --- Input ---
+
+    def klik(self, label):
+        """Klik tombol berdasarkan label yang terakhir digambar."""
+        rect = self.game.rect_tombol[label]
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=rect.center, button=1))
+
+    def ketik(self, teks):
+        for karakter in teks:
+            pygame.event.post(event_ketik(karakter))
+
+    # --- Frame ---
+
+    def frame(self, dt=None):
+        """Jalankan satu frame game; jam virtual maju sebesar dt."""
+        self.jam.langkah = self.langkah_frame if dt is None else dt
+        mulai = time.perf_counter()
+        self.game.jalankan_frame()
+        self.waktu_frame.append(time.perf_counter() - mulai)
+
+    def frame_sampai_status(self, status):
+        for _ in range(BATAS_FRAME_PER_TAHAP):
+            if self.game.status_game_sekarang == status:
+                return
+            self.frame()
+        raise RuntimeError(f"Simulasi macet: status {self.game.status_game_sekarang}, harusnya {status}")
+
+    # --- Sesi ---
+
+    def jalankan_sesi(self, bot, kesulitan):
+        """Mainkan satu sesi lengkap dan kembalikan data_hasil_terakhir."""
+        game = self.game
+        game.status_game_sekarang = main.STATE_MENU_UTAMA
+
+        # Menu -> pilih kesulitan -> bermain
+        self.frame()
+        self.klik("Mulai Bermain")
+        self.frame()
+        self.frame_sampai_status(main.STATE_PILIH_KESULITAN)
+        self.frame()
+        self.klik(LABEL_KESULITAN[kesulitan])
+        self.frame_sampai_status(main.STATE_BERMAIN)
+
+        # Bermain sampai waktu habis
+        waktu_jawab = None
+        for _ in range(BATAS_FRAME_PER_TAHAP):
+            if game.status_game_sekarang != main.STATE_BERMAIN:
+                break
+            sesi = game.sesi
+            if sesi.umpan_balik is not None:
+                waktu_jawab = None
+            elif waktu_jawab is None:
+                waktu_jawab = self.jam.waktu_main + bot.latensi()
+            elif self.jam.waktu_main >= waktu_jawab:
+                self.ketik(bot.jawaban(sesi.soal.jawaban) + '\r')
+                waktu_jawab = None
+                self.frame() # Jawaban diproses di frame berikutnya (langkah 1/FPS, bukan lompatan)
+                continue
+
+            if self.frame_tetap:
+                self.frame()
+            else:
+                # Lompat langsung ke kejadian berikutnya (tetap dibatasi langkah_maks)
+                target = self.game.waktu_kejadian_berikutnya()
+                if waktu_jawab is not None:
+                    target = min(target, waktu_jawab)
+                dt = min(max(target - self.jam.waktu_main, 0.0) + 1e-6, self.langkah_maks)
+                self.frame(dt)
+        self.frame_sampai_status(main.STATE_HASIL_AKHIR)
+
+        # Hasil -> isi nama -> simpan
+        self.frame()
+        self.ketik('\b' * len(game.input_nama_pemain) + bot.nama)
+        self.frame()
+        self.klik("Simpan Skor")
+        self.frame_sampai_status(main.STATE_MENU_UTAMA)
+        return dict(game.data_hasil_terakhir)
+
+
+def jalankan_simulasi(jumlah_sesi, akurasi=0.8, latensi_rata=2.0, latensi_sd=0.7,
+                      kesulitan=None, seed=0, frame_tetap=False, path_skor=None, path_telemetri=None,
+                      folder_rekaman=None):
+    """
+    Jalankan banyak sesi dan kembalikan ringkasan (dict) untuk laporan/CI.
+
+    folder_rekaman: simpan rekaman setiap sesi (lihat rekaman.py), None = tidak merekam.
+    """
+    folder_sementara = None
+    if path_skor is None or path_telemetri is None:
+        folder_sementara = tempfile.TemporaryDirectory()
+        if path_skor is None:
+            path_skor = os.path.join(folder_sementara.name, "scores.json")
+        if path_telemetri is None:
+            path_telemetri = os.path.join(folder_sementara.name, "telemetri.jsonl")
+
+    game = main.MathSprintGame(headless=True, ukuran_layar=UKURAN_LAYAR_SIMULASI, path_skor=path_skor,
+                               jam=JamGame(virtual=True), path_telemetri=path_telemetri,
+                               folder_rekaman=folder_rekaman)
+    simulator = SimulatorSesi(game, frame_tetap=frame_tetap)
+    rng = random.Random(seed)
+    daftar_kesulitan = [kesulitan] if kesulitan else list(LABEL_KESULITAN)
+
+    hasil = []
+    mulai = time.perf_counter()
+    for i in range(jumlah_sesi):
+        bot = BotPemain(akurasi, latensi_rata, latensi_sd, nama=f"Bot{i % 100}", seed=rng.random())
+        hasil.append(simulator.jalankan_sesi(bot, rng.choice(daftar_kesulitan)))
+    game.papan_skor.tutup() # Pastikan semua penyimpanan selesai (ikut diukur)
+    if game.telemetri is not None:
+        game.telemetri.tutup()
+    durasi = time.perf_counter() - mulai
+
+    waktu_frame = sorted(simulator.waktu_frame)
+    ringkasan = {
+        'sesi': jumlah_sesi,
+        'durasi_detik': durasi,
+        'sesi_per_menit': jumlah_sesi * 60.0 / durasi if durasi else 0.0,
+        'frame': len(waktu_frame),
+        'frame_ms_p50': persentil(waktu_frame, 50) * 1000,
+        'frame_ms_p95': persentil(waktu_frame, 95) * 1000,
+        'frame_ms_p99': persentil(waktu_frame, 99) * 1000,
+        'skor_rata': sum(h['skor'] for h in hasil) / max(len(hasil), 1),
+        'benar_total': sum(h['benar'] for h in hasil),
+        'salah_total': sum(h['salah'] for h in hasil),
+        'papan_skor': game.muat_skor_tertinggi(),
+        'per_operasi': game.agregat_jawaban.ringkasan()['per_operasi'],
+    }
+    if folder_sementara is not None:
+        folder_sementara.cleanup()
+    return ringkasan
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Simulasi headless MathSprint dengan bot.")
+    parser.add_argument('--sesi', type=int, default=100, help="Jumlah sesi yang dijalankan")
+    parser.add_argument('--akurasi', type=float, default=0.8, help="Peluang bot menjawab benar (0..1)")
+    parser.add_argument('--latensi', type=float, nargs=2, default=(2.0, 0.7), metavar=('RATA', 'SD'),
+                        help="Rata-rata dan simpangan baku waktu menjawab (detik)")
+    parser.add_argument('--kesulitan', choices=list(LABEL_KESULITAN), help="Default: acak per sesi")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--frame-tetap', action='store_true',
+                        help="Majukan jam 1/FPS per frame (untuk mengukur waktu frame)")
+    parser.add_argument('--skor', help="Path file skor (default: file sementara)")
+    parser.add_argument('--telemetri', help="Path log telemetri jawaban (default: file sementara)")
+    parser.add_argument('--rekaman', metavar='FOLDER',
+                        help="Simpan rekaman setiap sesi (verifikasi: python rekaman.py FOLDER/*.msr)")
+    parser.add_argument('--json', help="Tulis ringkasan ke file JSON")
+    args = parser.parse_args(argv)
+
+    ringkasan = jalankan_simulasi(
+        args.sesi, args.akurasi, args.latensi[0], args.latensi[1],
+        args.kesulitan, args.seed, args.frame_tetap, args.skor, args.telemetri, args.rekaman)
+
+    print(f"{ringkasan['sesi']} sesi dalam {ringkasan['durasi_detik']:.2f} detik "
+          f"({ringkasan['sesi_per_menit']:.0f} sesi/menit)")
+    print(f"Frame: {ringkasan['frame']}  p50 {ringkasan['frame_ms_p50']:.3f} ms  "
+          f"p95 {ringkasan['frame_ms_p95']:.3f} ms  p99 {ringkasan['frame_ms_p99']:.3f} ms")
+    print(f"Skor rata-rata: {ringkasan['skor_rata']:.1f}  "
+          f"(benar {ringkasan['benar_total']}, salah {ringkasan['salah_total']})")
+    for op, s in ringkasan['per_operasi'].items():
+        print(f"  {op}  {s['jumlah']:>6} jawaban  akurasi {s['akurasi']:.0%}  "
+              f"latensi p50 {s['latensi_p50']:.2f}s  p90 {s['latensi_p90']:.2f}s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(ringkasan, f, indent=4)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Tata letak layar MathSprint.
+
+Semua posisi teks dan rect tombol setiap layar dihitung sekali per resolusi
+(bukan setiap frame) dan disimpan di cache. Widget layar (widget.py) dibuat
+dari rect tata letak yang sama, dan indeks kliknya memakai rect widget itu,
+jadi posisi gambar dan area klik tidak mungkin berbeda.
+
+Rect di dalam tata letak dipakai bersama; jangan diubah di tempat.
+"""
+
+from functools import lru_cache
+
+import pygame
+
+# Kunci layar (sama dengan nilai STATE_* di main.py)
+LAYAR_MENU_UTAMA = "MENU_UTAMA"
+LAYAR_PILIH_KESULITAN = "PILIH_KESULITAN"
+LAYAR_CARA_BERMAIN = "CARA_BERMAIN"
+LAYAR_BERMAIN = "BERMAIN"
+LAYAR_PAUSE = "PAUSE"
+LAYAR_HASIL_AKHIR = "HASIL_AKHIR"
+
+LEBAR_TOMBOL = 300
+TINGGI_TOMBOL = 50
+JUMLAH_BARIS_INSTRUKSI = 7
+
+
+class TataLetakLayar:
+    """Posisi elemen satu layar: titik teks, rect kotak, dan rect tombol."""
+
+    def __init__(self):
+        self.teks = {} # kunci -> (x, y) titik tengah teks
+        self.kotak = {} # kunci -> Rect (kotak input, dll.)
+        self.tombol = {} # label -> Rect, urut seperti digambar
+
+
+def _tombol(tengah_x, y, lebar=LEBAR_TOMBOL, tinggi=TINGGI_TOMBOL):
+    return pygame.Rect(tengah_x - lebar // 2, y, lebar, tinggi)
+
+
+@lru_cache(maxsize=8)
+def hitung_tata_letak(lebar, tinggi):
+    """Tata letak semua layar untuk resolusi (lebar, tinggi): dict kunci layar -> TataLetakLayar."""
+    tengah = lebar // 2
+    hasil = {}
+
+    menu = hasil[LAYAR_MENU_UTAMA] = TataLetakLayar()
+    menu.teks['judul'] = (tengah, 150)
+    menu.teks['memuat'] = (tengah, tinggi - 40)
+    menu.teks['balapan'] = (tengah, tinggi - 80)
+    menu.tombol["Mulai Bermain"] = _tombol(tengah, 300)
+    menu.tombol["Cara Bermain"] = _tombol(tengah, 370)
+    menu.tombol["Keluar"] = _tombol(tengah, 440)
+
+    pilih = hasil[LAYAR_PILIH_KESULITAN] = TataLetakLayar()
+    pilih.teks['judul'] = (tengah, 150)
+    pilih.tombol["Mudah"] = _tombol(tengah, 250)
+    pilih.tombol["Sedang"] = _tombol(tengah, 320)
+    pilih.tombol["Sulit"] = _tombol(tengah, 390)
+    pilih.tombol["Kembali"] = _tombol(tengah, 480)
+
+    cara = hasil[LAYAR_CARA_BERMAIN] = TataLetakLayar()
+    cara.teks['judul'] = (tengah, 100)
+    for i in range(JUMLAH_BARIS_INSTRUKSI):
+        cara.teks[('instruksi', i)] = (tengah, 180 + 40 * i)
+    cara.tombol["Kembali ke Menu"] = _tombol(tengah, 500)
+
+    bermain = hasil[LAYAR_BERMAIN] = TataLetakLayar()
+    bermain.teks['timer'] = (lebar - 100, 50)
+    bermain.teks['nomor_soal'] = (tengah, 50)
+    bermain.teks['skor'] = (100, 50)
+    bermain.teks['soal'] = (tengah, 200)
+    bermain.teks['input_jawaban'] = (tengah, 315)
+    bermain.teks['umpan_balik'] = (tengah, tinggi // 2 - 100)
+    bermain.teks['jawaban'] = (tengah, tinggi // 2 - 50)
+    bermain.teks['karakter'] = (tengah, tinggi // 2 + 50)
+    bermain.teks['peringkat'] = (tengah, tinggi - 40)
+    bermain.kotak['input_jawaban'] = pygame.Rect(tengah - 150, 280, 300, 70)
+
+    pause = hasil[LAYAR_PAUSE] = TataLetakLayar()
+    pause.teks['judul'] = (tengah, 200)
+    pause.tombol["Lanjut (P)"] = _tombol(tengah, 300)
+    pause.tombol["Kembali ke Menu"] = _tombol(tengah, 370)
+
+    # Dirapatkan agar judul daftar + 5 baris skor (main.py: +35, jarak 25)
+    # tetap di dalam resolusi logis 800x600 (baris terakhir berpusat di y=545)
+    hasil_akhir = hasil[LAYAR_HASIL_AKHIR] = TataLetakLayar()
+    hasil_akhir.teks['judul'] = (tengah, 55)
+    for i, kunci in enumerate(('skor', 'benar', 'salah', 'waktu_total')):
+        hasil_akhir.teks[kunci] = (tengah, 110 + 35 * i)
+    hasil_akhir.teks['label_nama'] = (tengah, 260)
+    hasil_akhir.teks['input_nama'] = (tengah, 303)
+    hasil_akhir.kotak['input_nama'] = pygame.Rect(tengah - 150, 280, 300, 45)
+    hasil_akhir.tombol["Simpan Skor"] = pygame.Rect(tengah - 170, 340, 150, 45)
+    hasil_akhir.tombol["Menu Utama"] = pygame.Rect(tengah + 20, 340, 150, 45)
+    hasil_akhir.teks['skor_tertinggi'] = (tengah, 410)
+
+    return hasil
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetri per jawaban untuk MathSprint.
+
+Setiap jawaban (soal, operator, operand, input yang diketik, benar/salah,
+latensi menjawab, kesulitan, id sesi) dicatat sebagai satu baris JSON di
+file log yang hanya ditambah (append-only). Pencatatan tidak pernah
+menahan loop game: rekaman dikumpulkan di buffer, lalu setiap batch
+diserialisasi dan ditulis oleh thread di latar belakang.
+
+Agregat (jumlah, akurasi, persentil latensi per operasi, rentang operand,
+dan kesulitan) dihitung secara bertahap dengan sketsa kuantil berbasis
+bucket logaritmik, sehingga laporan guru cukup membaca log baris demi
+baris tanpa memuat seluruh isinya ke memori:
+
+    python telemetri.py                      # laporan dari telemetri.jsonl
+    python telemetri.py --log kelas.jsonl --kesulitan SULIT --json laporan.json
+"""
+
+import argparse
+import json
+import math
+import queue
+import threading
+
+FILE_TELEMETRI_DEFAULT = "telemetri.jsonl"
+
+# Persentil latensi yang ditampilkan di laporan
+PERSENTIL_LAPORAN = (50, 90, 99)
+
+
+def rentang_operand(a, b, lebar=10):
+    """Kelompok rentang operand terbesar, misal '10-19'."""
+    awal = max(abs(a), abs(b)) // lebar * lebar
+    return f"{awal}-{awal + lebar - 1}"
+
+
+class SketsaKuantil:
+    """
+    Sketsa kuantil dengan bucket logaritmik.
+
+    Nilai x > 0 masuk ke bucket ceil(log_gamma(x)); estimasi kuantil punya
+    galat relatif paling besar `akurasi`. Memori sebanding dengan jumlah
+    bucket yang terisi (ratusan untuk latensi 1 ms..100 detik), bukan
+    jumlah nilai, dan dua sketsa bisa digabung.
+    """
+
+    def __init__(self, akurasi=0.01, nilai_min=1e-3):
+        self.akurasi = akurasi
+        self.nilai_min = nilai_min # Nilai <= nilai_min dihitung sebagai nol
+        self._gamma = (1 + akurasi) / (1 - akurasi)
+        self._log_gamma = math.log(self._gamma)
+        self.bucket = {} # indeks -> jumlah
+        self.jumlah_nol = 0
+        self.jumlah = 0
+        self.total = 0.0
+
+    def tambah(self, x):
+        self.jumlah += 1
+        self.total += x
+        if x <= self.nilai_min:
+            self.jumlah_nol += 1
+            return
+        indeks = math.ceil(math.log(x) / self._log_gamma)
+        self.bucket[indeks] = self.bucket.get(indeks, 0) + 1
+
+    def kuantil(self, q):
+        """Estimasi kuantil q (0..1)."""
+        if not self.jumlah:
+            return 0.0
+        peringkat = q * (self.jumlah - 1)
+        terhitung = self.jumlah_nol
+        if peringkat < terhitung:
+            return 0.0
+        for indeks in sorted(self.bucket):
+            terhitung += self.bucket[indeks]
+            if terhitung > peringkat:
+                # Titik tengah bucket (gamma^(i-1), gamma^i]
+                return 2 * self._gamma ** indeks / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bucket) / (self._gamma + 1)
+
+    @property
+    def rata_rata(self):
+        return self.total / self.jumlah if self.jumlah else 0.0
+
+    def gabung(self, lain):
+        """Tambahkan isi sketsa lain (akurasi harus sama)."""
+        for indeks, jumlah in lain.bucket.items():
+            self.bucket[indeks] = self.bucket.get(indeks, 0) + jumlah
+        self.jumlah_nol += lain.jumlah_nol
+        self.jumlah += lain.jumlah
+        self.total += lain.total
+
+
+class StatistikJawaban:
+    """Jumlah, benar, dan sketsa latensi untuk satu kelompok jawaban."""
+
+    def __init__(self):
+        self.jumlah = 0
+        self.benar = 0
+        self.latensi = SketsaKuantil()
+
+    def tambah(self, benar, latensi):
+        self.jumlah += 1
+        self.benar += bool(benar)
+        self.latensi.tambah(latensi)
+
+    def ringkasan(self):
+        hasil = {
+            'jumlah': self.jumlah,
+            'benar': self.benar,
+            'akurasi': self.benar / self.jumlah if self.jumlah else 0.0,
+            'latensi_rata': self.latensi.rata_rata,
+        }
+        for p in PERSENTIL_LAPORAN:
+            hasil[f'latensi_p{p}'] = self.latensi.kuantil(p / 100.0)
+        return hasil
+
+
+class AgregatJawaban:
+    """Agregat bertahap per operasi, per (operasi, rentang operand), dan per kesulitan."""
+
+    def __init__(self):
+        self.per_operasi = {}
+        self.per_rentang = {} # (op, rentang) -> StatistikJawaban
+        self.per_kesulitan = {}
+        # Rekaman satu sesi selalu berurutan (di game maupun di log), jadi cukup
+        # hitung pergantian id; menyimpan semua id akan tumbuh tanpa batas.
+        self.jumlah_sesi = 0
+        self._sesi_terakhir = None
+
+    def _statistik(self, kelompok, kunci):
+        statistik = kelompok.get(kunci)
+        if statistik is None:
+            statistik = kelompok[kunci] = StatistikJawaban()
+        return statistik
+
+    def tambah(self, rekaman):
+        benar, latensi = rekaman['benar'], rekaman['latensi']
+        op = rekaman['op']
+        self._statistik(self.per_operasi, op).tambah(benar, latensi)
+        kunci_rentang = (op, rentang_operand(rekaman['a'], rekaman['b']))
+        self._statistik(self.per_rentang, kunci_rentang).tambah(benar, latensi)
+        self._statistik(self.per_kesulitan, rekaman['kesulitan']).tambah(benar, latensi)
+        if rekaman['sesi'] != self._sesi_terakhir:
+            self._sesi_terakhir = rekaman['sesi']
+            self.jumlah_sesi += 1
+
+    def ringkasan(self):
+        """Dict siap-JSON untuk laporan."""
+        return {
+            'sesi': self.jumlah_sesi,
+            'per_operasi': {op: s.ringkasan() for op, s in sorted(self.per_operasi.items())},
+            'per_rentang': {f"{op} {rentang}": s.ringkasan()
+                            for (op, rentang), s in sorted(self.per_rentang.items(),
+                                                           key=lambda x: (x[0][0], int(x[0][1].split('-')[0])))},
+            'per_kesulitan': {k: s.ringkasan() for k, s in sorted(self.per_kesulitan.items())},
+        }
+
+
+def baca_log(path):
+    """Iterasi rekaman di file log satu per satu (baris rusak dilewati)."""
+    with open(path, 'r') as f:
+        for baris in f:
+            try:
+                yield json.loads(baris)
+            except json.JSONDecodeError:
+                continue # Baris terakhir bisa terpotong jika game ditutup paksa
+
+
+def agregat_dari_log(path, kesulitan=None, sesi=None):
+    """Bangun AgregatJawaban dengan membaca log secara streaming."""
+    agregat = AgregatJawaban()
+    for rekaman in baca_log(path):
+        if kesulitan is not None and rekaman.get('kesulitan') != kesulitan:
+            continue
+        if sesi is not None and rekaman.get('sesi') != sesi:
+            continue
+        agregat.tambah(rekaman)
+    return agregat
+
+
+class PencatatJawaban:
+    """
+    Penulis log telemetri yang tidak memblokir.
+
+    catat() hanya menambah rekaman ke buffer; setiap ukuran_batch rekaman
+    (atau saat kirim() dipanggil, misal di akhir sesi) buffer diserahkan ke
+    thread penulis yang menambahkan baris JSON ke file.
+    """
+
+    def __init__(self, path, ukuran_batch=32):
+        self.path = path
+        self.ukuran_batch = ukuran_batch
+        self._buffer = []
+        self._antrian = queue.Queue()
+        self._thread_penulis = None
+
+    def catat(self, rekaman):
+        self._buffer.append(rekaman)
+        if len(self._buffer) >= self.ukuran_batch:
+            self.kirim()
+
+    def kirim(self):
+        """Serahkan isi buffer ke thread penulis."""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        if self._thread_penulis is None:
+            self._thread_penulis = threading.Thread(
+                target=self._loop_penulis, name="PenulisTelemetri", daemon=True)
+            self._thread_penulis.start()
+        self._antrian.put(batch)
+
+    def _loop_penulis(self):
+        while True:
+            batch = self._antrian.get()
+            try:
+                if batch is None:
+                    return
+                teks = ''.join(json.dumps(rekaman, separators=(',', ':')) + '\n' for rekaman in batch)
+                with open(self.path, 'a') as f:
+                    f.write(teks)
+            except OSError as e:
+                print(f"Error: Tidak bisa menulis telemetri ke {self.path}: {e}")
+            finally:
+                self._antrian.task_done()
+
+    def tutup(self, timeout=5.0):
+        """Tulis sisa buffer, tunggu thread penulis selesai, lalu hentikan."""
+        self.kirim()
+        if self._thread_penulis is None:
+            return
+        self._antrian.put(None)
+        self._thread_penulis.join(timeout)
+        self._thread_penulis = None
+
+
+def cetak_laporan(ringkasan):
+    judul = f"{'Kelompok':<16}{'Jumlah':>8}{'Akurasi':>9}{'Rata':>8}" + ''.join(
+        f"{'p' + str(p):>8}" for p in PERSENTIL_LAPORAN)
+    print(f"Sesi: {ringkasan['sesi']}  (latensi dalam detik)")
+    for bagian in ('per_operasi', 'per_kesulitan', 'per_rentang'):
+        print(f"\n{bagian.replace('_', ' ').capitalize()}")
+        print(judul)
+        for kunci, s in ringkasan[bagian].items():
+            persentil = ''.join(f"{s[f'latensi_p{p}']:>8.2f}" for p in PERSENTIL_LAPORAN)
+            print(f"{kunci:<16}{s['jumlah']:>8}{s['akurasi']:>8.0%} {s['latensi_rata']:>7.2f}{persentil}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan telemetri jawaban MathSprint.")
+    parser.add_argument('--log', default=FILE_TELEMETRI_DEFAULT, help="File log (default: %(default)s)")
+    parser.add_argument('--kesulitan', help="Hanya kesulitan ini (MUDAH/SEDANG/SULIT)")
+    parser.add_argument('--sesi', help="Hanya satu id sesi")
+    parser.add_argument('--json', help="Tulis ringkasan ke file JSON")
+    args = parser.parse_args(argv)
+
+    ringkasan = agregat_dari_log(args.log, args.kesulitan, args.sesi).ringkasan()
+    cetak_laporan(ringkasan)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(ringkasan, f, indent=4)
+
+
+if __name__ == "__main__":
+    main_cli()
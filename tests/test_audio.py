@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Tes headless subsistem audio (audio.py) dengan driver audio dummy SDL.
+
+    python -m unittest discover tests      # atau: python -m pytest tests
+
+Memeriksa bahwa kanal SFX benar-benar dicadangkan (Sound.play() biasa tidak
+pernah memakainya), penjadwalan kanal umpan balik (kanal kosong dulu, lalu
+mengganti yang paling lama), volume setelah pemanasan, dan latensi yang
+dilaporkan ke profiler.
+"""
+
+import array
+import math
+import os
+import sys
+import time
+import unittest
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame  # noqa: E402
+
+from audio import AudioGame  # noqa: E402
+from profiler import ProfilerFrame  # noqa: E402
+
+
+def buat_nada(frekuensi_nada, detik):
+    """Sound sinus 16-bit sesuai format mixer."""
+    frekuensi, _, kanal = pygame.mixer.get_init()
+    sampel = array.array('h')
+    for i in range(int(frekuensi * detik)):
+        nilai = int(8000 * math.sin(2 * math.pi * frekuensi_nada * i / frekuensi))
+        sampel.extend([nilai] * kanal)
+    return pygame.mixer.Sound(buffer=sampel.tobytes())
+
+
+class TesAudioGame(unittest.TestCase):
+
+    def setUp(self):
+        self.audio = AudioGame(ukuran_buffer=256, kanal_sfx=2, jumlah_kanal=8)
+        self.audio.mulai()
+        self.benar, self.salah, self.lain = buat_nada(880, 2.0), buat_nada(220, 2.0), buat_nada(440, 5.0)
+        self.audio.siapkan('benar', self.benar)
+        self.audio.siapkan('salah', self.salah)
+        time.sleep(0.05) # Pemanasan (1 ms tanpa volume) selesai di thread audio
+
+    def tearDown(self):
+        pygame.mixer.quit()
+
+    def putar_di_semua_kanal_biasa(self):
+        return [self.lain.play() for _ in range(pygame.mixer.get_num_channels())]
+
+    def test_kanal_cadangan_tidak_dipakai_sound_play(self):
+        kanal_biasa = self.putar_di_semua_kanal_biasa()
+        self.assertEqual(kanal_biasa.count(None), self.audio.kanal_sfx)
+        for kanal in self.audio.kanal:
+            self.assertIsNot(kanal.get_sound(), self.lain)
+
+    def test_penjadwalan_kanal_umpan_balik(self):
+        audio = self.audio
+        kanal_biasa = self.putar_di_semua_kanal_biasa()
+
+        # Dua umpan balik berturut-turut di dua kanal cadangan berbeda
+        audio.mainkan('benar')
+        audio.mainkan('salah')
+        self.assertIs(audio.kanal[0].get_sound(), self.benar)
+        self.assertIs(audio.kanal[1].get_sound(), self.salah)
+
+        # Semua kanal sibuk: yang paling lama diputar diganti
+        audio.mainkan('salah')
+        self.assertIs(audio.kanal[0].get_sound(), self.salah)
+        self.assertIs(audio.kanal[1].get_sound(), self.salah)
+
+        # Kanal yang kosong dipilih lebih dulu
+        audio.kanal[1].stop()
+        audio.mainkan('benar')
+        self.assertIs(audio.kanal[1].get_sound(), self.benar)
+
+        # Suara lain tetap berjalan di kanal tidak cadangan
+        for kanal in kanal_biasa:
+            if kanal is not None:
+                self.assertIs(kanal.get_sound(), self.lain)
+
+    def test_volume_pulih_setelah_pemanasan(self):
+        self.audio.mainkan('benar')
+        self.assertEqual(self.audio.kanal[0].get_volume(), 1.0)
+
+    def test_latensi_tercatat_di_profiler(self):
+        profiler = ProfilerFrame()
+        latensi = self.audio.mainkan('benar', waktu_input=10.000, waktu_sekarang=10.004)
+        profiler.catat_latensi_suara(latensi)
+        self.assertAlmostEqual(profiler.persentil_latensi_suara_ms()[0], 4.0)
+
+    def test_suara_belum_dimuat_diabaikan(self):
+        self.assertIsNone(self.audio.mainkan('tidak_ada', 1.0, 2.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Widget retained-mode untuk layar menu MathSprint.
+
+Berbeda dengan tombol immediate mode (setiap frame membuat Rect, membaca
+posisi mouse, menggambar ulang kotak dan me-render label), widget di sini
+menyimpan keadaannya sendiri:
+
+- Tombol: permukaan normal & hover di-render sekali, ditukar saat hover.
+- Label: teks statis/berubah, di-render ulang hanya saat teksnya berubah.
+- InputTeks: kotak input dengan fokus, batas panjang, Enter/Backspace.
+- Daftar: beberapa baris teks (misal skor tertinggi), dihitung ulang saat isinya berubah.
+
+LayarWidget mengelompokkan widget satu layar. Widget hanya digambar ulang
+jika dirty (hover, ditekan, teks berubah); area di bawahnya dipulihkan dari
+latar layar (warna polos atau permukaan, misal frame beku pause). Event
+mouse dipetakan ke widget lewat indeks grid, bukan rantai collidepoint.
+"""
+
+import pygame
+
+from profiler import catat_alokasi
+from render_tekstur import gambar_kotak
+
+# Ukuran sel indeks grid untuk hit-test (piksel)
+UKURAN_SEL_INDEKS = 64
+RADIUS_SUDUT_TOMBOL = 10
+
+
+class Widget:
+    """Dasar semua widget: rect, flag dirty, dan area yang terakhir digambar."""
+
+    interaktif = False
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.dirty = True
+        self.cache = None # CacheTeks, diisi oleh LayarWidget.tambah
+        self._rect_terakhir = None # Area yang terakhir digambar (untuk dipulihkan)
+
+    def area_dirty(self):
+        """Area layar yang harus dipulihkan & digambar ulang."""
+        if self._rect_terakhir is None:
+            return self.rect.copy()
+        return self.rect.union(self._rect_terakhir)
+
+    def gambar(self, permukaan):
+        self._rect_terakhir = self.rect.copy()
+        self.dirty = False
+
+    # Hook event (widget interaktif saja)
+    def atur_hover(self, hover):
+        pass
+
+    def klik(self, pos):
+        return None
+
+    def tangani_tombol_keyboard(self, event):
+        return None
+
+
+class Tombol(Widget):
+    """Tombol dengan sudut membulat; label & kedua warna di-render sekali."""
+
+    interaktif = True
+
+    def __init__(self, label, rect, font, warna_default, warna_hover, warna_teks, aksi=None):
+        super().__init__(rect)
+        self.label = label
+        self.aksi = label if aksi is None else aksi
+        self.font = font
+        self.warna_default = warna_default
+        self.warna_hover = warna_hover
+        self.warna_teks = warna_teks
+        self.hover = False
+        self._permukaan = None # (normal, hover)
+        self._area = self.rect # Kotak tombol + label
+
+    def _siapkan(self):
+        teks = self.cache.ambil(self.label, self.font, self.warna_teks)
+        rect_teks = teks.get_rect(center=self.rect.center)
+        # Label yang lebih lebar dari tombol tetap digambar utuh (tidak terpotong)
+        self._area = self.rect.union(rect_teks)
+        kotak = self.rect.move(-self._area.x, -self._area.y)
+        rect_teks.move_ip(-self._area.x, -self._area.y)
+        hasil = []
+        for warna in (self.warna_default, self.warna_hover):
+            permukaan = catat_alokasi(pygame.Surface(self._area.size, pygame.SRCALPHA))
+            pygame.draw.rect(permukaan, warna, kotak, border_radius=RADIUS_SUDUT_TOMBOL)
+            permukaan.blit(teks, rect_teks)
+            hasil.append(permukaan)
+        self._permukaan = tuple(hasil)
+
+    def area_dirty(self):
+        if self._permukaan is None:
+            self._siapkan()
+        return self._area.copy()
+
+    def atur_hover(self, hover):
+        if hover != self.hover:
+            self.hover = hover
+            self.dirty = True
+
+    def klik(self, pos):
+        return self.aksi
+
+    def gambar(self, permukaan):
+        if self._permukaan is None:
+            self._siapkan()
+        permukaan.blit(self._permukaan[self.hover], self._area)
+        super().gambar(permukaan)
+
+
+class Label(Widget):
+    """Satu baris teks dengan titik tengah tetap; di-render ulang saat teks berubah."""
+
+    def __init__(self, teks, font, warna, pusat):
+        super().__init__((pusat, (0, 0)))
+        self.teks = teks
+        self.font = font
+        self.warna = warna
+        self.pusat = pusat
+        self._permukaan = None
+        self._perlu_render = True
+
+    def atur_teks(self, teks, warna=None):
+        """Ganti teks/warna; tidak melakukan apa-apa jika sama."""
+        if warna is None:
+            warna = self.warna
+        if teks != self.teks or warna != self.warna:
+            self.teks = teks
+            self.warna = warna
+            self._perlu_render = True
+            self.dirty = True
+
+    def area_dirty(self):
+        self._render()
+        return super().area_dirty()
+
+    def _render(self):
+        if not self._perlu_render:
+            return
+        self._perlu_render = False
+        if self.teks:
+            self._permukaan = self.cache.ambil(self.teks, self.font, self.warna)
+            self.rect = self._permukaan.get_rect(center=self.pusat)
+        else:
+            self._permukaan = None
+            self.rect = pygame.Rect(self.pusat, (0, 0))
+
+    def gambar(self, permukaan):
+        self._render()
+        if self._permukaan is not None:
+            permukaan.blit(self._permukaan, self.rect)
+        super().gambar(permukaan)
+
+
+class InputTeks(Widget):
+    """Kotak input teks satu baris dengan fokus (aktif) dan batas panjang."""
+
+    interaktif = True
+
+    def __init__(self, rect, font, warna_teks, warna_aktif, warna_pasif, teks="", batas=15):
+        super().__init__(rect)
+        self.font = font
+        self.warna_teks = warna_teks
+        self.warna_aktif = warna_aktif
+        self.warna_pasif = warna_pasif
+        self.teks = teks
+        self.batas = batas
+        self.aktif = False
+
+    def atur(self, teks, aktif):
+        """Samakan isi & fokus dengan data game; dirty hanya jika berubah."""
+        if teks != self.teks or aktif != self.aktif:
+            self.teks = teks
+            self.aktif = aktif
+            self.dirty = True
+
+    def klik(self, pos):
+        if not self.aktif:
+            self.aktif = True
+            self.dirty = True
+        return None
+
+    def lepas_fokus(self):
+        if self.aktif:
+            self.aktif = False
+            self.dirty = True
+
+    def tangani_tombol_keyboard(self, event):
+        """Proses KEYDOWN saat aktif. Enter melepas fokus."""
+        if not self.aktif:
+            return None
+        if event.key == pygame.K_RETURN:
+            self.lepas_fokus()
+        elif event.key == pygame.K_BACKSPACE:
+            if self.teks:
+                self.teks = self.teks[:-1]
+                self.dirty = True
+        elif len(self.teks) < self.batas and event.unicode:
+            self.teks += event.unicode
+            self.dirty = True
+        return None
+
+    def gambar(self, permukaan):
+        warna_kotak = self.warna_aktif if self.aktif else self.warna_pasif
+        gambar_kotak(permukaan, warna_kotak, self.rect, 2, 5)
+        if self.teks:
+            teks = self.cache.ambil(self.teks, self.font, self.warna_teks)
+            permukaan.blit(teks, teks.get_rect(center=self.rect.center))
+        super().gambar(permukaan)
+
+
+class Daftar(Widget):
+    """Beberapa baris teks rata tengah; posisi baris dihitung ulang hanya saat isinya berubah."""
+
+    def __init__(self, font, warna, pusat_atas, jarak_baris, teks_kosong=""):
+        super().__init__((pusat_atas, (0, 0)))
+        self.font = font
+        self.warna = warna
+        self.pusat_atas = pusat_atas # Titik tengah baris pertama
+        self.jarak_baris = jarak_baris
+        self.teks_kosong = teks_kosong
+        self.item = None
+        self._baris = None # [(permukaan, rect)]
+
+    def atur_item(self, item):
+        """Ganti isi daftar (list string); tidak melakukan apa-apa jika sama."""
+        item = list(item)
+        if item != self.item:
+            self.item = item
+            self._baris = None
+            self.dirty = True
+
+    def _render(self):
+        if self._baris is not None:
+            return
+        teks_baris = self.item or ([self.teks_kosong] if self.teks_kosong else [])
+        x, y = self.pusat_atas
+        self._baris = []
+        for i, teks in enumerate(teks_baris):
+            permukaan = self.cache.ambil(teks, self.font, self.warna)
+            self._baris.append((permukaan, permukaan.get_rect(center=(x, y + self.jarak_baris * i))))
+        self.rect = pygame.Rect(self.pusat_atas, (0, 0))
+        if self._baris:
+            self.rect = self._baris[0][1].unionall([rect for _, rect in self._baris])
+
+    def area_dirty(self):
+        self._render()
+        return super().area_dirty()
+
+    def gambar(self, permukaan):
+        self._render()
+        for permukaan_baris, rect in self._baris:
+            permukaan.blit(permukaan_baris, rect)
+        super().gambar(permukaan)
+
+
+class IndeksKlik:
+    """Indeks grid sel -> widget interaktif, untuk memetakan posisi mouse ke widget."""
+
+    def __init__(self, ukuran_sel=UKURAN_SEL_INDEKS):
+        self.ukuran_sel = ukuran_sel
+        self._sel = {}
+
+    def tambah(self, widget):
+        s = self.ukuran_sel
+        rect = widget.rect
+        for sx in range(rect.left // s, (rect.right - 1) // s + 1):
+            for sy in range(rect.top // s, (rect.bottom - 1) // s + 1):
+                self._sel.setdefault((sx, sy), []).append(widget)
+
+    def widget_di(self, pos):
+        """Widget interaktif pada posisi pos, atau None."""
+        for widget in self._sel.get((pos[0] // self.ukuran_sel, pos[1] // self.ukuran_sel), ()):
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+
+class LayarWidget:
+    """Kumpulan widget satu layar beserta latar dan indeks klik."""
+
+    def __init__(self, cache_teks, latar):
+        self.cache_teks = cache_teks
+        self.latar = latar # Warna (tuple) atau pygame.Surface seukuran layar
+        self.widget = []
+        self.nama = {} # nama -> widget
+        self.indeks = IndeksKlik()
+        self._hover = None
+
+    def tambah(self, widget, nama=None):
+        widget.cache = self.cache_teks
+        self.widget.append(widget)
+        if nama is not None:
+            self.nama[nama] = widget
+        if widget.interaktif:
+            self.indeks.tambah(widget)
+        return widget
+
+    def __getitem__(self, nama):
+        return self.nama[nama]
+
+    def tombol(self):
+        """Semua Tombol di layar ini (urut seperti ditambahkan)."""
+        return [w for w in self.widget if isinstance(w, Tombol)]
+
+    def atur_latar(self, latar):
+        self.latar = latar
+        for widget in self.widget:
+            widget.dirty = True
+
+    def _pulihkan_latar(self, permukaan, area):
+        if isinstance(self.latar, pygame.Surface):
+            permukaan.blit(self.latar, area, area)
+        else:
+            permukaan.fill(self.latar, area)
+
+    # --- Input ---
+
+    def perbarui_hover(self, pos):
+        """Tandai perubahan hover (hanya widget lama & baru yang jadi dirty)."""
+        widget = self.indeks.widget_di(pos)
+        if widget is not self._hover:
+            if self._hover is not None:
+                self._hover.atur_hover(False)
+            if widget is not None:
+                widget.atur_hover(True)
+            self._hover = widget
+
+    def tangani_event(self, event):
+        """Teruskan event ke widget. Kembalikan aksi tombol yang diklik, atau None."""
+        if event.type == pygame.MOUSEMOTION:
+            self.perbarui_hover(event.pos)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            target = self.indeks.widget_di(event.pos)
+            for widget in self.widget:
+                if isinstance(widget, InputTeks) and widget is not target:
+                    widget.lepas_fokus() # Klik di luar kotak input melepas fokus
+            if target is not None:
+                return target.klik(event.pos)
+        elif event.type == pygame.KEYDOWN:
+            for widget in self.widget:
+                if widget.interaktif:
+                    aksi = widget.tangani_tombol_keyboard(event)
+                    if aksi is not None:
+                        return aksi
+        return None
+
+    # --- Gambar ---
+
+    def gambar(self, permukaan, penuh=False):
+        """
+        Gambar layar. penuh=True menggambar latar & semua widget (layar baru);
+        selain itu hanya widget dirty. Kembalikan list area yang berubah.
+        """
+        if penuh:
+            self._pulihkan_latar(permukaan, permukaan.get_rect())
+            for widget in self.widget:
+                widget.gambar(permukaan)
+            return [permukaan.get_rect()]
+
+        area_berubah = []
+        for widget in self.widget:
+            if widget.dirty:
+                area = widget.area_dirty()
+                self._pulihkan_latar(permukaan, area)
+                widget.gambar(permukaan)
+                area_berubah.append(area)
+        return area_berubah